@@ -0,0 +1,83 @@
+import sys
+import json
+import timeit
+
+from typing import Callable, List
+
+from ekosis.codecs import CodecBase, JSON_CODEC, OrjsonCodec, MsgpackCodec, CborCodec
+from ekosis.data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ekosis.exceptions import CodecException
+from ekosis.requests.status import Status
+
+from ..ping_pong.dtos import PingRequestDto, PongResponseDto
+
+# --------------------------------------------------------------------------------
+# Compares the codecs on the ping_pong DTOs, without any networking involved.
+# A round trip is what a server does for every request:
+#   decode a RequestDTO, then encode a ResponseDTO.
+# "json (two pass)" is how requests were decoded before codecs: json.loads, then
+# validating the resulting dict.
+# --------------------------------------------------------------------------------
+def get_codecs() -> List[CodecBase]:
+    codecs = [JSON_CODEC]
+    for codec_type in (OrjsonCodec, MsgpackCodec, CborCodec):
+        try:
+            codecs.append(codec_type())
+        except CodecException as e:
+            print(f"Skipping {codec_type.__name__}: {e}")
+    return codecs
+
+# --------------------------------------------------------------------------------
+def make_round_trip(codec: CodecBase) -> Callable:
+    request_bytes = codec.encode(
+        RequestDTO(route_key="app.ping", span_key=SpanKey.generate(), data=PingRequestDto(message="ping"))
+    )
+    response = ResponseDTO(span_key=SpanKey.generate(), status=Status.SUCCESS.value, data=PongResponseDto(message="pong"))
+
+    def round_trip():
+        codec.decode(request_bytes, RequestDTO)
+        return codec.encode(response)
+    return round_trip
+
+# --------------------------------------------------------------------------------
+def make_two_pass_round_trip() -> Callable:
+    request_text = JSON_CODEC.encode(
+        RequestDTO(route_key="app.ping", span_key=SpanKey.generate(), data=PingRequestDto(message="ping"))
+    ).decode()
+    response = ResponseDTO(span_key=SpanKey.generate(), status=Status.SUCCESS.value, data=PongResponseDto(message="pong"))
+
+    def round_trip():
+        RequestDTO(**json.loads(request_text.strip()))
+        return response.model_dump_json().encode()
+    return round_trip
+
+# --------------------------------------------------------------------------------
+def do_run(run_name: str, number_of_runs: int, number_of_messages: int, function: Callable, payload_size: int):
+    durations = timeit.repeat(function, number=number_of_messages, repeat=number_of_runs)
+    best      = min(durations)
+    print(
+        f"{run_name:<16}: best of {number_of_runs}: {number_of_messages/best:14.2f} round trips/second"
+        f", response payload {payload_size} bytes"
+    )
+
+# --------------------------------------------------------------------------------
+def main():
+    if len(sys.argv) < 2:
+        number_of_messages = 100000
+    else:
+        number_of_messages = int(sys.argv[1])
+
+    if len(sys.argv) > 2:
+        number_of_runs = int(sys.argv[2])
+    else:
+        number_of_runs = 5
+
+    two_pass = make_two_pass_round_trip()
+    do_run("json (two pass)", number_of_runs, number_of_messages, two_pass, len(two_pass()))
+    for codec in get_codecs():
+        round_trip = make_round_trip(codec)
+        do_run(codec.name, number_of_runs, number_of_messages, round_trip, len(round_trip()))
+
+# --------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
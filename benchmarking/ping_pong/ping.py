@@ -5,7 +5,9 @@ import asyncio
 from typing import List
 
 from ekosis.clients import TransientTCPClient, UDPClient, TransientUDSClient, PersistedTCPClient, PersistedUDSClient
+from ekosis.clients import PooledTCPClient, PooledUDSClient
 from ekosis.sending.sender import sender
+from ekosis.util import run_on_event_loop
 
 from .dtos import PingRequestDto
 
@@ -14,6 +16,8 @@ client_udp    = UDPClient(server_host='127.0.0.1', server_port=8889)
 client_uds    = TransientUDSClient("/tmp/pong_0.uds.sock")
 persisted_tcp = PersistedTCPClient(server_host='127.0.0.1', server_port=8888)
 persisted_uds = PersistedUDSClient("/tmp/pong_0.uds.sock")
+pooled_tcp    = PooledTCPClient(server_host='127.0.0.1', server_port=8888)
+pooled_uds    = PooledUDSClient("/tmp/pong_0.uds.sock")
 
 # --------------------------------------------------------------------------------
 @sender(client_tcp, "app.ping", PingRequestDto)
@@ -40,6 +44,16 @@ async def persisted_tcp_ping():
 async def persisted_uds_ping():
     return PingRequestDto(message="ping")
 
+# --------------------------------------------------------------------------------
+@sender(pooled_tcp, "app.ping", PingRequestDto)
+async def pooled_tcp_ping():
+    return PingRequestDto(message="ping")
+
+# --------------------------------------------------------------------------------
+@sender(pooled_uds, "app.ping", PingRequestDto)
+async def pooled_uds_ping():
+    return PingRequestDto(message="ping")
+
 # --------------------------------------------------------------------------------
 def report_run_data(test_type: str, number_of_messages: int, duration_list: List[float]):
     number_of_runs = len(duration_list)
@@ -67,14 +81,17 @@ async def do_run(run_name: str, number_of_runs: int, number_of_messages: int, fu
 
 # --------------------------------------------------------------------------------
 async def do_timing(number_of_runs: int, number_of_messages: int):
+    print(f"Client event loop: {type(asyncio.get_running_loop()).__module__}\n")
     await do_run("Transient TCP", number_of_runs, number_of_messages, tcp_ping)
     await do_run("Persisted TCP", number_of_runs, number_of_messages, persisted_tcp_ping)
+    await do_run("Pooled TCP"   , number_of_runs, number_of_messages, pooled_tcp_ping)
     await do_run("UDP"          , number_of_runs, number_of_messages, udp_ping)
     await do_run("Transient UDS", number_of_runs, number_of_messages, uds_ping)
     await do_run("Persisted UDS", number_of_runs, number_of_messages, persisted_uds_ping)
+    await do_run("Pooled UDS"   , number_of_runs, number_of_messages, pooled_uds_ping)
 
 # --------------------------------------------------------------------------------
-async def main():
+def main():
     if len(sys.argv) < 2:
         number_of_messages = 10000
     else:
@@ -85,7 +102,12 @@ async def main():
     else:
         number_of_runs = 1
 
-    await do_timing(number_of_runs, number_of_messages)
+    if len(sys.argv) > 3:
+        event_loop = sys.argv[3] # 'asyncio' or 'uvloop'
+    else:
+        event_loop = "asyncio"
+
+    run_on_event_loop(do_timing(number_of_runs, number_of_messages), event_loop)
 
 # --------------------------------------------------------------------------------
-asyncio.run(main())
+main()
@@ -1,11 +1,11 @@
 import logging
-import uuid
 
 from pydantic import BaseModel as PydanticBaseModel
 
 from ekosis.application_base import ApplicationBase
 from ekosis.configuration.config_models import ConfigTCP, ConfigUDP, ConfigUDS
 from ekosis.requests.endpoint import endpoint
+from ekosis.data_transfer_objects import SpanKey
 
 from .dtos import PingRequestDto, PongResponseDto
 
@@ -13,8 +13,8 @@ log = logging.getLogger()
 
 # --------------------------------------------------------------------------------
 @endpoint("app.ping", PingRequestDto)
-async def app_ping(uid: uuid.UUID, dto: PingRequestDto) -> PydanticBaseModel:
-    log.info(f"{uid}")
+async def app_ping(span_key: SpanKey, dto: PingRequestDto) -> PydanticBaseModel:
+    log.info(f"{span_key}")
     return PongResponseDto(message="pong")
 
 # --------------------------------------------------------------------------------
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from typing import List, Tuple
+
+from ekosis.data_transfer_objects import SpanKey
+from ekosis.queues import PaginatedQueue, QUEUE_STORAGE_SQLITE, QUEUE_STORAGE_SEGMENTED_LOG, SYNCHRONOUS_FULL, DURABILITY_PAGE, DURABILITY_JOURNAL
+from ekosis.queues.pending_queue import PendingEntry
+
+from ..ping_pong.dtos import PingRequestDto
+
+# --------------------------------------------------------------------------------
+# Pushes messages onto a PaginatedQueue, then pops them all off again, for each
+# kind of storage. Only the pages that don't fit in memory go to storage. So with
+# the default page_size of 100, nearly every message is written and read once.
+#
+# With durability at journal, a push only returns once it is on disk. So pushes are
+# made CONCURRENT_PUSHES at a time, like they would be by that many connections.
+# --------------------------------------------------------------------------------
+CONCURRENT_PUSHES = 100
+
+STORAGE_FILE_NAMES = {
+    QUEUE_STORAGE_SQLITE       : "queue.sqlite",
+    QUEUE_STORAGE_SEGMENTED_LOG: "queue.log",
+}
+
+# --------------------------------------------------------------------------------
+async def push_then_pop(storage: str, number_of_messages: int, page_size: int, synchronous: str, durability: str) -> Tuple[float, float]:
+    directory = tempfile.mkdtemp()
+    try:
+        queue   = PaginatedQueue[PendingEntry](os.path.join(directory, STORAGE_FILE_NAMES[storage]), PendingEntry, page_size, storage, synchronous, durability)
+        entries = [(span_key, PendingEntry(span_key=span_key, data=PingRequestDto(message="ping")))
+                   for span_key in (SpanKey.generate() for _ in range(number_of_messages))]
+
+        start = time.perf_counter()
+        if durability == DURABILITY_JOURNAL:
+            for i in range(0, number_of_messages, CONCURRENT_PUSHES):
+                await asyncio.gather(*(queue.push(entry, span_key) for span_key, entry in entries[i:i + CONCURRENT_PUSHES]))
+        else:
+            for span_key, entry in entries:
+                await queue.push(entry, span_key)
+        pushed = time.perf_counter()
+        while await queue.pop() is not None:
+            pass
+        popped = time.perf_counter()
+        queue.shut_down()
+        return pushed - start, popped - pushed
+    finally:
+        shutil.rmtree(directory)
+
+# --------------------------------------------------------------------------------
+def do_run(storage: str, number_of_runs: int, number_of_messages: int, page_size: int, synchronous: str, durability: str):
+    durations: List[Tuple[float, float]] = [
+        asyncio.run(push_then_pop(storage, number_of_messages, page_size, synchronous, durability)) for _ in range(number_of_runs)
+    ]
+    best_push = min(push for push, _ in durations)
+    best_pop  = min(pop for _, pop in durations)
+    print(
+        f"{storage:<14}: best of {number_of_runs}: {number_of_messages/best_push:12.2f} pushes/second"
+        f", {number_of_messages/best_pop:12.2f} pops/second"
+    )
+
+# --------------------------------------------------------------------------------
+def main():
+    number_of_messages = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    number_of_runs     = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    page_size          = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    synchronous        = sys.argv[4].upper() if len(sys.argv) > 4 else SYNCHRONOUS_FULL
+    durability         = sys.argv[5].lower() if len(sys.argv) > 5 else DURABILITY_PAGE
+
+    for storage in STORAGE_FILE_NAMES:
+        do_run(storage, number_of_runs, number_of_messages, page_size, synchronous, durability)
+
+# --------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
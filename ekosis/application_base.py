@@ -1,11 +1,12 @@
 import os
 import asyncio
 import signal
+import socket
 import argparse
 import logging
 
 from .logs import EcoLogger
-from .configuration.config_models import AppConfiguration
+from .configuration.config_models import AppConfiguration, ConfigUDS
 
 from .requests.request_router import RequestRouter
 
@@ -18,8 +19,11 @@ from .servers import (
 from .state_keepers.buffered_sender_keeper import BufferedSenderKeeper
 from .state_keepers.error_state_list import ErrorStateList
 from .state_keepers.statistics_keeper import StatisticsKeeper
+from .state_keepers.worker_context import WorkerContext
 
-from .util import SingletonType
+from .util import SingletonType, run_on_event_loop
+from .workers import WorkerPool, OWNER_MAX_IN_FLIGHT
+from .workers.statistics_channel import WorkerStatisticsChannel
 
 from .exceptions.exception_base import ExceptionBase
 
@@ -29,6 +33,7 @@ from .exceptions.exception_base import ExceptionBase
 from .standard_endpoints.log_manager import eco_log_level, eco_log_buffer # noqa
 from .standard_endpoints.statistics import eco_statistics_get # noqa
 from .standard_endpoints.errors import eco_error_states_get, eco_error_states_clear # noqa
+from .standard_endpoints.workers import eco_worker_buffered_sender_enqueue # noqa
 from .standard_endpoints.buffered_handler_manager import ( # noqa
     eco_buffered_handler_data,
     eco_buffered_handler_errors_clear,
@@ -81,6 +86,10 @@ class ApplicationBase(metaclass=SingletonType):
     __server_tcp          : TCPServer               = None
     __server_udp          : UDPServer               = None
     __server_uds          : UDSServer               = None
+    __server_owner        : UDSServer               = None
+    __worker_context      : WorkerContext           = WorkerContext()
+    __worker_pool         : WorkerPool              = None
+    __statistics_channel  : WorkerStatisticsChannel = None
 
     # --------------------------------------------------------------------------------
     def __init__(self):
@@ -96,6 +105,26 @@ class ApplicationBase(metaclass=SingletonType):
         for x_signal in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
             signal.signal(x_signal, self.__handle_exit_signal)
 
+    # Once the event loop runs, signals are handled by the loop itself. Not every loop
+    # (e.g. uvloop) lets an exception raised in a signal handler get out of the loop.
+    # Cancelling the main task shuts down the same way, on all of them.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __setup_loop_signal_handlers():
+        loop      = asyncio.get_running_loop()
+        main_task = asyncio.current_task()
+        for x_signal in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            try:
+                loop.add_signal_handler(x_signal, main_task.cancel)
+            except NotImplementedError: # pragma: no cover
+                return # Windows. The signal handlers set up in __enter__ remain in use.
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __ignore_exit_signals():
+        for x_signal in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(x_signal, signal.SIG_IGN)
+
     # --------------------------------------------------------------------------------
     def __enter__(self):
         self.__setup_signal_handlers()
@@ -121,9 +150,15 @@ class ApplicationBase(metaclass=SingletonType):
     # --------------------------------------------------------------------------------
     def __do_shutdown(self):
         self.logger.info("Doing Shutdown.")
-        self.__stop_servers()
-        self.__shut_down_buffered_handlers()
-        self.__shut_down_buffered_senders()
+        if self.__worker_pool is not None:
+            self.__ignore_exit_signals() # The workers get signalled by the pool.
+            self.__worker_pool.stop()
+            self.__close_shared_sockets()
+        else:
+            self.__stop_servers()
+            if self.__worker_context.owns_buffers():
+                self.__shut_down_buffered_handlers()
+                self.__shut_down_buffered_senders()
         self.logger.info(f"Instance [{self._configuration.instance}] of application [{self._configuration.name}] shutdown.")
         self.__eco_logger.flush()
 
@@ -167,6 +202,7 @@ class ApplicationBase(metaclass=SingletonType):
         )
 
         self.__configure_communication_servers()
+        self.__configure_workers()
 
     # --------------------------------------------------------------------------------
     def __configure_communication_servers(self):
@@ -182,6 +218,72 @@ class ApplicationBase(metaclass=SingletonType):
                 uds_config.socket_file_name = f"{self._configuration.name}_{self._configuration.instance}.uds.sock"
             self.__server_uds = UDSServer(uds_config)
 
+    # --------------------------------------------------------------------------------
+    def __configure_workers(self):
+        if self._configuration.workers <= 1:
+            return
+        if not WorkerPool.is_supported(): # pragma: no cover
+            self.logger.warning("Worker mode is not supported on this platform. Running a single process.")
+            return
+
+        self.__worker_pool = WorkerPool(
+            self._configuration.workers,
+            self.__run_worker,
+            self._configuration.stats_keeper.history_length
+        )
+        if self.__server_tcp:
+            self.__server_tcp.enable_reuse_port()
+        if self.__server_udp:
+            self.__server_udp.enable_reuse_port()
+
+    # --------------------------------------------------------------------------------
+    def __owner_socket_file_name(self) -> str:
+        return f"{self._configuration.name}-{self._configuration.instance}.w0.sock"
+
+    # Worker 0 owns the buffered queues, and takes buffered requests from the
+    # other workers on a UDS socket of its own.
+    # --------------------------------------------------------------------------------
+    def __configure_owner_server(self):
+        self.__server_owner = UDSServer(ConfigUDS(
+            directory        = self._configuration.lock_directory,
+            socket_file_name = self.__owner_socket_file_name(),
+            max_in_flight    = OWNER_MAX_IN_FLIGHT,
+            max_concurrent   = 0, # Forwarded requests were already admitted by the worker that received them.
+            max_connections  = 0,
+            binary_framing   = False,
+        ))
+        self.__server_owner.disable_statistics() # The worker that forwarded the request, counted it.
+
+    # --------------------------------------------------------------------------------
+    def __close_shared_sockets(self):
+        if self.__server_uds:
+            self.__server_uds.close_shared_socket()
+        owner_socket_path = f"{self._configuration.lock_directory}/{self.__owner_socket_file_name()}"
+        if os.path.exists(owner_socket_path):
+            os.remove(owner_socket_path)
+
+    # Runs in the forked worker process, and does not return to the caller.
+    # --------------------------------------------------------------------------------
+    def __run_worker(self, index: int, channel: socket.socket):
+        self.__worker_pool = None
+        self.__worker_context.set_worker(
+            index,
+            self._configuration.workers,
+            f"{self._configuration.lock_directory}/{self.__owner_socket_file_name()}"
+        )
+        self.__eco_logger.setup_worker(index)
+        self.__statistics_channel = WorkerStatisticsChannel(channel)
+        if self.__worker_context.owns_buffers():
+            self.__configure_owner_server()
+
+        try:
+            run_on_event_loop(self.__start(), self._configuration.event_loop)
+        except (TerminationSignalException, asyncio.CancelledError):
+            self.logger.info(f"Shutdown: Worker [{index}] received termination signal.")
+        finally:
+            self.__ignore_exit_signals()
+            self.__do_shutdown()
+
     # --------------------------------------------------------------------------------
     async def __setup_buffered_handlers(self):
         buffer_directory = self._configuration.buffer_directory
@@ -189,7 +291,8 @@ class ApplicationBase(metaclass=SingletonType):
             await buffered_handler.setup(
                 buffer_directory,
                 self._configuration.name,
-                self._configuration.instance
+                self._configuration.instance,
+                self._configuration.buffer_synchronous
             )
 
     # --------------------------------------------------------------------------------
@@ -200,7 +303,8 @@ class ApplicationBase(metaclass=SingletonType):
             await buffered_senders.setup(
                 buffer_directory,
                 self._configuration.name,
-                self._configuration.instance
+                self._configuration.instance,
+                self._configuration.buffer_synchronous
             )
 
     # --------------------------------------------------------------------------------
@@ -221,7 +325,12 @@ class ApplicationBase(metaclass=SingletonType):
             self.logger.info("Application not running in context. Shutting down.")
             self.__eco_logger.flush()
             return
-        asyncio.run(self.__start())
+        if self.__worker_pool is not None:
+            if self.__server_uds:
+                self.__server_uds.bind_shared_socket()
+            self.__worker_pool.start()
+        else:
+            run_on_event_loop(self.__start(), self._configuration.event_loop)
 
     # --------------------------------------------------------------------------------
     def stop(self):
@@ -265,20 +374,35 @@ class ApplicationBase(metaclass=SingletonType):
         if self.__server_uds:
             self.__server_uds.stop()
 
+    # --------------------------------------------------------------------------------
+    async def __start_owner_server(self):
+        if self.__server_owner:
+            async with self.__server_owner:
+                await self.__server_owner.serve()
+
+    # --------------------------------------------------------------------------------
+    def __stop_owner_server(self):
+        if self.__server_owner:
+            self.__server_owner.stop()
+
+    # --------------------------------------------------------------------------------
+    async def __start_statistics_channel(self):
+        if self.__statistics_channel:
+            await self.__statistics_channel.serve()
+
     # --------------------------------------------------------------------------------
     def __stop_servers(self):
         self.__stop_tcp_server()
         self.__stop_udp_server()
         self.__stop_uds_server()
+        self.__stop_owner_server()
 
     # --------------------------------------------------------------------------------
     async def setup_tasks(self, tasks: list):
         pass
 
     # --------------------------------------------------------------------------------
-    async def __start(self):
-        tasks = []
-
+    async def __start_buffers(self, tasks: list):
         await self.__setup_buffered_handlers()
         await self.__setup_buffered_senders()
 
@@ -291,10 +415,21 @@ class ApplicationBase(metaclass=SingletonType):
             task = asyncio.create_task(buffered_sender.wait_for_shutdown())
             tasks.append(task)
 
+    # --------------------------------------------------------------------------------
+    async def __start(self):
+        tasks = []
+        self.__setup_loop_signal_handlers()
+        self.logger.info(f"Running on event loop [{type(asyncio.get_running_loop()).__module__}].")
+
+        if self.__worker_context.owns_buffers():
+            await self.__start_buffers(tasks)
+
         tasks.append(asyncio.create_task(self.__start_stats_keeper()))
+        tasks.append(asyncio.create_task(self.__start_statistics_channel()))
         tasks.append(asyncio.create_task(self.__start_tcp_server()))
         tasks.append(asyncio.create_task(self.__start_udp_server()))
         tasks.append(asyncio.create_task(self.__start_uds_server()))
+        tasks.append(asyncio.create_task(self.__start_owner_server()))
 
         await self.setup_tasks(tasks)
 
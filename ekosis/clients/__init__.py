@@ -3,4 +3,6 @@ from .json import UDPClient
 from .json import TransientUDSClient
 from .json.persisted_tcp import PersistedTCPClient
 from .json.persisted_uds import PersistedUDSClient
+from .json.pooled_tcp import PooledTCPClient
+from .json.pooled_uds import PooledUDSClient
 from .client_base import ClientBase
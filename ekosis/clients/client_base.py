@@ -1,11 +1,13 @@
-import json
-
 from abc import ABC, abstractmethod
-from typing import Type
+from typing import List, Type, Tuple
 from pydantic import BaseModel as PydanticBaseModel
 
-from ..data_transfer_objects import RequestDTO, ResponseDTO, EmptyDto, SpanKey
+from ..codecs import CodecBase, JSON_CODEC, get_codec
+from ..data_transfer_objects import RequestDTO, ResponseDTO, EmptyDto, SpanKey, span_id_gen
+from ..data_transfer_objects import BATCH_ROUTE_KEY, BatchRequestDto, BatchResponseDto
+from ..framing import MessageType, PayloadEncoding, FrameHeader, encode_frame, accepted_compression_flags, decompress_payload
 from ..requests.status import Status
+from ..requests.request_context import _get_remaining_time
 
 from ..exceptions import (
     ProtocolParsingException,
@@ -14,6 +16,7 @@ from ..exceptions import (
     RouteKeyUnknownException,
     ServerBusyException,
     ProcessingException,
+    DeadlineExceededException,
     UnhandledException,
     UnknownStatusCodeException,
 )
@@ -22,19 +25,79 @@ from ..exceptions import (
 class ClientBase(ABC):
     def __init__(
         self,
-        max_retries: int   = 3,
-        retry_delay: float = 0.1,
+        max_retries   : int             = 3,
+        retry_delay   : float           = 0.1,
+        binary_framing: bool            = False,
+        codec         : PayloadEncoding = PayloadEncoding.JSON,
+        compression   : bool            = False,
     ):
-        self.max_retries: int   = max_retries
-        self.retry_delay: float = retry_delay
-        self.retry_count: int   = 0
-        self.success    : bool  = False
+        self.max_retries      : int       = max_retries
+        self.retry_delay      : float     = retry_delay
+        self.codec            : CodecBase = get_codec(codec) # Fails early, if the codec is not available here.
+        self.binary_framing   : bool      = binary_framing or compression or self.codec.encoding != PayloadEncoding.JSON
+        self.compression_flags: int       = accepted_compression_flags() if compression else 0
+        self.retry_count      : int       = 0
+        self.success          : bool      = False
 
     # --------------------------------------------------------------------------------
     @abstractmethod
-    async def _send_message_retry_loop(self, request: str) -> str: # pragma: no cover
+    async def _send_message_retry_loop(self, request: RequestDTO, span_key: SpanKey = None) -> ResponseDTO: # pragma: no cover
         pass
 
+    # How long the transport waits for a response. None, when it waits as long as it takes.
+    # --------------------------------------------------------------------------------
+    def _request_timeout(self) -> float | None:
+        return None
+
+    # The server gets as long as we wait for the response. Or less, when we are sending on behalf
+    # of a request that has less time left than that. Worked out again for every attempt.
+    # --------------------------------------------------------------------------------
+    def __request_deadline(self) -> float | None:
+        timeout   = self._request_timeout()
+        remaining = _get_remaining_time()
+        if remaining is None:
+            return timeout
+        remaining = max(0.0, remaining)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    # Raises DeadlineExceededException, when the deadline the request inherited has already passed.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __check_inherited_deadline(route_key: str):
+        remaining = _get_remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededException(f"Deadline exceeded before '{route_key}' was sent")
+
+    # The server answers DEADLINE_EXCEEDED when the time we gave it runs out. When that time
+    # was our own timeout, that is about when we would have timed out ourselves. So it is the
+    # same as timing out, and retried as such. Unless an inherited deadline has passed.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def _check_attempt_timed_out(response: ResponseDTO):
+        if response.status != Status.DEADLINE_EXCEEDED.value:
+            return
+        remaining = _get_remaining_time()
+        if remaining is None or remaining > 0:
+            raise TimeoutError()
+
+    # Binary framing and codecs are only used once the server has agreed to them.
+    # So the transport tells us which encodings the server listed, if any.
+    # --------------------------------------------------------------------------------
+    def _frame_request(self, request: RequestDTO, server_encodings: Tuple[int, ...], flags: int = 0) -> bytes:
+        request.deadline = self.__request_deadline()
+        if not server_encodings:
+            return JSON_CODEC.encode(request) + b'\n'
+        codec = self.codec if self.codec.encoding.value in server_encodings else JSON_CODEC
+        flags = flags | self.compression_flags # Servers that don't compress, ignore these.
+        return encode_frame(MessageType.REQUEST.value, codec.encode(request), flags=flags, encoding=codec.encoding.value)
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def _parse_response(data: bytes, header: FrameHeader | None) -> ResponseDTO:
+        if header is None:
+            return JSON_CODEC.decode(data, ResponseDTO)
+        return get_codec(header.encoding).decode(decompress_payload(data, header.flags), ResponseDTO)
+
     # --------------------------------------------------------------------------------
     @staticmethod
     def generate_response_exception(request: ResponseDTO):
@@ -56,6 +119,9 @@ class ClientBase(ABC):
         if request.status == Status.PROCESSING_FAILURE.value:
             return ProcessingException(str(request.data))
 
+        if request.status == Status.DEADLINE_EXCEEDED.value:
+            return DeadlineExceededException(str(request.data))
+
         if request.status == Status.UNHANDLED.value:
             return UnhandledException(str(request.data))
 
@@ -69,17 +135,53 @@ class ClientBase(ABC):
         response_dto_type: Type[PydanticBaseModel] = EmptyDto,
         span_key         : SpanKey                 = None,
     ) -> PydanticBaseModel:
+        self.__check_inherited_deadline(route_key)
         span_key_to_use  = span_key if span_key else SpanKey.generate()
         self.success     = False
         self.retry_count = 0
         request          = RequestDTO(span_key = span_key_to_use, route_key = route_key, data = data)
-        request_str      = request.model_dump_json()
-        response_str     = await self._send_message_retry_loop(f"{request_str}\n")
-        response_dict    = json.loads(response_str)
-        response         = ResponseDTO(**response_dict)
+        response         = await self._send_message_retry_loop(request, span_key_to_use)
 
         if response.status != Status.SUCCESS.value:
             raise self.generate_response_exception(response)
 
         response_dto     = response_dto_type(**response.data)
         return response_dto
+
+    # Sends all of data_list to route_key, in a single message, and returns their responses in the
+    # same order. A request that failed, has the exception it would have raised in its place.
+    # With ordered=True, the server handles them one after the other. Otherwise, all at the same time.
+    # Requests without a span key of their own in span_keys, get one in the trace of the batch.
+    # --------------------------------------------------------------------------------
+    async def send_batch(
+        self,
+        route_key        : str,
+        data_list        : List[PydanticBaseModel],
+        response_dto_type: Type[PydanticBaseModel]     = EmptyDto,
+        ordered          : bool                        = False,
+        span_key         : SpanKey                     = None,
+        span_keys        : List[SpanKey | None] | None = None,
+    ) -> List[PydanticBaseModel | Exception]:
+        self.__check_inherited_deadline(route_key)
+        span_key_to_use  = span_key if span_key else SpanKey.generate()
+        span_keys        = span_keys if span_keys else [None] * len(data_list)
+        self.success     = False
+        self.retry_count = 0
+        requests         = [
+            RequestDTO(
+                span_key  = request_span_key if request_span_key else SpanKey(trace_id = span_key_to_use.trace_id, span_id = span_id_gen()),
+                route_key = route_key,
+                data      = data
+            )
+            for data, request_span_key in zip(data_list, span_keys)
+        ]
+        request          = RequestDTO(span_key = span_key_to_use, route_key = BATCH_ROUTE_KEY, data = BatchRequestDto(ordered = ordered, requests = requests))
+        response         = await self._send_message_retry_loop(request, span_key_to_use)
+
+        if response.status != Status.SUCCESS.value:
+            raise self.generate_response_exception(response)
+
+        return [
+            response_dto_type(**item.data) if item.status == Status.SUCCESS.value else self.generate_response_exception(item)
+            for item in BatchResponseDto.model_validate(response.data).responses
+        ]
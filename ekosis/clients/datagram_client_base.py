@@ -1,80 +1,235 @@
+import random
 import asyncio
 import logging
+import itertools
+
+from typing import Any, Dict, Iterator, List, Tuple
 
 from .client_base import ClientBase
 
+from ..data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ..framing import (
+    MessageType,
+    PayloadEncoding,
+    BINARY_FRAMING_ENQ,
+    CAPABILITY_FRAGMENTS,
+    FLAG_ACCEPTS_FRAGMENTS,
+    FragmentReassembler,
+    decode_binary_framing_ack,
+    decode_binary_framing_capabilities,
+    decode_datagram_frame,
+    enlarge_receive_buffer,
+    is_binary_frame,
+    split_into_fragments,
+)
 from ..exceptions import (
+    CodecException,
+    FramingException,
     CommunicationsNonRetryable,
     CommunicationsMaxRetriesReached,
 )
 
 log = logging.getLogger()
 
+# --------------------------------------------------------------------------------
+# Any number of requests can be in flight on the one socket. Responses are matched
+# to their request on span_key, and every request times out on its own.
 # --------------------------------------------------------------------------------
 class DatagramProtocolClient(asyncio.DatagramProtocol):
-    def __init__(self, timeout: float):
-        self.timeout  : float                     = timeout
-        self.response : asyncio.Future            = None
-        self.transport: asyncio.DatagramTransport = None
+    __ACK_byte: int = 6 # Decimal 6 = Ascii ACK (acknowledge) character
+
+    def __init__(self, timeout: float, reassembler: FragmentReassembler | None = None):
+        self.timeout    : float                         = timeout
+        self.transport  : asyncio.DatagramTransport     = None
+        self.reassembler: FragmentReassembler | None    = reassembler
+        self.pending    : Dict[SpanKey, asyncio.Future] = {}
+        self.handshake  : asyncio.Future | None         = None
 
     # --------------------------------------------------------------------------------
     def connection_made(self, transport):
         self.transport = transport
 
+    # Fragments are held on to, until the last one is in. Only then is there a response.
     # --------------------------------------------------------------------------------
-    def datagram_received(self, data: bytes, address: tuple[str, int]) -> None:
-        if self.response:
-            self.response.set_result(data.decode())
-            self.response = None
+    def __reassemble(self, data: bytes) -> bytes | None:
+        try:
+            header, payload = decode_datagram_frame(data)
+            if header.message_type != MessageType.FRAGMENT.value:
+                return data
+            return self.reassembler.add(None, payload)
+        except FramingException as e:
+            log.warning(f"Dropping datagram: {e}")
+            return None
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __parse(data: bytes) -> ResponseDTO:
+        if is_binary_frame(data):
+            header, data = decode_datagram_frame(data)
+            return ClientBase._parse_response(data, header)
+        return ClientBase._parse_response(data, None)
 
     # --------------------------------------------------------------------------------
-    async def send_message(self, message: str):
-        if self.transport is not None:
-            self.response = asyncio.Future()
-            self.transport.sendto(message.encode())
-            return await asyncio.wait_for(self.response, timeout=self.timeout)
+    @staticmethod
+    def __resolve(future: asyncio.Future | None, result: Any):
+        if future is None or future.done():
+            return
+        if isinstance(result, Exception):
+            future.set_exception(result)
         else:
-            return None
+            future.set_result(result)
+
+    # --------------------------------------------------------------------------------
+    def datagram_received(self, data: bytes, address: tuple[str, int]) -> None:
+        if self.reassembler is not None and is_binary_frame(data):
+            data = self.__reassemble(data)
+        if not data:
+            return
+
+        if data[0] == self.__ACK_byte:
+            self.__resolve(self.handshake, data)
+            return
+
+        response: ResponseDTO | Exception
+        try:
+            response = self.__parse(data)
+            span_key = response.span_key
+        except (ValueError, FramingException, CodecException) as e:
+            response = e
+            span_key = None
+
+        if span_key is None:
+            # A response the server could not attach a span_key to. e.g. A server without
+            # binary framing, that did not understand our handshake. We can only be certain
+            # of who it belongs to, if there is exactly one exchange waiting for an answer.
+            if self.handshake is not None and not self.handshake.done():
+                self.__resolve(self.handshake, data)
+                return
+            if len(self.pending) != 1:
+                log.warning("UDP client discarding response without span_key.")
+                return
+            span_key = next(iter(self.pending))
+
+        self.__resolve(self.pending.pop(span_key, None), response)
+
+    # The raw answer of the server, i.e. Not a ResponseDTO.
+    # --------------------------------------------------------------------------------
+    async def send_handshake(self, datagram: bytes) -> bytes:
+        self.handshake = asyncio.get_running_loop().create_future()
+        try:
+            self.transport.sendto(datagram)
+            return await asyncio.wait_for(self.handshake, timeout=self.timeout)
+        finally:
+            self.handshake = None
+
+    # --------------------------------------------------------------------------------
+    async def send_message(self, span_key: SpanKey, *datagrams: bytes) -> ResponseDTO:
+        # Two requests with the same span_key can't be in flight at the same time.
+        # The second one waits for the first.
+        while span_key in self.pending:
+            await asyncio.wait([self.pending[span_key]])
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[span_key] = future
+        try:
+            for datagram in datagrams:
+                self.transport.sendto(datagram)
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        finally:
+            if self.pending.get(span_key) is future:
+                self.pending.pop(span_key)
 
 # --------------------------------------------------------------------------------
 class DatagramClientBase(ClientBase, asyncio.DatagramProtocol):
     def __init__(
         self,
-        server_host: str,
-        server_port: int,
-        timeout    : float = 5,
-        max_retries: int   = 3,
-        retry_delay: float = 0.1,
+        server_host   : str,
+        server_port   : int,
+        timeout       : float           = 5,
+        max_retries   : int             = 3,
+        retry_delay   : float           = 0.1,
+        binary_framing: bool            = False,
+        codec         : PayloadEncoding = PayloadEncoding.JSON,
+        fragment_size : int             = 0,
+        compression   : bool            = False,
     ):
-        super().__init__(max_retries, retry_delay)
-        self.server_host: str                       = server_host
-        self.server_port: int                       = server_port
-        self.timeout    : float                     = timeout
-        self.initialised: bool                      = False
-        self.loop       : asyncio.AbstractEventLoop = None
-        self.transport  : asyncio.DatagramTransport = None
-        self.protocol   : DatagramProtocolClient    = None
-        self.send_lock  : asyncio.Lock              = asyncio.Lock()
+        super().__init__(max_retries, retry_delay, binary_framing or fragment_size > 0, codec, compression)
+        self.server_host        : str                       = server_host
+        self.server_port        : int                       = server_port
+        self.timeout            : float                     = timeout
+        self.fragment_size      : int                       = max(0, fragment_size)
+        self.initialised        : bool                      = False
+        self.server_encodings   : Tuple[int, ...]|None      = None # Not known until negotiated with the server.
+        self.server_capabilities: Tuple[int, ...]           = ()
+        self.message_ids        : Iterator[int]             = itertools.count(random.getrandbits(32))
+        self.loop               : asyncio.AbstractEventLoop = None
+        self.transport          : asyncio.DatagramTransport = None
+        self.protocol           : DatagramProtocolClient    = None
+        self.connect_lock       : asyncio.Lock              = asyncio.Lock()
+
+    # --------------------------------------------------------------------------------
+    def _request_timeout(self) -> float | None:
+        return self.timeout
+
+    # A server without binary framing never answers ACK STX LF.
+    # So a timeout here, simply means we stick to newline delimited messages.
+    # --------------------------------------------------------------------------------
+    async def __negotiated_encodings(self) -> Tuple[int, ...]:
+        if not self.binary_framing:
+            return ()
+        if self.server_encodings is None:
+            try:
+                binary_framing_ack       = await self.protocol.send_handshake(BINARY_FRAMING_ENQ)
+                self.server_encodings    = decode_binary_framing_ack(binary_framing_ack)
+                self.server_capabilities = decode_binary_framing_capabilities(binary_framing_ack)
+            except (TimeoutError, asyncio.TimeoutError):
+                return () # Could have been a lost datagram, so we ask again next time.
+        return self.server_encodings
+
+    # --------------------------------------------------------------------------------
+    def __uses_fragments(self) -> bool:
+        return self.fragment_size > 0 and CAPABILITY_FRAGMENTS in self.server_capabilities
+
+    # Requests too large for a single datagram, are only split up for servers that accept fragments.
+    # --------------------------------------------------------------------------------
+    def __to_datagrams(self, request: RequestDTO, encodings: Tuple[int, ...]) -> List[bytes]:
+        if not self.__uses_fragments():
+            return [self._frame_request(request, encodings)]
+        message = self._frame_request(request, encodings, FLAG_ACCEPTS_FRAGMENTS)
+        if len(message) <= self.fragment_size:
+            return [message]
+        return split_into_fragments(message, next(self.message_ids) & 0xFFFFFFFF, self.fragment_size)
+
+    # Only setting up the socket, and the negotiation with the server, are done one at a time.
+    # --------------------------------------------------------------------------------
+    async def __check_initialised(self) -> Tuple[int, ...]:
+        async with self.connect_lock:
+            if not self.initialised:
+                self.loop            = asyncio.get_running_loop()
+                self.transport, self.protocol = await self.loop.create_datagram_endpoint(
+                    lambda: DatagramProtocolClient(
+                        self.timeout,
+                        FragmentReassembler(timeout=self.timeout) if self.fragment_size > 0 else None
+                    ),
+                    remote_addr=(self.server_host, self.server_port)
+                )
+                if self.fragment_size > 0:
+                    enlarge_receive_buffer(self.transport.get_extra_info("socket"))
+                self.initialised = True
+            return await self.__negotiated_encodings()
 
     # --------------------------------------------------------------------------------
-    async def _send_message(self, message: str) -> str:
-        if not self.initialised:
-            self.loop            = asyncio.get_running_loop()
-            self.transport, self.protocol = await self.loop.create_datagram_endpoint(
-                lambda: DatagramProtocolClient(self.timeout),
-                remote_addr=(self.server_host, self.server_port)
-            )
-            self.initialised = True
-
-        async with self.send_lock:
-            return await self.protocol.send_message(message)
+    async def _send_message(self, request: RequestDTO) -> ResponseDTO:
+        encodings = await self.__check_initialised()
+        return await self.protocol.send_message(request.span_key, *self.__to_datagrams(request, encodings))
 
     # --------------------------------------------------------------------------------
-    async def _send_message_retry_loop(self, request: str) -> str:
+    async def _send_message_retry_loop(self, request: RequestDTO, span_key: SpanKey = None) -> ResponseDTO:
         retry_count = 0
         while retry_count < self.max_retries:
             try:
                 response = await self._send_message(request)
+                self._check_attempt_timed_out(response)
                 return response
             except (TimeoutError, asyncio.TimeoutError):
                 retry_count += 1
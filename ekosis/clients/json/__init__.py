@@ -3,3 +3,5 @@ from .udp import UDPClient
 from .transient_uds import TransientUDSClient
 from .persisted_tcp import PersistedTCPClient
 from .persisted_uds import PersistedUDSClient
+from .pooled_tcp import PooledTCPClient
+from .pooled_uds import PooledUDSClient
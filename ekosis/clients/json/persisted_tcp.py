@@ -2,6 +2,7 @@ import asyncio
 
 from typing import Tuple
 from ..persistent_stream_client_base import PersistentStreamClientBase
+from ...framing import PayloadEncoding
 
 # --------------------------------------------------------------------------------
 class PersistedTCPClient(PersistentStreamClientBase):
@@ -9,14 +10,18 @@ class PersistedTCPClient(PersistentStreamClientBase):
         self,
         server_host     : str,
         server_port     : int,
-        timeout         : float = 5,
-        heartbeat_period: float = 60,
-        max_retries     : int   = 3,
-        retry_delay     : float = 0.1,
+        timeout         : float           = 5,
+        heartbeat_period: float           = 60,
+        max_retries     : int             = 3,
+        retry_delay     : float           = 0.1,
+        multiplexed     : bool            = False,
+        binary_framing  : bool            = False,
+        codec           : PayloadEncoding = PayloadEncoding.JSON,
+        compression     : bool            = False,
     ):
         self.server_host: str   = server_host
         self.server_port: int   = server_port
-        super().__init__(timeout, heartbeat_period, max_retries, retry_delay)
+        super().__init__(timeout, heartbeat_period, max_retries, retry_delay, multiplexed, binary_framing, codec, compression)
 
     # --------------------------------------------------------------------------------
     async def open_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
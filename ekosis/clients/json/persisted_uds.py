@@ -7,20 +7,25 @@ from pydantic import BaseModel as PydanticBaseModel
 from ..persistent_stream_client_base import PersistentStreamClientBase
 
 from ...data_transfer_objects import EmptyDto, SpanKey
+from ...framing import PayloadEncoding
 
 # --------------------------------------------------------------------------------
 class PersistedUDSClient(PersistentStreamClientBase):
     def __init__(
         self,
         server_path     : str,
-        timeout         : float = 5,
-        heartbeat_period: float = 60,
-        max_retries     : int   = 3,
-        retry_delay     : float = 0.1,
+        timeout         : float           = 5,
+        heartbeat_period: float           = 60,
+        max_retries     : int             = 3,
+        retry_delay     : float           = 0.1,
+        multiplexed     : bool            = False,
+        binary_framing  : bool            = False,
+        codec           : PayloadEncoding = PayloadEncoding.JSON,
+        compression     : bool            = False,
     ):
         self.server_path : str  = server_path
         self.can_transmit: bool = hasattr(socket, "AF_UNIX")
-        super().__init__(timeout, heartbeat_period, max_retries, retry_delay)
+        super().__init__(timeout, heartbeat_period, max_retries, retry_delay, multiplexed, binary_framing, codec, compression)
 
     # --------------------------------------------------------------------------------
     async def open_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
@@ -0,0 +1,33 @@
+import asyncio
+
+from typing import Tuple
+from ..pooled_stream_client_base import PooledStreamClientBase
+from ...framing import PayloadEncoding
+
+# --------------------------------------------------------------------------------
+class PooledTCPClient(PooledStreamClientBase):
+    def __init__(
+        self,
+        server_host        : str,
+        server_port        : int,
+        timeout            : float           = 5,
+        min_connections    : int             = 1,
+        max_connections    : int             = 10,
+        idle_timeout       : float           = 60,
+        health_check_period: float           = 30,
+        max_retries        : int             = 3,
+        retry_delay        : float           = 0.1,
+        binary_framing     : bool            = False,
+        codec              : PayloadEncoding = PayloadEncoding.JSON,
+        compression        : bool            = False,
+    ):
+        self.server_host: str   = server_host
+        self.server_port: int   = server_port
+        super().__init__(
+            timeout, min_connections, max_connections, idle_timeout, health_check_period,
+            max_retries, retry_delay, binary_framing, codec, compression
+        )
+
+    # --------------------------------------------------------------------------------
+    async def open_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self.server_host, self.server_port)
@@ -0,0 +1,50 @@
+import asyncio
+import socket
+
+from typing import Type, Tuple
+from pydantic import BaseModel as PydanticBaseModel
+
+from ..pooled_stream_client_base import PooledStreamClientBase
+
+from ...data_transfer_objects import EmptyDto, SpanKey
+from ...framing import PayloadEncoding
+
+# --------------------------------------------------------------------------------
+class PooledUDSClient(PooledStreamClientBase):
+    def __init__(
+        self,
+        server_path        : str,
+        timeout            : float           = 5,
+        min_connections    : int             = 1,
+        max_connections    : int             = 10,
+        idle_timeout       : float           = 60,
+        health_check_period: float           = 30,
+        max_retries        : int             = 3,
+        retry_delay        : float           = 0.1,
+        binary_framing     : bool            = False,
+        codec              : PayloadEncoding = PayloadEncoding.JSON,
+        compression        : bool            = False,
+    ):
+        self.server_path : str  = server_path
+        self.can_transmit: bool = hasattr(socket, "AF_UNIX")
+        super().__init__(
+            timeout, min_connections, max_connections, idle_timeout, health_check_period,
+            max_retries, retry_delay, binary_framing, codec, compression
+        )
+
+    # --------------------------------------------------------------------------------
+    async def open_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_unix_connection(self.server_path)
+
+    # --------------------------------------------------------------------------------
+    async def send_message(
+        self,
+        route_key        : str,
+        data             : PydanticBaseModel,
+        response_dto_type: Type[PydanticBaseModel] = EmptyDto,
+        span_key         : SpanKey                 = None
+    ) -> PydanticBaseModel:
+        if not self.can_transmit:
+            raise Exception("UDS communications are not supported on this platform. Will not send message.")
+
+        return await super().send_message(route_key, data, response_dto_type, span_key)
@@ -2,18 +2,22 @@ import asyncio
 
 from typing import Tuple
 from ..stream_client_base import StreamClientBase
+from ...framing import PayloadEncoding
 
 # --------------------------------------------------------------------------------
 class TransientTCPClient(StreamClientBase):
     def __init__(
         self,
-        server_host: str,
-        server_port: int,
-        timeout    : float = 5,
-        max_retries: int   = 3,
-        retry_delay: float = 0.1,
+        server_host   : str,
+        server_port   : int,
+        timeout       : float           = 5,
+        max_retries   : int             = 3,
+        retry_delay   : float           = 0.1,
+        binary_framing: bool            = False,
+        codec         : PayloadEncoding = PayloadEncoding.JSON,
+        compression   : bool            = False,
     ):
-        super().__init__(timeout, max_retries, retry_delay)
+        super().__init__(timeout, max_retries, retry_delay, binary_framing, codec, compression)
         self.server_host: str   = server_host
         self.server_port: int   = server_port
 
@@ -7,17 +7,21 @@ from pydantic import BaseModel as PydanticBaseModel
 from ..stream_client_base import StreamClientBase
 
 from ...data_transfer_objects import EmptyDto, SpanKey
+from ...framing import PayloadEncoding
 
 # --------------------------------------------------------------------------------
 class TransientUDSClient(StreamClientBase):
     def __init__(
         self,
-        server_path: str,
-        timeout    : float = 5,
-        max_retries: int   = 3,
-        retry_delay: float = 0.1,
+        server_path   : str,
+        timeout       : float           = 5,
+        max_retries   : int             = 3,
+        retry_delay   : float           = 0.1,
+        binary_framing: bool            = False,
+        codec         : PayloadEncoding = PayloadEncoding.JSON,
+        compression   : bool            = False,
     ):
-        super().__init__(timeout, max_retries, retry_delay)
+        super().__init__(timeout, max_retries, retry_delay, binary_framing, codec, compression)
         self.server_path : str  = server_path
         self.can_transmit: bool = hasattr(socket, "AF_UNIX")
 
@@ -1,13 +1,18 @@
 from ..datagram_client_base import DatagramClientBase
+from ...framing import PayloadEncoding
 
 # --------------------------------------------------------------------------------
 class UDPClient(DatagramClientBase):
     def __init__(
         self,
-        server_host: str,
-        server_port: int,
-        timeout    : int   = 5,
-        max_retries: int   = 3,
-        retry_delay: float = 0.1,
+        server_host   : str,
+        server_port   : int,
+        timeout       : int             = 5,
+        max_retries   : int             = 3,
+        retry_delay   : float           = 0.1,
+        binary_framing: bool            = False,
+        codec         : PayloadEncoding = PayloadEncoding.JSON,
+        fragment_size : int             = 0,
+        compression   : bool            = False,
     ):
-        super().__init__(server_host, server_port, timeout, max_retries, retry_delay)
+        super().__init__(server_host, server_port, timeout, max_retries, retry_delay, binary_framing, codec, fragment_size, compression)
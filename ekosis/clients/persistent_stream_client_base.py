@@ -3,14 +3,18 @@ import asyncio
 import logging
 
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Dict, Tuple
 
 from .client_base import ClientBase
 
+from ..data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ..framing import PayloadEncoding, FrameHeader, read_message, negotiate_binary_framing
 from ..exceptions import (
     CommunicationsNonRetryable,
     CommunicationsMaxRetriesReached,
     CommunicationsEmptyResponse,
+    CodecException,
+    FramingException,
 )
 
 log = logging.getLogger()
@@ -24,37 +28,62 @@ class PersistentStreamClientBase(ClientBase, ABC):
 
     def __init__(
         self,
-        timeout         : float = 5,
-        heartbeat_period: float = 60,
-        max_retries     : int   = 3,
-        retry_delay     : float = 0.1,
+        timeout         : float           = 5,
+        heartbeat_period: float           = 60,
+        max_retries     : int             = 3,
+        retry_delay     : float           = 0.1,
+        multiplexed     : bool            = False,
+        binary_framing  : bool            = False,
+        codec           : PayloadEncoding = PayloadEncoding.JSON,
+        compression     : bool            = False,
     ):
-        super().__init__(max_retries, retry_delay)
-        self.__timeout          : float                = timeout
-        self.__heartbeat_time   : float                = heartbeat_period
-        self.__connected        : bool                 = False
-        self.__last_send        : float                = 0
-        self.__read_lock        : asyncio.Lock         = asyncio.Lock()
-        self.__write_lock       : asyncio.Lock         = asyncio.Lock()
-        self.__reader           : asyncio.StreamReader = None
-        self.__writer           : asyncio.StreamWriter = None
-        self.__heartbeat_task   : asyncio.Task         = None
+        super().__init__(max_retries, retry_delay, binary_framing, codec, compression)
+        self.__timeout          : float                         = timeout
+        self.__heartbeat_time   : float                         = heartbeat_period
+        self.__multiplexed      : bool                          = multiplexed
+        self.__connected        : bool                          = False
+        self.__encodings        : Tuple[int, ...]               = () # Negotiated per connection.
+        self.__last_send        : float                         = 0
+        self.__connect_lock     : asyncio.Lock                  = asyncio.Lock()
+        self.__read_lock        : asyncio.Lock                  = asyncio.Lock()
+        self.__write_lock       : asyncio.Lock                  = asyncio.Lock()
+        self.__reader           : asyncio.StreamReader          = None
+        self.__writer           : asyncio.StreamWriter          = None
+        self.__heartbeat_task   : asyncio.Task                  = None
+        self.__reader_task      : asyncio.Task                  = None
+        self.__heartbeat_future : asyncio.Future                = None
+        self.__pending          : Dict[SpanKey, asyncio.Future] = {}
 
     # --------------------------------------------------------------------------------
     @abstractmethod
     async def open_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]: # pragma: no cover
         pass
 
+    # --------------------------------------------------------------------------------
+    def _request_timeout(self) -> float | None:
+        return self.__timeout
+
     # --------------------------------------------------------------------------------
     async def close_connection(self):
         self.__writer.close()
         await self.__writer.wait_closed()
 
+    # --------------------------------------------------------------------------------
+    def is_multiplexed(self) -> bool:
+        return self.__multiplexed
+
     # --------------------------------------------------------------------------------
     async def __check_connected(self):
-        if not self.__connected:
-            self.__reader, self.__writer = await self.open_connection()
-            self.__connected = True
+        async with self.__connect_lock:
+            if not self.__connected:
+                self.__reader, self.__writer = await self.open_connection()
+                self.__encodings = await negotiate_binary_framing(
+                    self.__reader, self.__writer, self.__timeout
+                ) if self.binary_framing else ()
+                self.__connected = True
+                if self.__multiplexed:
+                    self.__pending     = {}
+                    self.__reader_task = asyncio.create_task(self.__read_responses(self.__reader, self.__pending))
 
     # --------------------------------------------------------------------------------
     async def __do_write(self, data: bytes):
@@ -62,9 +91,118 @@ class PersistentStreamClientBase(ClientBase, ABC):
             self.__writer.write(data)
 
     # --------------------------------------------------------------------------------
-    async def __do_read(self) -> bytes:
+    async def __read_message(self, reader: asyncio.StreamReader) -> Tuple[bytes, FrameHeader | None]:
+        if self.__encodings:
+            return await read_message(reader)
+        return await reader.readline(), None
+
+    # --------------------------------------------------------------------------------
+    async def __do_read(self) -> Tuple[bytes, FrameHeader | None]:
+        return await asyncio.wait_for(self.__read_message(self.__reader), self.__timeout) # There needs to be a timeout here.
+
+    # Without multiplexing, responses are matched to requests by order alone.
+    # A pipelined server may answer a heartbeat before an earlier request,
+    # so nothing else may be written until our response has been read.
+    # --------------------------------------------------------------------------------
+    async def __do_exchange(self, data: bytes) -> Tuple[bytes, FrameHeader | None]:
         async with self.__read_lock:
-            return await asyncio.wait_for(self.__reader.readline(), self.__timeout) # There needs to be a timeout here.
+            await self.__do_write(data)
+            return await self.__do_read()
+
+    # Take note: An incomplete line due to EOF is treated as a disconnect.
+    # --------------------------------------------------------------------------------
+    def __is_complete(self, data: bytes, header: FrameHeader | None) -> bool:
+        if header is not None:
+            return bool(data)
+        return bool(data) and data[-1] == self.__LF_byte
+
+    # In multiplexed mode, this is the only place where the connection gets read from.
+    # Each response is handed to the future of the request with the same span_key.
+    #
+    # After a frame that can't be read, there is no telling where the next one starts.
+    # So the connection is closed, and every request still pending fails with the reason.
+    # --------------------------------------------------------------------------------
+    async def __read_responses(self, reader: asyncio.StreamReader, pending: Dict[SpanKey, asyncio.Future]):
+        failure: Exception = CommunicationsEmptyResponse()
+        try:
+            while True:
+                data, header = await self.__read_message(reader)
+                if not self.__is_complete(data, header):
+                    break
+
+                if header is None and data[0] == self.__ACK_byte:
+                    if self.__heartbeat_future is not None and not self.__heartbeat_future.done():
+                        self.__heartbeat_future.set_result(True)
+                    continue
+
+                self.__resolve_pending(pending, data, header)
+        except (ConnectionResetError, ConnectionAbortedError, BrokenPipeError) as e:
+            log.info(f"Multiplexed connection lost: {type(e).__name__}")
+        except FramingException as e:
+            log.warning(f"Multiplexed connection closed after a bad frame: {e}")
+            failure = e
+            if self.__reader is reader:
+                self.__writer.close()
+        finally:
+            if self.__reader is reader:
+                self.__connected = False
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(failure)
+            pending.clear()
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __resolve_pending(pending: Dict[SpanKey, asyncio.Future], data: bytes, header: FrameHeader | None):
+        response: ResponseDTO | Exception
+        try:
+            response = ClientBase._parse_response(data, header)
+            span_key = response.span_key
+        except (ValueError, CodecException, FramingException) as e: # A payload that can't be decompressed, is a FramingException.
+            response = e
+            span_key = None
+
+        if span_key is None:
+            # A response the server could not attach a span_key to. We can only
+            # be certain of who it belongs to, if there is exactly one request in flight.
+            if len(pending) != 1:
+                log.warning("Multiplexed client discarding response without span_key.")
+                return
+            span_key = next(iter(pending))
+
+        future = pending.pop(span_key, None)
+        if future is None or future.done():
+            return
+        if isinstance(response, Exception):
+            future.set_exception(response)
+        else:
+            future.set_result(response)
+
+    # --------------------------------------------------------------------------------
+    async def __send_multiplexed(self, request: RequestDTO, span_key: SpanKey) -> ResponseDTO:
+        # Responses are matched on span_key, so two requests with the same span_key
+        # can't be in flight at the same time. The second one waits for the first.
+        while span_key in self.__pending:
+            await asyncio.wait([self.__pending[span_key]])
+
+        pending = self.__pending
+        future  = asyncio.get_running_loop().create_future()
+        pending[span_key] = future
+        try:
+            self.__writer.write(self._frame_request(request, self.__encodings))
+            return await asyncio.wait_for(future, self.__timeout)
+        finally:
+            if pending.get(span_key) is future:
+                pending.pop(span_key)
+
+    # --------------------------------------------------------------------------------
+    async def __do_multiplexed_heartbeat(self) -> bool:
+        self.__heartbeat_future = asyncio.get_running_loop().create_future()
+        await self.__do_write(self.__ENQ_request)
+        try:
+            return await asyncio.wait_for(self.__heartbeat_future, self.__timeout)
+        except (TimeoutError, asyncio.TimeoutError):
+            return False
 
     # --------------------------------------------------------------------------------
     async def __do_heartbeat(self):
@@ -73,14 +211,21 @@ class PersistentStreamClientBase(ClientBase, ABC):
         except ConnectionRefusedError as e:
             return
 
-        await self.__do_write(self.__ENQ_request)
+        if self.__multiplexed:
+            if await self.__do_multiplexed_heartbeat():
+                self.__last_send = time.time()
+            else:
+                # Closing the writer ends the reader task, which marks us as disconnected
+                # and fails everything that is still waiting on this connection.
+                self.__writer.close()
+            return
 
-        data = await self.__do_read()
+        data, header = await self.__do_exchange(self.__ENQ_request)
 
         if (
-            not data or
-            data[-1] != self.__LF_byte or
-            data[0]  != self.__ACK_byte
+            header is not None or
+            not self.__is_complete(data, header) or
+            data[0] != self.__ACK_byte
         ):
             self.__connected = False
         else:
@@ -101,22 +246,23 @@ class PersistentStreamClientBase(ClientBase, ABC):
             self.__heartbeat_task = loop.create_task(self.__heartbeat_check())
 
     # --------------------------------------------------------------------------------
-    async def _send_message(self, request: str) -> str:
+    async def _send_message(self, request: RequestDTO, span_key: SpanKey = None) -> ResponseDTO:
         try:
             await self.__check_connected()
         except ConnectionRefusedError as e:
             raise e
 
-        await self.__do_write(request.encode())
-
-        data = await self.__do_read()
-        if not data or data[-1] != self.__LF_byte:
-            self.__connected = False
-            raise CommunicationsEmptyResponse()
+        if self.__multiplexed:
+            response = await self.__send_multiplexed(request, span_key)
+        else:
+            data, header = await self.__do_exchange(self._frame_request(request, self.__encodings))
+            if not self.__is_complete(data, header):
+                self.__connected = False
+                raise CommunicationsEmptyResponse()
+            response = self._parse_response(data, header)
 
         self.__last_send = time.time()
-        response_str = data.decode()
-        return response_str
+        return response
 
     # --------------------------------------------------------------------------------
     async def __do_retry_logic(self, retry_count: int):
@@ -128,15 +274,18 @@ class PersistentStreamClientBase(ClientBase, ABC):
         return retry_count
 
     # --------------------------------------------------------------------------------
-    async def _send_message_retry_loop(self, request: str) -> str:
+    async def _send_message_retry_loop(self, request: RequestDTO, span_key: SpanKey = None) -> ResponseDTO:
         await self.__check_heartbeat_task()
 
+        # Take note: self.success is set, but deliberately not used as a loop condition.
+        # Multiple coroutines can be sending on this client at the same time.
         retry_count = 0
-        while retry_count < self.max_retries and not self.success:
+        while retry_count < self.max_retries:
             try:
-                response_str = await self._send_message(request)
+                response     = await self._send_message(request, span_key)
+                self._check_attempt_timed_out(response)
                 self.success = True
-                return response_str
+                return response
             except (TimeoutError, asyncio.TimeoutError):
                 retry_count = await self.__do_retry_logic(retry_count)
             except (
@@ -145,7 +294,8 @@ class PersistentStreamClientBase(ClientBase, ABC):
                 BrokenPipeError,        # So we have to re-connect.
                 CommunicationsEmptyResponse
             ):
-                self.__connected = False
+                if not self.__multiplexed: # In multiplexed mode, the reader task decides when we are disconnected.
+                    self.__connected = False
                 await self.__check_connected()
                 retry_count = await self.__do_retry_logic(retry_count)
             except Exception as e:
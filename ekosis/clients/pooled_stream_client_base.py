@@ -0,0 +1,286 @@
+import time
+import asyncio
+import logging
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Tuple
+
+from .client_base import ClientBase
+
+from ..data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ..framing import PayloadEncoding, FrameHeader, read_message, negotiate_binary_framing
+from ..exceptions import (
+    CommunicationsNonRetryable,
+    CommunicationsMaxRetriesReached,
+    CommunicationsEmptyResponse,
+)
+
+log = logging.getLogger()
+
+# --------------------------------------------------------------------------------
+class _PooledConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, encodings: Tuple[int, ...]):
+        self.reader   : asyncio.StreamReader = reader
+        self.writer   : asyncio.StreamWriter = writer
+        self.encodings: Tuple[int, ...]      = encodings
+        self.last_used: float                = time.monotonic()
+
+    # --------------------------------------------------------------------------------
+    def close(self):
+        self.writer.close()
+
+# --------------------------------------------------------------------------------
+# A client that keeps a pool of connections to the server, and sends every request
+# over one of them that is not in use. Each connection has one request in flight at
+# a time, so responses are matched by order alone, as with a transient client. But
+# without paying for a new connection on every request.
+#
+#   - min_connections are opened in the background, and kept open when idle.
+#   - Connections are never more than max_connections.
+#   - Connections idle for longer than idle_timeout are closed, down to min_connections.
+#   - A connection idle for longer than health_check_period, gets an ENQ/ACK heartbeat
+#     before it is used again. Those that fail it, are replaced.
+#   - A connection that timed out, or was reset, is closed. Never reused.
+#   - When all of them are in use, requests wait their turn, first come first served.
+# --------------------------------------------------------------------------------
+class PooledStreamClientBase(ClientBase, ABC):
+    __ENQ_byte    : int   =  5 # Decimal  5 = Ascii ENQ (enquiry) character
+    __ACK_byte    : int   =  6 # Decimal  6 = Ascii ACK (acknowledge) character
+    __LF_byte     : int   = 10 # Decimal 10 = Ascii LF (line feed) character = '\n'
+    __ENQ_request : bytes = bytes([__ENQ_byte, __LF_byte])
+    __ACK_response: bytes = bytes([__ACK_byte, __LF_byte])
+
+    def __init__(
+        self,
+        timeout            : float           = 5,
+        min_connections    : int             = 1,
+        max_connections    : int             = 10,
+        idle_timeout       : float           = 60,
+        health_check_period: float           = 30,
+        max_retries        : int             = 3,
+        retry_delay        : float           = 0.1,
+        binary_framing     : bool            = False,
+        codec              : PayloadEncoding = PayloadEncoding.JSON,
+        compression        : bool            = False,
+    ):
+        super().__init__(max_retries, retry_delay, binary_framing, codec, compression)
+        self.__timeout            : float                    = timeout
+        self.__max_connections    : int                      = max(1, max_connections)
+        self.__min_connections    : int                      = min(max(0, min_connections), self.__max_connections)
+        self.__idle_timeout       : float                    = idle_timeout
+        self.__health_check_period: float                    = health_check_period
+        self.__idle               : Deque[_PooledConnection] = deque()
+        self.__waiters            : Deque[asyncio.Future]    = deque()
+        self.__size               : int                      = 0 # Idle, in use and being opened.
+        self.__maintenance_task   : asyncio.Task             = None
+        self.__closed             : bool                     = False
+
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    async def open_connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]: # pragma: no cover
+        pass
+
+    # --------------------------------------------------------------------------------
+    def _request_timeout(self) -> float | None:
+        return self.__timeout
+
+    # --------------------------------------------------------------------------------
+    def connection_count(self) -> int:
+        return self.__size
+
+    # --------------------------------------------------------------------------------
+    def idle_connection_count(self) -> int:
+        return len(self.__idle)
+
+    # Connections still in use are closed when they are handed back.
+    # The pool can be used again afterwards. It simply starts over.
+    # --------------------------------------------------------------------------------
+    async def close_connection(self):
+        self.__closed = True
+        if self.__maintenance_task is not None:
+            self.__maintenance_task.cancel()
+            self.__maintenance_task = None
+        while self.__idle:
+            self.__discard(self.__idle.pop())
+
+    # --------------------------------------------------------------------------------
+    async def __open(self) -> _PooledConnection:
+        reader, writer = await asyncio.wait_for(self.open_connection(), self.__timeout)
+        try:
+            encodings = await negotiate_binary_framing(reader, writer, self.__timeout) if self.binary_framing else ()
+        except BaseException:
+            writer.close()
+            raise
+        return _PooledConnection(reader, writer, encodings)
+
+    # --------------------------------------------------------------------------------
+    def __discard(self, connection: _PooledConnection):
+        self.__size -= 1
+        connection.close()
+        self.__hand_over_slot()
+
+    # A slot came free. The longest waiting request gets to open a connection with it.
+    # --------------------------------------------------------------------------------
+    def __hand_over_slot(self):
+        while self.__waiters and self.__size < self.__max_connections:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                self.__size += 1
+                waiter.set_result(None)
+
+    # Handing a connection straight to the longest waiting request, instead of putting it
+    # back in the pool, keeps newcomers from overtaking requests that were there first.
+    # --------------------------------------------------------------------------------
+    def __check_in(self, connection: _PooledConnection):
+        connection.last_used = time.monotonic()
+        if self.__closed:
+            self.__discard(connection)
+            return
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(connection)
+                return
+        self.__idle.append(connection)
+
+    # --------------------------------------------------------------------------------
+    async def __is_healthy(self, connection: _PooledConnection) -> bool:
+        if connection.reader.at_eof() or connection.writer.is_closing():
+            return False
+        if time.monotonic() - connection.last_used < self.__health_check_period:
+            return True
+        try:
+            connection.writer.write(self.__ENQ_request)
+            data = await asyncio.wait_for(connection.reader.readline(), self.__timeout)
+            return data == self.__ACK_response
+        except (TimeoutError, asyncio.TimeoutError, ConnectionError):
+            return False
+
+    # --------------------------------------------------------------------------------
+    async def __wait_for_turn(self) -> _PooledConnection | None:
+        waiter = asyncio.get_running_loop().create_future()
+        self.__waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, self.__timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled(): # Handed a connection or a slot, just as we gave up.
+                self.__give_back(waiter.result())
+            raise
+
+    # --------------------------------------------------------------------------------
+    def __give_back(self, connection: _PooledConnection | None):
+        if connection is not None:
+            self.__check_in(connection)
+        else:
+            self.__size -= 1
+            self.__hand_over_slot()
+
+    # Returns an idle connection, a new one, or the first one handed back, in that order.
+    # --------------------------------------------------------------------------------
+    async def __check_out(self) -> _PooledConnection:
+        self.__closed = False
+        while True:
+            if self.__idle and not self.__waiters:
+                connection = self.__idle.pop() # Most recently used first, so the rest can go idle.
+            elif self.__size < self.__max_connections and not self.__waiters:
+                self.__size += 1
+                connection   = None
+            else:
+                connection = await self.__wait_for_turn()
+
+            if connection is None: # We have a slot, but no connection yet.
+                try:
+                    return await self.__open()
+                except BaseException:
+                    self.__give_back(None)
+                    raise
+
+            if await self.__is_healthy(connection):
+                return connection
+            self.__discard(connection)
+
+    # --------------------------------------------------------------------------------
+    async def __read_response(self, connection: _PooledConnection) -> Tuple[bytes, FrameHeader | None]:
+        if connection.encodings:
+            return await read_message(connection.reader)
+        return await connection.reader.readline(), None
+
+    # --------------------------------------------------------------------------------
+    async def _send_message(self, request: RequestDTO) -> ResponseDTO:
+        connection = await self.__check_out()
+        try:
+            connection.writer.write(self._frame_request(request, connection.encodings))
+            data, header = await asyncio.wait_for(self.__read_response(connection), self.__timeout)
+            if not data:
+                raise CommunicationsEmptyResponse()
+        except BaseException:
+            self.__discard(connection) # A late response would be read as the answer to the next request.
+            raise
+        self.__check_in(connection)
+        return self._parse_response(data, header)
+
+    # --------------------------------------------------------------------------------
+    def __close_idle_connections(self):
+        expired_before = time.monotonic() - self.__idle_timeout
+        keep           = deque()
+        while self.__idle:
+            connection = self.__idle.popleft()
+            if connection.last_used < expired_before and self.__size > self.__min_connections:
+                self.__discard(connection)
+            else:
+                keep.append(connection)
+        self.__idle = keep
+
+    # --------------------------------------------------------------------------------
+    async def __open_min_connections(self):
+        while self.__size < self.__min_connections and not self.__waiters:
+            self.__size += 1
+            try:
+                connection = await self.__open()
+            except (OSError, TimeoutError, asyncio.TimeoutError) as e:
+                self.__give_back(None)
+                log.info(f"Connection pool could not open a connection: {type(e).__name__}")
+                return
+            self.__check_in(connection)
+
+    # --------------------------------------------------------------------------------
+    async def __maintain(self):
+        while True:
+            await self.__open_min_connections()
+            await asyncio.sleep(min(self.__idle_timeout, self.__health_check_period) / 2)
+            self.__close_idle_connections()
+
+    # --------------------------------------------------------------------------------
+    def __check_maintenance_task(self):
+        if self.__maintenance_task is None or self.__maintenance_task.done():
+            self.__maintenance_task = asyncio.get_running_loop().create_task(self.__maintain())
+
+    # --------------------------------------------------------------------------------
+    async def _send_message_retry_loop(self, request: RequestDTO, span_key: SpanKey = None) -> ResponseDTO:
+        self.__check_maintenance_task()
+
+        # Take note: self.success is set, but deliberately not used as a loop condition.
+        # Multiple coroutines can be sending on this client at the same time.
+        retry_count = 0
+        while retry_count < self.max_retries:
+            try:
+                response     = await self._send_message(request)
+                self._check_attempt_timed_out(response)
+                self.success = True
+                return response
+            except (
+                TimeoutError,           # A timed out connection is closed, and
+                asyncio.TimeoutError,   # the request retried on another one.
+                ConnectionResetError,   # Reset, abort and broken-pipe are
+                ConnectionAbortedError, # retryable forms of ConnectionError
+                BrokenPipeError,        # ConnectionRefusedError is NOT retryable.
+                CommunicationsEmptyResponse
+            ):
+                retry_count += 1
+                if retry_count >= self.max_retries:
+                    raise CommunicationsMaxRetriesReached()
+                else:
+                    await asyncio.sleep(self.retry_delay)
+            except Exception as e:
+                raise CommunicationsNonRetryable(f"{type(e)}: {str(e)}")
@@ -6,6 +6,8 @@ from typing import Tuple
 
 from .client_base import ClientBase
 
+from ..data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ..framing import PayloadEncoding, read_message, negotiate_binary_framing
 from ..exceptions import (
     CommunicationsNonRetryable,
     CommunicationsMaxRetriesReached,
@@ -18,12 +20,16 @@ log = logging.getLogger()
 class StreamClientBase(ClientBase, ABC):
     def __init__(
         self,
-        timeout    : float = 5,
-        max_retries: int   = 3,
-        retry_delay: float = 0.1,
+        timeout       : float           = 5,
+        max_retries   : int             = 3,
+        retry_delay   : float           = 0.1,
+        binary_framing: bool            = False,
+        codec         : PayloadEncoding = PayloadEncoding.JSON,
+        compression   : bool            = False,
     ):
-        super().__init__(max_retries, retry_delay)
-        self.__timeout = timeout
+        super().__init__(max_retries, retry_delay, binary_framing, codec, compression)
+        self.__timeout                                = timeout
+        self.__server_encodings: Tuple[int, ...]|None = None # Not known until negotiated with the server.
 
     # --------------------------------------------------------------------------------
     @abstractmethod
@@ -31,27 +37,46 @@ class StreamClientBase(ClientBase, ABC):
         pass
 
     # --------------------------------------------------------------------------------
-    async def _send_message(self, request: str) -> str:
+    def _request_timeout(self) -> float | None:
+        return self.__timeout
+
+    # --------------------------------------------------------------------------------
+    # Negotiating costs a round trip, so it is done on the first connection only.
+    # The outcome is remembered for every connection after that.
+    # --------------------------------------------------------------------------------
+    async def __negotiated_encodings(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Tuple[int, ...]:
+        if not self.binary_framing:
+            return ()
+        if self.__server_encodings is None:
+            self.__server_encodings = await negotiate_binary_framing(reader, writer, self.__timeout)
+        return self.__server_encodings
+
+    # --------------------------------------------------------------------------------
+    async def _send_message(self, request: RequestDTO) -> ResponseDTO:
         reader, writer = await self.open_connection()
-        writer.write(request.encode())
+        encodings      = await self.__negotiated_encodings(reader, writer)
+        writer.write(self._frame_request(request, encodings))
 
-        data = await asyncio.wait_for(reader.readline(), self.__timeout)
+        if encodings:
+            data, header = await asyncio.wait_for(read_message(reader), self.__timeout)
+        else:
+            data, header = await asyncio.wait_for(reader.readline(), self.__timeout), None
         if not data:
             raise CommunicationsEmptyResponse()
 
-        response_str = data.decode()
         writer.close()
         await writer.wait_closed()
-        return response_str
+        return self._parse_response(data, header)
 
     # --------------------------------------------------------------------------------
-    async def _send_message_retry_loop(self, request: str) -> str:
+    async def _send_message_retry_loop(self, request: RequestDTO, span_key: SpanKey = None) -> ResponseDTO:
         retry_count = 0
         while retry_count < self.max_retries and not self.success:
             try:
-                response_str = await self._send_message(request)
+                response     = await self._send_message(request)
+                self._check_attempt_timed_out(response)
                 self.success = True
-                return response_str
+                return response
             except (
                 TimeoutError,           # Timeouts mean the connection is fine
                 asyncio.TimeoutError,   # it's just taking too long. i.e. Retryable.
@@ -59,6 +84,7 @@ class StreamClientBase(ClientBase, ABC):
                 ConnectionAbortedError, # retryable forms of ConnectionError
                 BrokenPipeError         # ConnectionRefusedError is NOT retryable.
             ):
+                self.__server_encodings = None # The server could have been restarted with different settings.
                 retry_count += 1
                 if retry_count >= self.max_retries:
                     raise CommunicationsMaxRetriesReached()
@@ -0,0 +1,10 @@
+from .codec_base import CodecBase
+from .json_codecs import JsonCodec, OrjsonCodec
+from .binary_codecs import MsgpackCodec, CborCodec
+from .registry import (
+    JSON_CODEC,
+    register_codec,
+    find_codec,
+    get_codec,
+    available_encodings,
+)
@@ -0,0 +1,83 @@
+from typing import Any, Type
+from pydantic import BaseModel as PydanticBaseModel, TypeAdapter
+
+from .codec_base import CodecBase, ModelType
+
+from ..framing import PayloadEncoding
+from ..exceptions import CodecException
+
+try:
+    import msgpack
+except ImportError: # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError: # pragma: no cover
+    cbor2 = None
+
+# --------------------------------------------------------------------------------
+# Binary codecs work on the JSON compatible form of a DTO. So the data an
+# endpoint receives looks exactly the same, no matter which codec was used.
+# --------------------------------------------------------------------------------
+class _DictCodecBase(CodecBase):
+    # --------------------------------------------------------------------------------
+    def _dumps(self, value: Any) -> bytes: # pragma: no cover
+        raise NotImplementedError
+
+    # --------------------------------------------------------------------------------
+    def _loads(self, data: bytes) -> Any: # pragma: no cover
+        raise NotImplementedError
+
+    # --------------------------------------------------------------------------------
+    def encode(self, model: PydanticBaseModel) -> bytes:
+        return self._dumps(model.model_dump(mode="json"))
+
+    # --------------------------------------------------------------------------------
+    def decode(self, data: bytes, model_type: Type[ModelType]) -> ModelType:
+        return model_type.model_validate(self.__checked_loads(data))
+
+    # --------------------------------------------------------------------------------
+    def decode_adapted(self, data: bytes, adapter: TypeAdapter) -> Any:
+        return adapter.validate_python(self.__checked_loads(data))
+
+    # --------------------------------------------------------------------------------
+    def __checked_loads(self, data: bytes) -> Any:
+        try:
+            return self._loads(data)
+        except Exception as e: # Each library has its own set of exceptions for broken input.
+            raise CodecException(f"{self.name}: {type(e).__name__}: {str(e)}")
+
+# --------------------------------------------------------------------------------
+class MsgpackCodec(_DictCodecBase):
+    encoding: PayloadEncoding = PayloadEncoding.MSGPACK
+    name    : str             = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise CodecException("The msgpack package is not installed.")
+
+    # --------------------------------------------------------------------------------
+    def _dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value)
+
+    # --------------------------------------------------------------------------------
+    def _loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data)
+
+# --------------------------------------------------------------------------------
+class CborCodec(_DictCodecBase):
+    encoding: PayloadEncoding = PayloadEncoding.CBOR
+    name    : str             = "cbor"
+
+    def __init__(self):
+        if cbor2 is None:
+            raise CodecException("The cbor2 package is not installed.")
+
+    # --------------------------------------------------------------------------------
+    def _dumps(self, value: Any) -> bytes:
+        return cbor2.dumps(value)
+
+    # --------------------------------------------------------------------------------
+    def _loads(self, data: bytes) -> Any:
+        return cbor2.loads(data)
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Any, Type, TypeVar
+from pydantic import BaseModel as PydanticBaseModel, TypeAdapter
+
+from ..framing import PayloadEncoding
+
+ModelType = TypeVar("ModelType", bound=PydanticBaseModel)
+
+# --------------------------------------------------------------------------------
+# A codec turns a protocol DTO (RequestDTO/ResponseDTO) into payload bytes and back.
+# Decoding goes straight from bytes to the DTO, so there is exactly one parse and
+# one validation pass per message.
+#
+# Implementations must raise CodecException when the payload can't be parsed at
+# all, and let pydantic's ValidationError through when it parses, but does not
+# fit the DTO. The server relies on this to pick the right Status to respond with.
+# --------------------------------------------------------------------------------
+class CodecBase(ABC):
+    encoding: PayloadEncoding = None
+    name    : str             = None
+
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def encode(self, model: PydanticBaseModel) -> bytes: # pragma: no cover
+        pass
+
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def decode(self, data: bytes, model_type: Type[ModelType]) -> ModelType: # pragma: no cover
+        pass
+
+    # Same as decode, for types that are not models. e.g. A union of request envelopes.
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def decode_adapted(self, data: bytes, adapter: TypeAdapter) -> Any: # pragma: no cover
+        pass
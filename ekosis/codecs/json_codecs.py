@@ -0,0 +1,75 @@
+from typing import Any, Callable, Type
+from pydantic import BaseModel as PydanticBaseModel, TypeAdapter, ValidationError
+
+from .codec_base import CodecBase, ModelType
+
+from ..framing import PayloadEncoding
+from ..exceptions import CodecException
+
+try:
+    import orjson
+except ImportError: # pragma: no cover
+    orjson = None
+
+# --------------------------------------------------------------------------------
+# The default. Pydantic parses and validates JSON in a single pass, and this is
+# what is used for newline delimited messages.
+# --------------------------------------------------------------------------------
+class JsonCodec(CodecBase):
+    encoding: PayloadEncoding = PayloadEncoding.JSON
+    name    : str             = "json"
+
+    # Straight to bytes. model_dump_json would make a str first, only for us to encode it again.
+    # --------------------------------------------------------------------------------
+    def encode(self, model: PydanticBaseModel) -> bytes:
+        return model.__pydantic_serializer__.to_json(model)
+
+    # --------------------------------------------------------------------------------
+    def decode(self, data: bytes, model_type: Type[ModelType]) -> ModelType:
+        return self.__validate_json(model_type.model_validate_json, data)
+
+    # --------------------------------------------------------------------------------
+    def decode_adapted(self, data: bytes, adapter: TypeAdapter) -> Any:
+        return self.__validate_json(adapter.validate_json, data)
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __validate_json(validate: Callable[[bytes], Any], data: bytes) -> Any:
+        try:
+            return validate(data)
+        except ValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                raise CodecException(str(e))
+            raise
+
+# --------------------------------------------------------------------------------
+# Produces the same bytes on the wire as JsonCodec, so it uses the same encoding
+# id. Only available when orjson is installed. Register it to replace JsonCodec
+# on machines where it benchmarks faster.
+# --------------------------------------------------------------------------------
+class OrjsonCodec(JsonCodec):
+    name: str = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise CodecException("The orjson package is not installed.")
+
+    # --------------------------------------------------------------------------------
+    def encode(self, model: PydanticBaseModel) -> bytes:
+        return orjson.dumps(model.model_dump(mode="json"))
+
+    # --------------------------------------------------------------------------------
+    def decode(self, data: bytes, model_type: Type[ModelType]) -> ModelType:
+        return model_type.model_validate(self.__loads(data))
+
+    # --------------------------------------------------------------------------------
+    def decode_adapted(self, data: bytes, adapter: TypeAdapter) -> Any:
+        return adapter.validate_python(self.__loads(data))
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __loads(data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise CodecException(str(e))
@@ -0,0 +1,48 @@
+from typing import Dict, Tuple
+
+from .codec_base import CodecBase
+from .json_codecs import JsonCodec
+from .binary_codecs import MsgpackCodec, CborCodec
+
+from ..framing import PayloadEncoding
+from ..exceptions import CodecException
+
+# --------------------------------------------------------------------------------
+# Encoding ids are sent as single bytes, in the server's reply to a binary
+# framing enquiry. That reply is terminated by LF, so 10 can't be used as an id.
+_LF_BYTE: int = 10
+
+JSON_CODEC: CodecBase = JsonCodec()
+
+_codecs: Dict[int, CodecBase] = {JSON_CODEC.encoding.value: JSON_CODEC}
+
+# --------------------------------------------------------------------------------
+def register_codec(codec: CodecBase):
+    encoding_id = codec.encoding.value
+    if not 0 <= encoding_id <= 255 or encoding_id == _LF_BYTE:
+        raise CodecException(f"Invalid encoding id [{encoding_id}] for codec [{codec.name}].")
+    _codecs[encoding_id] = codec
+
+# --------------------------------------------------------------------------------
+def find_codec(encoding_id: int) -> CodecBase | None:
+    return _codecs.get(encoding_id)
+
+# --------------------------------------------------------------------------------
+def get_codec(encoding: PayloadEncoding | int) -> CodecBase:
+    encoding_id = encoding.value if isinstance(encoding, PayloadEncoding) else encoding
+    codec       = _codecs.get(encoding_id)
+    if codec is None:
+        raise CodecException(f"No codec available for encoding [{encoding_id}].")
+    return codec
+
+# --------------------------------------------------------------------------------
+def available_encodings() -> Tuple[int, ...]:
+    return tuple(sorted(_codecs))
+
+# Binary codecs are registered when their library can be imported.
+# --------------------------------------------------------------------------------
+for _codec_type in (MsgpackCodec, CborCodec):
+    try:
+        register_codec(_codec_type())
+    except CodecException:
+        pass
@@ -50,6 +50,15 @@ def get_eco_env(postfix: str, default: Any = None, instance_level_only: bool = F
                 return default # If we still don't have a value, then we return the specified default
     return retval
 
+# --------------------------------------------------------------------------------
+# Used for settings that are switched on or off
+# --------------------------------------------------------------------------------
+def get_eco_env_bool(postfix: str, default: bool = False) -> bool:
+    value = get_eco_env(postfix, None)
+    if value is None:
+        return default
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
 # --------------------------------------------------------------------------------
 # Used for when only an instance level setting would be valid
 # --------------------------------------------------------------------------------
@@ -132,23 +141,97 @@ class ConfigLogging(PydanticBaseModel):
     file_logging: ConfigLoggingFile = ConfigLoggingFile()
     level       : str               = Field(default_factory=get_logging_level)
 
+# Settings shared by the stream servers (TCP and UDS)
+# --------------------------------------------------------------------------------
+def get_stream_max_in_flight():
+    # 1 by default. i.e. One request at a time, per connection.
+    # Anything above 1 turns on pipelining, allowing that many requests per
+    # connection to be processed concurrently.
+    return int(get_eco_env("MAX_IN_FLIGHT", 1))
+
+def get_stream_max_connections():
+    # 0 by default. i.e. No limit on the number of open connections.
+    return int(get_eco_env("MAX_CONNECTIONS", 0))
+
+def get_stream_engine():
+    # "streams" by default. i.e. Connections are handled by asyncio streams, a coroutine per connection.
+    # "protocol" handles them with an asyncio.Protocol instead, that parses messages as bytes arrive.
+    return get_eco_env("STREAM_ENGINE", "streams")
+
+# Settings shared by all servers
+# --------------------------------------------------------------------------------
+def get_binary_framing():
+    # Off by default. i.e. Newline delimited JSON only.
+    # When on, servers also accept length-prefixed binary frames, from clients
+    # that negotiated for it.
+    return get_eco_env_bool("BINARY_FRAMING", False)
+
+def get_max_concurrent():
+    # 0 by default. i.e. No limit on the number of requests a server processes concurrently.
+    # When set, requests over the limit are answered with APPLICATION_BUSY straight away.
+    return int(get_eco_env("MAX_CONCURRENT", 0))
+
+def get_priority_reserve():
+    # 4 by default. Only used when max_concurrent is set.
+    # A server at max_concurrent, still takes on this many more requests, as long as they
+    # are for priority routes. i.e. eco.* endpoints, and endpoints with priority=True.
+    return int(get_eco_env("PRIORITY_RESERVE", 4))
+
+def get_compression_threshold():
+    # 0 by default. i.e. Responses are never compressed.
+    # Anything above 0, compresses binary framed responses of at least that many bytes,
+    # for clients that said they can decompress them.
+    return int(get_eco_env("COMPRESSION_THRESHOLD", 0))
+
 # ConfigTCP
 # --------------------------------------------------------------------------------
 class ConfigTCP(PydanticBaseModel):
-    host: str = "127.0.0.1"
-    port: int = 8888
+    host                 : str  = "127.0.0.1"
+    port                 : int  = 8888
+    max_in_flight        : int  = Field(default_factory=get_stream_max_in_flight)
+    max_concurrent       : int  = Field(default_factory=get_max_concurrent)
+    priority_reserve     : int  = Field(default_factory=get_priority_reserve)
+    max_connections      : int  = Field(default_factory=get_stream_max_connections)
+    binary_framing       : bool = Field(default_factory=get_binary_framing)
+    stream_engine        : str  = Field(default_factory=get_stream_engine)
+    compression_threshold: int  = Field(default_factory=get_compression_threshold)
 
 # ConfigUDP
 # --------------------------------------------------------------------------------
+def get_udp_batch_size():
+    # 0 by default. i.e. One event loop callback per datagram received.
+    # Anything above 0, drains up to that many datagrams from the socket every
+    # time it becomes readable, and sends responses in batches.
+    return int(get_eco_env("UDP_BATCH_SIZE", 0))
+
+def get_udp_fragment_size():
+    # 0 by default. i.e. No fragmentation. Messages have to fit in a single datagram.
+    # Anything above 0, is the largest datagram sent to clients that accept fragments.
+    # Larger responses are split into fragments of that size, and fragmented requests are accepted.
+    return int(get_eco_env("UDP_FRAGMENT_SIZE", 0))
+
 class ConfigUDP(PydanticBaseModel):
-    host: str = "127.0.0.1"
-    port: int = 8889
+    host                 : str  = "127.0.0.1"
+    port                 : int  = 8889
+    max_concurrent       : int  = Field(default_factory=get_max_concurrent)
+    priority_reserve     : int  = Field(default_factory=get_priority_reserve)
+    batch_size           : int  = Field(default_factory=get_udp_batch_size)
+    fragment_size        : int  = Field(default_factory=get_udp_fragment_size)
+    binary_framing       : bool = Field(default_factory=get_binary_framing)
+    compression_threshold: int  = Field(default_factory=get_compression_threshold)
 
 # ConfigUDS
 # --------------------------------------------------------------------------------
 class ConfigUDS(PydanticBaseModel):
-    directory       : str = "/tmp" # because we don't want sock files surviving reboot
-    socket_file_name: str = "DEFAULT"
+    directory            : str  = "/tmp" # because we don't want sock files surviving reboot
+    socket_file_name     : str  = "DEFAULT"
+    max_in_flight        : int  = Field(default_factory=get_stream_max_in_flight)
+    max_concurrent       : int  = Field(default_factory=get_max_concurrent)
+    priority_reserve     : int  = Field(default_factory=get_priority_reserve)
+    max_connections      : int  = Field(default_factory=get_stream_max_connections)
+    binary_framing       : bool = Field(default_factory=get_binary_framing)
+    stream_engine        : str  = Field(default_factory=get_stream_engine)
+    compression_threshold: int  = Field(default_factory=get_compression_threshold)
 
 # ConfigApplicationInstance
 # --------------------------------------------------------------------------------
@@ -203,6 +286,21 @@ def get_app_instance_buffer_directory():
     # written to a place that gets cleaned on reboot.
     return get_eco_env("BUFFER_DIR", None)
 
+def get_app_instance_buffer_synchronous():
+    # 'FULL' by default. Every buffered message is on disk, before it is acknowledged.
+    # 'NORMAL' can lose the last few on a power cut, but not on the process crashing.
+    # 'OFF' leaves it to the operating system. 'EXTRA' is FULL, with more care for the journal.
+    return get_eco_env("BUFFER_SYNCHRONOUS", "FULL").upper()
+
+def get_app_instance_workers():
+    # 1 by default. i.e. Everything runs in a single process.
+    # Anything above 1 forks that many worker processes, that share the listeners.
+    return int(get_eco_env("WORKERS", 1))
+
+def get_app_instance_event_loop():
+    # 'asyncio' by default. Set to 'uvloop' to use uvloop, where it is installed.
+    return get_eco_env("EVENT_LOOP", "asyncio")
+
 def get_app_instance_extra():
     machine_prefix  = f"{env_prefix}_EXTRA_"
     app_prefix      = f"{machine_prefix}{env_app_name}_"
@@ -225,25 +323,29 @@ def get_app_instance_extra():
     return retval
 
 class ConfigApplicationInstance(PydanticBaseModel):
-    application_name : str                    = application_name
-    instance_id      : str                    = application_instance
-    stats_keeper     : ConfigStatisticsKeeper = ConfigStatisticsKeeper()
-    logging          : ConfigLogging          = ConfigLogging()
-    lock_directory   : str                    = Field(default_factory=get_app_instance_lock_dir)
-    tcp              : ConfigTCP              = Field(default_factory=get_app_instance_tcp)
-    udp              : ConfigUDP              = Field(default_factory=get_app_instance_udp)
-    uds              : ConfigUDS              = Field(default_factory=get_app_instance_uds)
-    buffer_directory : str                    = Field(default_factory=get_app_instance_buffer_directory)
-    extra            : Any                    = Field(default_factory=get_app_instance_extra)
+    application_name  : str                    = application_name
+    instance_id       : str                    = application_instance
+    stats_keeper      : ConfigStatisticsKeeper = ConfigStatisticsKeeper()
+    logging           : ConfigLogging          = ConfigLogging()
+    lock_directory    : str                    = Field(default_factory=get_app_instance_lock_dir)
+    tcp               : ConfigTCP              = Field(default_factory=get_app_instance_tcp)
+    udp               : ConfigUDP              = Field(default_factory=get_app_instance_udp)
+    uds               : ConfigUDS              = Field(default_factory=get_app_instance_uds)
+    buffer_directory  : str                    = Field(default_factory=get_app_instance_buffer_directory)
+    buffer_synchronous: str                    = Field(default_factory=get_app_instance_buffer_synchronous)
+    workers           : int                    = Field(default_factory=get_app_instance_workers)
+    event_loop        : str                    = Field(default_factory=get_app_instance_event_loop)
+    extra             : Any                    = Field(default_factory=get_app_instance_extra)
 
 # ConfigApplicationInstanceDefaults
 # --------------------------------------------------------------------------------
 class ConfigApplicationInstanceDefaults(PydanticBaseModel):
-    lock_directory   : str                    = Field(default_factory=get_app_instance_lock_dir)
-    logging          : ConfigLogging          = ConfigLogging()
-    stats_keeper     : ConfigStatisticsKeeper = ConfigStatisticsKeeper()
-    buffer_directory : str                    = Field(default_factory=get_app_instance_buffer_directory)
-    extra            : Any                    = None
+    lock_directory    : str                    = Field(default_factory=get_app_instance_lock_dir)
+    logging           : ConfigLogging          = ConfigLogging()
+    stats_keeper      : ConfigStatisticsKeeper = ConfigStatisticsKeeper()
+    buffer_directory  : str                    = Field(default_factory=get_app_instance_buffer_directory)
+    buffer_synchronous: str                    = Field(default_factory=get_app_instance_buffer_synchronous)
+    extra             : Any                    = None
 
 # ConfigApplication
 # --------------------------------------------------------------------------------
@@ -283,27 +385,33 @@ instance_configuration = application_configuration.instances[application_instanc
 
 # --------------------------------------------------------------------------------
 class AppConfiguration(metaclass=SingletonType):
-    name             = application_name
-    instance         = application_instance
-    tcp              = instance_configuration.tcp
-    udp              = instance_configuration.udp
-    uds              = instance_configuration.uds
-    stats_keeper     = instance_configuration.stats_keeper
-    logging          = instance_configuration.logging
-    lock_directory   = instance_configuration.lock_directory
-    buffer_directory = instance_configuration.buffer_directory
-    extra            = instance_configuration.extra
+    name               = application_name
+    instance           = application_instance
+    tcp                = instance_configuration.tcp
+    udp                = instance_configuration.udp
+    uds                = instance_configuration.uds
+    stats_keeper       = instance_configuration.stats_keeper
+    logging            = instance_configuration.logging
+    lock_directory     = instance_configuration.lock_directory
+    buffer_directory   = instance_configuration.buffer_directory
+    buffer_synchronous = instance_configuration.buffer_synchronous
+    workers            = instance_configuration.workers
+    event_loop         = instance_configuration.event_loop
+    extra              = instance_configuration.extra
 
     def dict(self): # pragma: no cover
         return {
-            "name"            : self.name,
-            "instance"        : self.instance,
-            "tcp"             : None if self.tcp is None else self.tcp.model_dump(),
-            "udp"             : None if self.udp is None else self.udp.model_dump(),
-            "uds"             : None if self.uds is None else self.uds.model_dump(),
-            "stats_keeper"    : self.stats_keeper.model_dump(),
-            "logging"         : self.logging.model_dump(),
-            "lock_directory"  : self.lock_directory,
-            "buffer_directory": self.buffer_directory,
-            "extra"           : self.extra,
+            "name"              : self.name,
+            "instance"          : self.instance,
+            "tcp"               : None if self.tcp is None else self.tcp.model_dump(),
+            "udp"               : None if self.udp is None else self.udp.model_dump(),
+            "uds"               : None if self.uds is None else self.uds.model_dump(),
+            "stats_keeper"      : self.stats_keeper.model_dump(),
+            "logging"           : self.logging.model_dump(),
+            "lock_directory"    : self.lock_directory,
+            "buffer_directory"  : self.buffer_directory,
+            "buffer_synchronous": self.buffer_synchronous,
+            "workers"           : self.workers,
+            "event_loop"        : self.event_loop,
+            "extra"             : self.extra,
         }
@@ -11,6 +11,10 @@ from .log_management import LogLevelRequestDto, LogLevelResponseDto, LogBufferRe
 
 from .error_states import ErrorsResponseDto, ErrorCleanerRequestDto
 
+from .workers import WorkerBufferedSendRequestDto
+
+from .batches import BATCH_ROUTE_KEY, BatchRequestDto, BatchResponseDto
+
 from .span_id import SpanId, span_id_gen
 
 from .otlp_log_record import OtlpLogRecord, severity_for_levelno
@@ -0,0 +1,19 @@
+from typing import Any, List
+from pydantic import BaseModel as PydanticBaseModel
+
+from .json_protocol import RequestDTO, ResponseDTO
+
+# Not a route of its own. Servers unpack requests with this route_key, and route
+# every request in it, as if it had arrived on its own.
+BATCH_ROUTE_KEY: str = "eco.batch"
+
+
+# --------------------------------------------------------------------------------
+class BatchRequestDto(PydanticBaseModel):
+    ordered : bool = False # One after the other, in the order given. Otherwise, all at the same time.
+    requests: List[Any]    # RequestDTOs, validated one at a time, so one bad request does not fail the rest.
+
+
+# --------------------------------------------------------------------------------
+class BatchResponseDto(PydanticBaseModel):
+    responses: List[ResponseDTO] # In the same order as the requests.
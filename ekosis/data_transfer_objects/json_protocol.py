@@ -53,11 +53,14 @@ class SpanKey(PydanticBaseModel):
     def __str__(self) -> str:
         return f"{self.trace_id}:{self.span_id}"
 
+# deadline is how many seconds the sender is still willing to wait for the response,
+# as it sent the request. Relative, so the clocks of the two hosts don't have to agree.
 # --------------------------------------------------------------------------------
 class RequestDTO(PydanticBaseModel):
     route_key: str
     span_key : SpanKey
     data     : Any
+    deadline : float | None = None
 
 # --------------------------------------------------------------------------------
 class ResponseDTO(PydanticBaseModel):
@@ -0,0 +1,11 @@
+from typing import Any
+from pydantic import BaseModel as PydanticBaseModel
+
+from .json_protocol import SpanKey
+
+
+# --------------------------------------------------------------------------------
+class WorkerBufferedSendRequestDto(PydanticBaseModel):
+    route_key: str
+    span_key : SpanKey
+    data     : Any
@@ -3,7 +3,9 @@ from .communication import (
     ClientDisconnectedException,
     CommunicationsNonRetryable,
     CommunicationsMaxRetriesReached,
-    CommunicationsEmptyResponse
+    CommunicationsEmptyResponse,
+    FramingException,
+    CodecException,
 )
 
 from .response import (
@@ -14,6 +16,7 @@ from .response import (
     RouteKeyUnknownException,
     ServerBusyException,
     ProcessingException,
+    DeadlineExceededException,
     UnhandledException,
     UnknownStatusCodeException,
 )
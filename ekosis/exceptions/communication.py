@@ -41,3 +41,15 @@ class CommunicationsMaxRetriesReached(CommunicationExceptionBase):
 class CommunicationsEmptyResponse(CommunicationExceptionBase):
     def __init__(self, message: str = "Empty response received."):
         super().__init__(message)
+
+
+# --------------------------------------------------------------------------------
+class FramingException(CommunicationExceptionBase):
+    def __init__(self, message: str = "Malformed binary frame received."):
+        super().__init__(message)
+
+
+# --------------------------------------------------------------------------------
+class CodecException(CommunicationExceptionBase):
+    def __init__(self, message: str = "Payload could not be encoded or decoded."):
+        super().__init__(message)
@@ -45,6 +45,13 @@ class ProcessingException(ResponseException):
     def __init__(self, message: str):
         super().__init__(message)
 
+# --------------------------------------------------------------------------------
+# DEADLINE_EXCEEDED. Also raised without sending, when the deadline a request
+# inherited has already passed.
+class DeadlineExceededException(ResponseException):
+    def __init__(self, message: str):
+        super().__init__(message)
+
 # --------------------------------------------------------------------------------
 # UNHANDLED
 class UnhandledException(ResponseException):
@@ -0,0 +1,41 @@
+from .binary_frames import (
+    MessageType,
+    PayloadEncoding,
+    FrameHeader,
+    FRAME_HEADER_SIZE,
+    STX_BYTE,
+    BINARY_FRAMING_ENQ,
+    CAPABILITY_BASE,
+    encode_frame_header,
+    encode_frame,
+    decode_frame_header,
+    decode_datagram_frame,
+    is_binary_frame,
+    read_message,
+    encode_binary_framing_ack,
+    decode_binary_framing_ack,
+    decode_binary_framing_capabilities,
+    negotiate_binary_framing,
+)
+from .fragments import (
+    CAPABILITY_FRAGMENTS,
+    FLAG_ACCEPTS_FRAGMENTS,
+    FRAGMENT_OVERHEAD,
+    enlarge_receive_buffer,
+    split_into_fragments,
+    decode_fragment,
+    FragmentReassembler,
+)
+from .compression import (
+    Compression,
+    FLAG_ACCEPTS_ZLIB,
+    FLAG_ACCEPTS_ZSTD,
+    FLAG_ACCEPTS_LZ4,
+    COMPRESSION_MASK,
+    available_compressions,
+    accepted_compression_flags,
+    get_compression,
+    compress_payload,
+    decompress_payload,
+)
+from .stream_parser import StreamMessageParser
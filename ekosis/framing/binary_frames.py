@@ -0,0 +1,152 @@
+import asyncio
+import struct
+
+from enum import Enum
+from typing import NamedTuple, Tuple
+
+from ..exceptions import FramingException
+
+# --------------------------------------------------------------------------------
+# Binary framing, as an opt-in alternative to newline delimited JSON.
+#
+# Every binary frame starts with a fixed size header:
+#
+#   | STX (1 byte) | message type (1 byte) | flags (1 byte) | encoding (1 byte) | payload length (4 bytes) |
+#
+# All multibyte values are big endian (network byte order). The payload follows
+# the header directly, and is exactly "payload length" bytes long. Because the
+# length is known up front, the payload may contain any byte, including LF.
+#
+# Newline delimited messages start with '{' (JSON), ENQ or ACK. So a leading STX
+# is all that is needed, to tell a binary frame apart from everything else on
+# the same connection.
+#
+# Negotiation piggybacks on the ENQ/ACK heartbeat:
+#   - A client that wants binary framing sends ENQ STX LF.
+#   - A server with binary framing turned on, answers ACK STX, followed by one
+#     byte for each payload encoding it can decode, and LF.
+#   - A server without it, only looks at the ENQ and answers the usual ACK LF.
+# So a client only ever sends binary frames to a server that said it can take them,
+# and only in an encoding the server listed.
+# --------------------------------------------------------------------------------
+STX_BYTE: int = 2  # Decimal  2 = Ascii STX (start of text) character
+ENQ_BYTE: int = 5  # Decimal  5 = Ascii ENQ (enquiry) character
+ACK_BYTE: int = 6  # Decimal  6 = Ascii ACK (acknowledge) character
+LF_BYTE : int = 10 # Decimal 10 = Ascii LF (line feed) character = '\n'
+
+BINARY_FRAMING_ENQ: bytes = bytes([ENQ_BYTE, STX_BYTE, LF_BYTE])
+CAPABILITY_BASE   : int   = 0x80 # Values in a binary framing ACK from here up, are capabilities of the server.
+
+MAX_PAYLOAD_SIZE: int = 64 * 1024 * 1024 # Anything larger is considered a broken or hostile frame.
+
+_FRAME_HEADER    : struct.Struct = struct.Struct("!BBBBI")
+FRAME_HEADER_SIZE: int           = _FRAME_HEADER.size
+
+# --------------------------------------------------------------------------------
+class MessageType(Enum):
+    REQUEST  = 1
+    RESPONSE = 2
+    FRAGMENT = 3 # Part of a larger datagram. See fragments.py
+
+# --------------------------------------------------------------------------------
+class PayloadEncoding(Enum):
+    JSON    = 0
+    MSGPACK = 1
+    CBOR    = 2
+
+# --------------------------------------------------------------------------------
+class FrameHeader(NamedTuple):
+    message_type: int
+    flags       : int
+    encoding    : int
+    length      : int
+
+# For writers that can send the header and the payload without joining them first.
+# --------------------------------------------------------------------------------
+def encode_frame_header(
+    message_type  : int,
+    payload_length: int,
+    flags         : int = 0,
+    encoding      : int = PayloadEncoding.JSON.value,
+) -> bytes:
+    return _FRAME_HEADER.pack(STX_BYTE, message_type, flags, encoding, payload_length)
+
+# --------------------------------------------------------------------------------
+def encode_frame(
+    message_type: int,
+    payload     : bytes,
+    flags       : int = 0,
+    encoding    : int = PayloadEncoding.JSON.value,
+) -> bytes:
+    return encode_frame_header(message_type, len(payload), flags, encoding) + payload
+
+# --------------------------------------------------------------------------------
+def decode_frame_header(data: bytes) -> FrameHeader:
+    if len(data) < FRAME_HEADER_SIZE:
+        raise FramingException(f"Frame header too short: {len(data)} bytes.")
+    magic, message_type, flags, encoding, length = _FRAME_HEADER.unpack_from(data)
+    if magic != STX_BYTE:
+        raise FramingException("Frame does not start with STX.")
+    if length > MAX_PAYLOAD_SIZE:
+        raise FramingException(f"Frame payload length [{length}] exceeds maximum of [{MAX_PAYLOAD_SIZE}].")
+    return FrameHeader(message_type, flags, encoding, length)
+
+# --------------------------------------------------------------------------------
+def is_binary_frame(data: bytes) -> bool:
+    return bool(data) and data[0] == STX_BYTE
+
+# Datagrams are self delimiting, so the whole frame arrives in one piece.
+# --------------------------------------------------------------------------------
+def decode_datagram_frame(data: bytes) -> Tuple[FrameHeader, bytes]:
+    header = decode_frame_header(data)
+    end    = FRAME_HEADER_SIZE + header.length
+    if len(data) < end:
+        raise FramingException(f"Datagram frame truncated: expected {header.length} payload bytes.")
+    return header, data[FRAME_HEADER_SIZE:end]
+
+# Reads one message off a stream, where binary frames and newline delimited
+# messages may be mixed. Returns the payload and the frame header, or, for a
+# newline delimited message, the whole line (LF included) and None.
+# An empty return means the other side closed the connection.
+# --------------------------------------------------------------------------------
+async def read_message(reader: asyncio.StreamReader) -> Tuple[bytes, FrameHeader | None]:
+    try:
+        first_byte = await reader.readexactly(1)
+        if first_byte[0] != STX_BYTE:
+            return first_byte + await reader.readline(), None
+        header = decode_frame_header(first_byte + await reader.readexactly(FRAME_HEADER_SIZE - 1))
+        return await reader.readexactly(header.length), header
+    except asyncio.IncompleteReadError:
+        return b'', None
+
+# --------------------------------------------------------------------------------
+def encode_binary_framing_ack(encodings: Tuple[int, ...]) -> bytes:
+    return bytes([ACK_BYTE, STX_BYTE, *encodings, LF_BYTE])
+
+# --------------------------------------------------------------------------------
+def _is_binary_framing_ack(data: bytes) -> bool:
+    return len(data) >= 3 and data[0] == ACK_BYTE and data[1] == STX_BYTE and data[-1] == LF_BYTE
+
+# Returns the encodings the server listed. Empty, if it did not agree to binary framing.
+# Bytes from CAPABILITY_BASE up, are capabilities. Not encodings.
+# --------------------------------------------------------------------------------
+def decode_binary_framing_ack(data: bytes) -> Tuple[int, ...]:
+    if not _is_binary_framing_ack(data):
+        return ()
+    return tuple(value for value in data[2:-1] if value < CAPABILITY_BASE) or (PayloadEncoding.JSON.value,)
+
+# --------------------------------------------------------------------------------
+def decode_binary_framing_capabilities(data: bytes) -> Tuple[int, ...]:
+    if not _is_binary_framing_ack(data):
+        return ()
+    return tuple(value for value in data[2:-1] if value >= CAPABILITY_BASE)
+
+# --------------------------------------------------------------------------------
+async def negotiate_binary_framing(
+    reader : asyncio.StreamReader,
+    writer : asyncio.StreamWriter,
+    timeout: float
+) -> Tuple[int, ...]:
+    writer.write(BINARY_FRAMING_ENQ)
+    response = await asyncio.wait_for(reader.readline(), timeout)
+    return decode_binary_framing_ack(response)
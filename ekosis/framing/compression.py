@@ -0,0 +1,132 @@
+import zlib
+
+from enum import Enum
+from typing import Callable, Dict, Tuple
+
+from .binary_frames import MAX_PAYLOAD_SIZE
+from ..exceptions import FramingException
+
+try:
+    import zstandard
+except ImportError: # pragma: no cover
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError: # pragma: no cover
+    lz4_frame = None
+
+# --------------------------------------------------------------------------------
+# Compression of frame payloads. Only ever used between peers that agreed to it:
+#   - A client that can decompress responses, sets one FLAG_ACCEPTS_... flag in the
+#     flags of its request frames, for every algorithm it has.
+#   - A server with compression turned on, compresses responses larger than its
+#     threshold, with the first of PREFERRED_COMPRESSION both sides have. It says so
+#     in the COMPRESSION_MASK bits of the response frame's flags.
+# Older clients never set the flags. So they never get a compressed response.
+#
+# zlib is always available. zstd and lz4 when the zstandard and lz4 packages are
+# installed (pip install ekosis[compression]).
+# --------------------------------------------------------------------------------
+class Compression(Enum):
+    NONE = 0
+    ZLIB = 1
+    ZSTD = 2
+    LZ4  = 3
+
+FLAG_ACCEPTS_ZLIB: int = 0x02
+FLAG_ACCEPTS_ZSTD: int = 0x04
+FLAG_ACCEPTS_LZ4 : int = 0x08
+COMPRESSION_MASK : int = 0x30 # How the payload of this frame is compressed, as a Compression value.
+COMPRESSION_SHIFT: int = 4
+
+ZLIB_LEVEL: int = 1 # The fastest. JSON compresses well enough, even at this level.
+ZSTD_LEVEL: int = 3
+
+PREFERRED_COMPRESSION: Tuple[Compression, ...] = (Compression.ZSTD, Compression.LZ4, Compression.ZLIB)
+
+_ACCEPTS_FLAGS: Dict[Compression, int] = {
+    Compression.ZLIB: FLAG_ACCEPTS_ZLIB,
+    Compression.ZSTD: FLAG_ACCEPTS_ZSTD,
+    Compression.LZ4 : FLAG_ACCEPTS_LZ4,
+}
+
+# --------------------------------------------------------------------------------
+def _zlib_decompress(payload: bytes) -> bytes:
+    decompressor = zlib.decompressobj()
+    data         = decompressor.decompress(payload, MAX_PAYLOAD_SIZE)
+    if decompressor.unconsumed_tail:
+        raise FramingException(f"Decompressed payload exceeds maximum of [{MAX_PAYLOAD_SIZE}] bytes.")
+    return data
+
+# max_output_size only counts when the frame does not say how big its content is. So that is looked at first.
+# --------------------------------------------------------------------------------
+def _zstd_decompress(payload: bytes) -> bytes:
+    if zstandard.frame_content_size(payload) > MAX_PAYLOAD_SIZE:
+        raise FramingException(f"Decompressed payload exceeds maximum of [{MAX_PAYLOAD_SIZE}] bytes.")
+    return zstandard.decompress(payload, max_output_size=MAX_PAYLOAD_SIZE)
+
+# Stops at MAX_PAYLOAD_SIZE. Whatever the frame still has, is left in the decompressor.
+# --------------------------------------------------------------------------------
+def _lz4_decompress(payload: bytes) -> bytes:
+    decompressor = lz4_frame.LZ4FrameDecompressor()
+    data         = decompressor.decompress(payload, max_length=MAX_PAYLOAD_SIZE)
+    if not decompressor.eof and not decompressor.needs_input:
+        raise FramingException(f"Decompressed payload exceeds maximum of [{MAX_PAYLOAD_SIZE}] bytes.")
+    return data
+
+# --------------------------------------------------------------------------------
+_compressors  : Dict[Compression, Callable[[bytes], bytes]] = {Compression.ZLIB: lambda payload: zlib.compress(payload, ZLIB_LEVEL)}
+_decompressors: Dict[Compression, Callable[[bytes], bytes]] = {Compression.ZLIB: _zlib_decompress}
+
+if zstandard is not None:
+    _compressors  [Compression.ZSTD] = lambda payload: zstandard.compress(payload, ZSTD_LEVEL)
+    _decompressors[Compression.ZSTD] = _zstd_decompress
+
+if lz4_frame is not None:
+    _compressors  [Compression.LZ4] = lz4_frame.compress
+    _decompressors[Compression.LZ4] = _lz4_decompress
+
+# --------------------------------------------------------------------------------
+def available_compressions() -> Tuple[Compression, ...]:
+    return tuple(compression for compression in PREFERRED_COMPRESSION if compression in _compressors)
+
+# The flags a request frame carries, to say its sender can decompress responses.
+# --------------------------------------------------------------------------------
+def accepted_compression_flags() -> int:
+    flags = 0
+    for compression in available_compressions():
+        flags |= _ACCEPTS_FLAGS[compression]
+    return flags
+
+# --------------------------------------------------------------------------------
+def get_compression(flags: int) -> Compression:
+    return Compression((flags & COMPRESSION_MASK) >> COMPRESSION_SHIFT)
+
+# Returns the flags to add to the frame, and the payload to send. When the peer accepts
+# none of what we have, or compressing does not make it smaller, the payload is sent as is.
+# --------------------------------------------------------------------------------
+def compress_payload(payload: bytes, accepted_flags: int) -> Tuple[int, bytes]:
+    for compression in available_compressions():
+        if accepted_flags & _ACCEPTS_FLAGS[compression]:
+            compressed = _compressors[compression](payload)
+            if len(compressed) >= len(payload):
+                break
+            return compression.value << COMPRESSION_SHIFT, compressed
+    return 0, payload
+
+# Raises FramingException when the payload can't be decompressed.
+# --------------------------------------------------------------------------------
+def decompress_payload(payload: bytes, flags: int) -> bytes:
+    compression = get_compression(flags)
+    if compression == Compression.NONE:
+        return payload
+    decompress = _decompressors.get(compression)
+    if decompress is None:
+        raise FramingException(f"Compression [{compression.name}] is not available.")
+    try:
+        return decompress(payload)
+    except FramingException:
+        raise
+    except Exception as e: # Each library has its own set of exceptions for broken input.
+        raise FramingException(f"Could not decompress [{compression.name}] payload: {type(e).__name__}: {str(e)}")
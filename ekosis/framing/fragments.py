@@ -0,0 +1,161 @@
+import time
+import socket
+import struct
+import logging
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+from .binary_frames import MessageType, FRAME_HEADER_SIZE, CAPABILITY_BASE, encode_frame
+from ..exceptions import FramingException
+
+# --------------------------------------------------------------------------------
+# Fragmentation, for datagrams too large to send in one piece.
+#
+# A message (the complete datagram as it would otherwise have been sent) is split
+# into binary frames of message type FRAGMENT. The payload of every fragment starts
+# with a fragment header:
+#
+#   | message id (4 bytes) | fragment index (2 bytes) | fragment count (2 bytes) |
+#
+# followed by that fragment's part of the message. The receiver puts the message
+# back together, and handles it as if it had arrived in one piece.
+#
+# Only peers that agreed to it, get fragments:
+#   - A server that accepts fragments, lists CAPABILITY_FRAGMENTS in its binary
+#     framing ACK. Capabilities are 0x80 and up, so they never clash with an
+#     encoding, and clients that don't know about them, simply ignore them.
+#   - A client that accepts fragmented responses, sets FLAG_ACCEPTS_FRAGMENTS in
+#     the flags of its request frames.
+# --------------------------------------------------------------------------------
+CAPABILITY_FRAGMENTS  : int = CAPABILITY_BASE
+FLAG_ACCEPTS_FRAGMENTS: int = 0x01
+
+MAX_FRAGMENTS    : int = 65535
+MIN_FRAGMENT_SIZE: int = 64
+
+# Fragments arrive in bursts. The default socket receive buffer only holds a few dozen of them.
+FRAGMENT_RECEIVE_BUFFER_SIZE: int = 4 * 1024 * 1024
+
+_FRAGMENT_HEADER : struct.Struct = struct.Struct("!IHH")
+FRAGMENT_OVERHEAD: int           = FRAME_HEADER_SIZE + _FRAGMENT_HEADER.size
+
+log = logging.getLogger()
+
+# The operating system may cap this, e.g. at net.core.rmem_max on Linux. We get what we can.
+# --------------------------------------------------------------------------------
+def enlarge_receive_buffer(sock: socket.socket, size: int = FRAGMENT_RECEIVE_BUFFER_SIZE):
+    try:
+        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) < size:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    except OSError as e: # pragma: no cover
+        log.warning(f"Could not enlarge the UDP receive buffer: {e}")
+
+# fragment_size is the size of a whole fragment datagram, headers included.
+# --------------------------------------------------------------------------------
+def split_into_fragments(message: bytes, message_id: int, fragment_size: int) -> List[bytes]:
+    chunk_size = max(MIN_FRAGMENT_SIZE, fragment_size) - FRAGMENT_OVERHEAD
+    count      = max(1, -(-len(message) // chunk_size))
+    if count > MAX_FRAGMENTS:
+        raise FramingException(f"Message of [{len(message)}] bytes needs more than [{MAX_FRAGMENTS}] fragments.")
+    view = memoryview(message)
+    return [
+        encode_frame(
+            MessageType.FRAGMENT.value,
+            _FRAGMENT_HEADER.pack(message_id, index, count) + view[index * chunk_size:(index + 1) * chunk_size]
+        )
+        for index in range(count)
+    ]
+
+# --------------------------------------------------------------------------------
+def decode_fragment(payload: bytes) -> Tuple[int, int, int, bytes]:
+    if len(payload) < _FRAGMENT_HEADER.size:
+        raise FramingException(f"Fragment too short: {len(payload)} bytes.")
+    message_id, index, count = _FRAGMENT_HEADER.unpack_from(payload)
+    if count == 0 or index >= count:
+        raise FramingException(f"Fragment [{index}] of [{count}] is not possible.")
+    return message_id, index, count, payload[_FRAGMENT_HEADER.size:]
+
+# --------------------------------------------------------------------------------
+class _PartialMessage:
+    def __init__(self, count: int):
+        self.count  : int              = count
+        self.chunks : Dict[int, bytes] = {}
+        self.size   : int              = 0
+        self.started: float            = time.monotonic()
+
+# --------------------------------------------------------------------------------
+# Puts fragmented messages back together.
+#
+# What it holds on to is bounded, both in time and in bytes. Messages not complete
+# within timeout seconds, are dropped. So are the oldest incomplete messages, when
+# a new fragment would take it over max_bytes. Every message dropped, is reported
+# to on_drop. Fragments can arrive in any order, and duplicates are ignored.
+# --------------------------------------------------------------------------------
+class FragmentReassembler:
+    def __init__(
+        self,
+        timeout  : float                        = 5,
+        max_bytes: int                          = 16 * 1024 * 1024,
+        on_drop  : Callable[[int], None] | None = None,
+    ):
+        self.__timeout  : float                                         = timeout
+        self.__max_bytes: int                                           = max_bytes
+        self.__on_drop  : Callable[[int], None] | None                  = on_drop
+        self.__pending  : OrderedDict[Tuple[Any, int], _PartialMessage] = OrderedDict()
+        self.__size     : int                                           = 0
+
+    # --------------------------------------------------------------------------------
+    def __drop(self, key: Tuple[Any, int]):
+        self.__size -= self.__pending.pop(key).size
+        if self.__on_drop is not None:
+            self.__on_drop(1)
+
+    # --------------------------------------------------------------------------------
+    def __drop_expired(self):
+        expired_before = time.monotonic() - self.__timeout
+        while self.__pending:
+            key, partial = next(iter(self.__pending.items()))
+            if partial.started > expired_before:
+                break
+            self.__drop(key)
+
+    # --------------------------------------------------------------------------------
+    def pending_count(self) -> int:
+        return len(self.__pending)
+
+    # sender identifies where the fragment came from, e.g. its address. Message ids
+    # are only unique per sender. Returns the whole message, once the last fragment is in.
+    # --------------------------------------------------------------------------------
+    def add(self, sender: Any, payload: bytes) -> bytes | None:
+        message_id, index, count, chunk = decode_fragment(payload)
+        self.__drop_expired()
+        if count == 1:
+            return chunk
+
+        key     = (sender, message_id)
+        partial = self.__pending.get(key)
+        if partial is not None and partial.count != count: # A new message, reusing the id of one we never completed.
+            self.__drop(key)
+            partial = None
+        if partial is None:
+            partial             = _PartialMessage(count)
+            self.__pending[key] = partial
+        if index in partial.chunks:
+            return None
+
+        while self.__size + len(chunk) > self.__max_bytes and self.__pending:
+            oldest = next(iter(self.__pending))
+            self.__drop(oldest)
+            if oldest == key:
+                return None
+
+        partial.chunks[index] = chunk
+        partial.size         += len(chunk)
+        self.__size          += len(chunk)
+        if len(partial.chunks) < count:
+            return None
+
+        self.__size -= partial.size
+        del self.__pending[key]
+        return b''.join(partial.chunks[index] for index in range(count))
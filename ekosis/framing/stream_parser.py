@@ -0,0 +1,65 @@
+from typing import List, Tuple
+
+from .binary_frames import FrameHeader, FRAME_HEADER_SIZE, MAX_PAYLOAD_SIZE, STX_BYTE, LF_BYTE, decode_frame_header
+from ..exceptions import FramingException
+
+# --------------------------------------------------------------------------------
+# Splits the bytes received on a stream into messages, as they come in, however
+# they happen to be cut up. The same messages read_message would return:
+#   - A newline delimited message, as the whole line (LF included), and None.
+#   - A binary frame, as its payload, and its header. Only with binary_framing on.
+#
+# What has not made up a whole message yet, is kept for the next feed.
+# --------------------------------------------------------------------------------
+class StreamMessageParser:
+    def __init__(self, binary_framing: bool = False):
+        self.__binary_framing: bool               = binary_framing
+        self.__buffer        : bytearray          = bytearray()
+        self.__header        : FrameHeader | None = None # Of a frame still waiting for its payload.
+        self.__scanned       : int                = 0    # How much of an incomplete line was already searched for LF.
+
+    # --------------------------------------------------------------------------------
+    def buffered_size(self) -> int:
+        return len(self.__buffer)
+
+    # --------------------------------------------------------------------------------
+    def __next_frame(self, start: int) -> Tuple[Tuple[bytes, FrameHeader] | None, int]:
+        buffer = self.__buffer
+        if self.__header is None:
+            if len(buffer) - start < FRAME_HEADER_SIZE:
+                return None, start
+            self.__header = decode_frame_header(bytes(buffer[start:start + FRAME_HEADER_SIZE]))
+            start        += FRAME_HEADER_SIZE
+        end = start + self.__header.length
+        if len(buffer) < end:
+            return None, start
+        message, self.__header = (bytes(buffer[start:end]), self.__header), None
+        return message, end
+
+    # --------------------------------------------------------------------------------
+    def __next_line(self, start: int) -> Tuple[Tuple[bytes, None] | None, int]:
+        end = self.__buffer.find(LF_BYTE, start + self.__scanned)
+        if end < 0:
+            self.__scanned = len(self.__buffer) - start
+            if self.__scanned > MAX_PAYLOAD_SIZE:
+                raise FramingException(f"Line exceeds maximum of [{MAX_PAYLOAD_SIZE}] bytes.")
+            return None, start
+        self.__scanned = 0
+        return (bytes(self.__buffer[start:end + 1]), None), end + 1
+
+    # Raises FramingException when what was received, can't be a message.
+    # --------------------------------------------------------------------------------
+    def feed(self, data: bytes) -> List[Tuple[bytes, FrameHeader | None]]:
+        self.__buffer += data
+        messages = []
+        start    = 0
+        while start < len(self.__buffer):
+            if self.__header is not None or (self.__binary_framing and self.__buffer[start] == STX_BYTE):
+                message, start = self.__next_frame(start)
+            else:
+                message, start = self.__next_line(start)
+            if message is None:
+                break
+            messages.append(message)
+        del self.__buffer[:start]
+        return messages
@@ -91,6 +91,20 @@ class EcoLogger(metaclass=SingletonType):
         # This switches asyncio logging to level WARNING
         # logging.getLogger('asyncio').setLevel(logging.WARNING)
 
+    # Rotating one log file from several processes loses log lines.
+    # So in worker mode, each worker logs to a file of its own.
+    # --------------------------------------------------------------------------------
+    def setup_worker(self, index: int):
+        if not self.__file_handler:
+            return
+        self.__logger.removeHandler(self.__file_handler)
+        self.__file_handler.flush()
+        self.__file_handler.close()
+        log_file_config                = self.__log_config.file_logging
+        log_file_config.base_file_name = f"{self.__app_config.name}-{self.__app_config.instance}.w{index}"
+        log_file_config.base_file_path = f"{log_file_config.directory}/{log_file_config.base_file_name}.log"
+        self.__setup_file_logging()
+
     # --------------------------------------------------------------------------------
     def flush(self):
         if not self.__log_config.file_only: # pragma: no cover
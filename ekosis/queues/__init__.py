@@ -1 +1,6 @@
 from .paginated_queue import PaginatedQueue
+from .queue_storage import QueueStorageBase, PageEntry, QUEUE_STORAGE_SQLITE, QUEUE_STORAGE_SEGMENTED_LOG
+from .queue_storage import SYNCHRONOUS_OFF, SYNCHRONOUS_NORMAL, SYNCHRONOUS_FULL, SYNCHRONOUS_EXTRA
+from .sqlite_storage import SqliteQueueStorage
+from .segmented_log_storage import SegmentedLogStorage
+from .push_journal import PushJournal, DURABILITY_PAGE, DURABILITY_JOURNAL
@@ -1,30 +1,27 @@
+import asyncio
 import json
-import sqlalchemy
+import os
 
-from typing import cast, Dict, List, Type, TypeVar, Generic
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Set, Type, TypeVar, Generic
 
 from pydantic import BaseModel as PydanticBaseModel
 
-from sqlalchemy import create_engine, Column, BigInteger, BINARY, String, func, Table, MetaData, asc, desc, exists
-from sqlalchemy.exc import NoResultFound
-from sqlalchemy.orm import sessionmaker
+from .queue_storage import QueueStorageBase, PageEntry, QUEUE_STORAGE_SQLITE, QUEUE_STORAGE_SEGMENTED_LOG, SYNCHRONOUS_FULL
+from .sqlite_storage import SqliteQueueStorage
+from .segmented_log_storage import SegmentedLogStorage
+from .push_journal import PushJournal, DURABILITY_PAGE, DURABILITY_JOURNAL, JOURNAL_SUFFIX
 from ..data_transfer_objects import SpanKey
 
-OrmBaseClass = sqlalchemy.orm.declarative_base()
-
 _QueuedType = TypeVar('_QueuedType', bound=PydanticBaseModel)
 
 # --------------------------------------------------------------------------------
-class QueueRecord(OrmBaseClass):
-    __tablename__  = 'queued_objects'
-    record_id      = Column(BigInteger, primary_key=True)
-    span_key       = Column(BINARY(24), unique=True, nullable=False)
-    object_string  = Column(String)
-
-# --------------------------------------------------------------------------------
-class PageEntry(PydanticBaseModel):
-    span_key     : SpanKey
-    object_string: str
+def make_queue_storage(storage: str, file_path: str, synchronous: str = SYNCHRONOUS_FULL) -> QueueStorageBase:
+    if storage == QUEUE_STORAGE_SQLITE:
+        return SqliteQueueStorage(file_path, synchronous)
+    if storage == QUEUE_STORAGE_SEGMENTED_LOG:
+        return SegmentedLogStorage(file_path, synchronous=synchronous)
+    raise ValueError(f"Unknown queue storage [{storage}]. Use [{QUEUE_STORAGE_SQLITE}] or [{QUEUE_STORAGE_SEGMENTED_LOG}].")
 
 # --------------------------------------------------------------------------------
 class QueuePage:
@@ -113,166 +110,263 @@ class QueuePage:
                     retval.append(str(self.__page_data_list[x].span_key))
         return retval
 
+# --------------------------------------------------------------------------------
+# Work handed to the storage thread, and what is done with its result on the event
+# loop. The thread carries on when whoever waits for it is cancelled. So the two are
+# done together, once: By that waiting, or by shut_down, whichever gets there first.
+# --------------------------------------------------------------------------------
+class _StorageWork:
+    def __init__(self, future: Future, apply: Callable[[Any], Any] | None):
+        self.future  : Future                      = future
+        self.__apply : Callable[[Any], Any] | None = apply
+        self.__done  : bool                        = False
+        self.__result: Any                         = None
+
+    # Blocks until the storage thread is done, when it is not yet.
+    # --------------------------------------------------------------------------------
+    def finish(self) -> Any:
+        if not self.__done:
+            result        = self.future.result()
+            self.__result = result if self.__apply is None else self.__apply(result)
+            self.__done   = True
+        return self.__result
+
+# --------------------------------------------------------------------------------
+# Entries are pushed onto the back page, and popped from the front page. Both are
+# kept in memory. Whatever is in between, is kept in storage: An Sqlite database
+# file by default, or a segmented log directory. file_path is the one or the other.
+#
+# Storage is used from a thread of its own, one per queue. That is where it is
+# opened, and where pages are written and loaded. So the event loop carries on
+# serving requests while that happens. One thread does them one after the other, in
+# the order they were asked for. Operations that use storage, hold a lock while they
+# do. So the pages only change while nothing else is using them. Storage work, and
+# the changes to the pages that go with it, are done as one. A caller cancelled in
+# the middle, only gets its CancelledError once both are done.
+#
+# How many entries are in storage, is kept here as well. It only changes once a
+# page write or load is done, together with the pages. So size() is always right.
+#
+# With durability at DURABILITY_JOURNAL, what is only in the pages, is also kept in
+# a journal next to storage. A push returns once its entry is in there. Should the
+# application crash, those entries are back in the queue when it is next opened.
+# After storage, so not always in the order they were in.
 # --------------------------------------------------------------------------------
 class PaginatedQueue(Generic[_QueuedType]):
     def __init__(
         self,
-        file_path  : str,
-        queued_type: Type[_QueuedType],
-        page_size  : int = 100,
+        file_path       : str,
+        queued_type     : Type[_QueuedType],
+        page_size       : int   = 100,
+        storage         : str   = QUEUE_STORAGE_SQLITE,
+        synchronous     : str   = SYNCHRONOUS_FULL,
+        durability      : str   = DURABILITY_PAGE,
+        commit_max_items: int   = 100,
+        commit_max_delay: float = 0.002,
     ):
-        self.file_path        : str               = file_path
-        self.connection_string: str               = f"sqlite:///{file_path}"
-        self.database_engine  : sqlalchemy.Engine = create_engine(self.connection_string)
-        self.queued_type      : Type[_QueuedType] = queued_type
-        self.page_size        : int               = page_size
-        self.front_page       : QueuePage         = QueuePage(queued_type)
-        self.back_page        : QueuePage         = self.front_page
-
-        OrmBaseClass.metadata.create_all(self.database_engine)
+        if durability not in (DURABILITY_PAGE, DURABILITY_JOURNAL):
+            raise ValueError(f"Unknown durability [{durability}]. Use [{DURABILITY_PAGE}] or [{DURABILITY_JOURNAL}].")
+        self.file_path   : str                 = file_path
+        self.queued_type : Type[_QueuedType]   = queued_type
+        self.page_size   : int                 = page_size
+        self.front_page  : QueuePage           = QueuePage(queued_type)
+        self.back_page   : QueuePage           = self.front_page
+        self.__lock      : asyncio.Lock        = asyncio.Lock()
+        self.__executor  : ThreadPoolExecutor  = ThreadPoolExecutor(
+            max_workers        = 1,
+            thread_name_prefix = f"queue-{os.path.basename(file_path)}"
+        )
+        self.storage     : QueueStorageBase    = self.__executor.submit(make_queue_storage, storage, file_path, synchronous).result()
+        self.stored_size : int                 = self.__executor.submit(self.storage.size).result()
+        self.__journal   : PushJournal | None  = None
+        self.__journaling: Set[SpanKey]        = set() # Pushes waiting on the journal, that are not in a page yet.
+        self.__in_flight : _StorageWork | None = None
+
+        if durability == DURABILITY_JOURNAL:
+            self.__journal = PushJournal(f"{file_path}{JOURNAL_SUFFIX}", commit_max_items, commit_max_delay)
+            recovered      = self.__journal.recover()
+            self.__do_initial_load(self.__journal.write_in_now)
+            self.__do_journal_recovery(recovered)
+        else:
+            self.__do_initial_load()
 
-        self.session = sessionmaker(bind=self.database_engine, autoflush=False)()
-        self.__do_initial_load()
+    # apply gets the result of function, on the event loop. What it returns, is returned.
+    # The lock is held all the while, by the caller. Cancelled or not, it only lets go of
+    # it once the work is done. Otherwise, the next one to take it, could find the pages
+    # as they were before the storage thread changed storage.
+    # --------------------------------------------------------------------------------
+    async def __in_storage_thread(self, function: Callable[..., Any], *args, apply: Callable[[Any], Any] | None = None) -> Any:
+        work             = _StorageWork(self.__executor.submit(function, *args), apply)
+        waiting          = asyncio.wrap_future(work.future)
+        cancelled        = None
+        self.__in_flight = work
+        try:
+            while True:
+                try:
+                    await asyncio.shield(waiting)
+                    break
+                except asyncio.CancelledError as e:
+                    if waiting.cancelled():
+                        raise
+                    cancelled = e
+            result = work.finish()
+        finally:
+            self.__in_flight = None
+        if cancelled is not None:
+            raise cancelled
+        return result
+
+    # For where there is no event loop to wait on. Blocks until the storage thread is done.
+    # --------------------------------------------------------------------------------
+    def __wait_for_storage_thread(self, function: Callable[..., Any], *args) -> Any:
+        return self.__executor.submit(function, *args).result()
 
+    # With a journal, before_delete puts the pages in there, before storage lets go of them.
     # --------------------------------------------------------------------------------
-    def __do_initial_load(self):
-        if self.__get_database_size() > 0:
-            self.__load_front_page()
+    def __do_initial_load(self, before_delete: Callable[[List[PageEntry]], None] | None = None):
+        if self.stored_size > 0:
+            self.__add_to_page(self.front_page, self.__wait_for_storage_thread(self.storage.pop_front_page, self.page_size, before_delete))
 
-        if self.__get_database_size() > 0: # If there is still data AFTER loading the front page.
+        if self.stored_size > 0: # If there is still data AFTER loading the front page.
             self.back_page = QueuePage(self.queued_type)
-            self.__load_back_page()
+            self.__add_to_page(self.back_page, self.__wait_for_storage_thread(self.storage.pop_back_page, self.page_size, before_delete))
 
+    # What was only in memory before, is added behind the pages loaded from storage.
+    # Unless it made it to storage after all.
     # --------------------------------------------------------------------------------
-    def __get_max_record_id(self) -> int:
-        if self.__get_database_size() < 1:
-            return 0
-        return int(self.session.query(func.max(QueueRecord.record_id)).scalar())
+    def __do_journal_recovery(self, recovered: List[PageEntry]):
+        for entry in recovered:
+            if self.__has_entry(entry.span_key):
+                continue
+            self.back_page.push_with_str(entry.object_string, entry.span_key)
 
     # --------------------------------------------------------------------------------
-    def __get_min_record_id(self) -> int:
-        if self.__get_database_size() < 1:
-            return 0
-        return int(self.session.query(func.min(QueueRecord.record_id)).scalar())
-
+    def __add_to_page(self, page: QueuePage, entries: List[PageEntry]):
+        for entry in entries:
+            page.push_with_str(entry.object_string, entry.span_key)
+        self.stored_size -= len(entries)
+
+    # With a journal, the page is in there before storage lets go of it. The storage thread
+    # writes it to the journal itself, and never waits on the event loop. shut_down waits
+    # on the storage thread from there. What is still to be written to the journal goes
+    # first. So the page lands after the _OUT records of when it was written to storage.
     # --------------------------------------------------------------------------------
-    def __delete_record_ids(self, record_ids: List[int]):
-        self.session.\
-            query(QueueRecord).\
-            filter(QueueRecord.record_id.in_(record_ids)).\
-            delete(synchronize_session='fetch')
-        self.session.commit()
+    async def __load_front_page(self):
+        before_delete = None
+        if self.__journal is not None:
+            self.__journal.flush()
+            before_delete = self.__journal.write_in_now
+        await self.__in_storage_thread(
+            self.storage.pop_front_page, self.page_size, before_delete,
+            apply = lambda entries: self.__add_to_page(self.front_page, entries)
+        )
 
+    # The full page stays the back page until it is written. So nothing goes missing from size().
     # --------------------------------------------------------------------------------
-    def __load_front_page(self):
-        records = self.session.\
-            query(QueueRecord).\
-            order_by(asc(QueueRecord.record_id)).\
-            limit(self.page_size).all()
-
-        for record in records:
-            self.front_page.push_with_str(str(record.object_string), SpanKey.from_bytes(record.span_key))
-        ids_to_delete: List[int] = [int(x.record_id) for x in records]
-        self.__delete_record_ids(ids_to_delete)
+    async def __write_back_page(self):
+        entries = self.back_page.get_page_list()
+        await self.__in_storage_thread(self.storage.append_page, entries, apply=lambda _: self.__back_page_written(entries))
 
     # --------------------------------------------------------------------------------
-    def __load_back_page(self):
-        records = self.session.\
-            query(QueueRecord).\
-            order_by(desc(QueueRecord.record_id)).\
-            limit(self.page_size).all()
-
-        for record in records:
-            self.back_page.push_with_str(str(record.object_string), SpanKey.from_bytes(record.span_key))
-        ids_to_delete: List[int] = [int(x.record_id) for x in records]
-        self.__delete_record_ids(ids_to_delete)
+    def __back_page_written(self, entries: List[PageEntry]):
+        self.stored_size += len(entries)
+        self.back_page    = QueuePage(self.queued_type)
+        self.__journal_out([entry.span_key for entry in entries])
 
     # --------------------------------------------------------------------------------
-    def __write_front_page(self):
-        page_data     = list(reversed(self.front_page.get_page_list()))
-        min_record_id = self.__get_min_record_id() - 1
-        data_to_write = []
-        for entry in page_data:
-            data_to_write.append(QueueRecord(
-                record_id    = min_record_id,
-                span_key     = entry.span_key.bytes,
-                object_string= entry.object_string
-            ))
-            min_record_id -= 1
-        self.session.bulk_save_objects(data_to_write)
-        self.session.commit()
-        self.front_page = QueuePage(self.queued_type)
+    def __journal_out(self, span_keys: List[SpanKey]):
+        if self.__journal is not None:
+            self.__journal.write_out(span_keys)
 
     # --------------------------------------------------------------------------------
-    def __write_back_page(self):
-        page_data     = self.back_page.get_page_list()
-        max_record_id = self.__get_max_record_id() + 1
-        data_to_write = []
-        for entry in page_data:
-            data_to_write.append(QueueRecord(
-                record_id    = max_record_id,
-                span_key     = entry.span_key.bytes,
-                object_string= entry.object_string
-            ))
-            max_record_id += 1
-        self.session.bulk_save_objects(data_to_write)
-        self.session.commit()
-        self.back_page = QueuePage(self.queued_type)
+    def __pop_front_of(self, page: QueuePage) -> _QueuedType | None:
+        if page.size() > 0:
+            self.__journal_out([page.get_page_list()[0].span_key])
+        return page.pop()
 
     # --------------------------------------------------------------------------------
-    def __get_database_size(self):
-        return self.session.query(QueueRecord).count()
+    def __write_page_on_shut_down(self, page: QueuePage, write: Callable[[List[PageEntry]], None]) -> List[SpanKey]:
+        entries = page.get_page_list()
+        self.__wait_for_storage_thread(write, entries)
+        self.stored_size += len(entries)
+        return [entry.span_key for entry in entries]
 
     # --------------------------------------------------------------------------------
-    def __get_record_by_span_key(self, span_key: SpanKey) -> QueueRecord|None:
-        try:
-            record = self.session.\
-                query(QueueRecord).\
-                filter(QueueRecord.span_key == span_key.bytes).\
-                one()
-            return cast(QueueRecord, record)
-        except NoResultFound:
+    def __entry_to_queueable_object(self, entry: PageEntry | None) -> _QueuedType | None:
+        if entry is None:
             return None
-
-    # --------------------------------------------------------------------------------
-    def __check_record_exists(self, span_key: SpanKey) -> bool:
-        return self.session.\
-            query(exists().where(QueueRecord.span_key == span_key.bytes)).\
-            scalar()
+        queued_data = json.loads(entry.object_string)
+        return self.queued_type(**queued_data)
 
     # --------------------------------------------------------------------------------
     async def pop(self):
-        if self.front_page.size() > 0:
-            return self.front_page.pop()
-        elif self.__get_database_size() > 0:
-            self.__load_front_page()
-            return self.front_page.pop()
-        elif self.back_page.size() > 0:
-            self.front_page = self.back_page
-            return self.front_page.pop()
-        else:
-            self.front_page = self.back_page
-            return None
+        async with self.__lock:
+            if self.front_page.size() > 0:
+                return self.__pop_front_of(self.front_page)
+            elif self.stored_size > 0:
+                await self.__load_front_page()
+                return self.__pop_front_of(self.front_page)
+            elif self.back_page.size() > 0:
+                self.front_page = self.back_page
+                return self.__pop_front_of(self.front_page)
+            else:
+                self.front_page = self.back_page
+                return None
 
+    # Storage is asked about span_key from here, not from its thread. Going there and back
+    # for every push, would cost more than the question does.
     # --------------------------------------------------------------------------------
-    async def push(self, object_to_queue: _QueuedType, span_key: SpanKey) -> SpanKey:
-        if (self.back_page.has_entry(span_key)  or
-            self.front_page.has_entry(span_key) or
-            self.__check_record_exists(span_key)):
-            return span_key
+    def __has_entry(self, span_key: SpanKey) -> bool:
+        return (self.back_page.has_entry(span_key)  or
+                self.front_page.has_entry(span_key) or
+                (self.stored_size > 0 and self.storage.has_entry(span_key)))
 
+    # --------------------------------------------------------------------------------
+    async def __push_to_pages(self, object_to_queue: _QueuedType, span_key: SpanKey):
         if self.back_page.size() < self.page_size:
-            return self.back_page.push(object_to_queue, span_key)
+            self.back_page.push(object_to_queue, span_key)
         elif self.back_page is self.front_page:
             self.back_page = QueuePage(self.queued_type)
-            return self.back_page.push(object_to_queue, span_key)
+            self.back_page.push(object_to_queue, span_key)
         else:
-            self.__write_back_page()
-            return self.back_page.push(object_to_queue, span_key)
+            await self.__write_back_page()
+            self.back_page.push(object_to_queue, span_key)
+
+    # --------------------------------------------------------------------------------
+    async def push(self, object_to_queue: _QueuedType, span_key: SpanKey) -> SpanKey:
+        if self.__journal is not None:
+            return await self.__push_journaled(object_to_queue, span_key)
+        async with self.__lock:
+            if not self.__has_entry(span_key):
+                await self.__push_to_pages(object_to_queue, span_key)
+            return span_key
+
+    # Duplicates are found before anything is journaled. From then on, until the entry is in
+    # a page, span_key is in __journaling. So a second push of it is found to be one, too.
+    #
+    # The journal is written to without the lock. So pushes waiting on the same group commit,
+    # wait together. They are woken, and take the lock, in the order they came. A push that
+    # is cancelled before its entry is in a page, takes the entry out of the journal again.
+    # --------------------------------------------------------------------------------
+    async def __push_journaled(self, object_to_queue: _QueuedType, span_key: SpanKey) -> SpanKey:
+        async with self.__lock:
+            if span_key in self.__journaling or self.__has_entry(span_key):
+                return span_key
+            self.__journaling.add(span_key)
+        try:
+            await self.__journal.write_in([PageEntry(span_key=span_key, object_string=object_to_queue.model_dump_json())])
+            async with self.__lock:
+                await self.__push_to_pages(object_to_queue, span_key)
+        except asyncio.CancelledError:
+            self.__journal_out([span_key])
+            raise
+        finally:
+            self.__journaling.discard(span_key)
+        return span_key
 
     # --------------------------------------------------------------------------------
     def size(self):
-        total = self.__get_database_size()
+        total = self.stored_size
         if self.front_page is self.back_page:
             total += self.front_page.size()
         else:
@@ -281,35 +375,37 @@ class PaginatedQueue(Generic[_QueuedType]):
             total     += front_size + back_size
         return total
 
+    # The pages are looked at under the lock as well. A pop may be moving the entry from
+    # storage to the front page, while we wait for it.
     # --------------------------------------------------------------------------------
     async def inspect_span_key(self, span_key: SpanKey):
-        if self.front_page.has_entry(span_key):
-            return self.front_page.inspect_entry(span_key)
+        async with self.__lock:
+            if self.front_page.has_entry(span_key):
+                return self.front_page.inspect_entry(span_key)
 
-        if self.back_page.has_entry(span_key):
-            return self.back_page.inspect_entry(span_key)
+            if self.back_page.has_entry(span_key):
+                return self.back_page.inspect_entry(span_key)
 
-        record = self.__get_record_by_span_key(span_key)
-        if record is None:
-            return None
-        queued_data = json.loads(record.object_string)
-        return self.queued_type(**queued_data)
+            return self.__entry_to_queueable_object(await self.__in_storage_thread(self.storage.inspect_entry, span_key))
 
     # --------------------------------------------------------------------------------
     async def pop_span_key(self, span_key: SpanKey):
-        if self.front_page.has_entry(span_key):
-            return self.front_page.pop_entry(span_key)
+        async with self.__lock:
+            if self.front_page.has_entry(span_key):
+                self.__journal_out([span_key])
+                return self.front_page.pop_entry(span_key)
 
-        if self.back_page.has_entry(span_key):
-            return self.back_page.pop_entry(span_key)
+            if self.back_page.has_entry(span_key):
+                self.__journal_out([span_key])
+                return self.back_page.pop_entry(span_key)
 
-        record = self.__get_record_by_span_key(span_key)
-        if record is None:
-            return None
-        queued_data = json.loads(record.object_string)
-        self.session.delete(record)
-        self.session.commit()
-        return self.queued_type(**queued_data)
+            return await self.__in_storage_thread(self.storage.pop_entry, span_key, apply=self.__stored_entry_popped)
+
+    # --------------------------------------------------------------------------------
+    def __stored_entry_popped(self, entry: PageEntry | None) -> _QueuedType | None:
+        if entry is not None:
+            self.stored_size -= 1
+        return self.__entry_to_queueable_object(entry)
 
     # --------------------------------------------------------------------------------
     def is_empty(self) -> int:
@@ -325,24 +421,39 @@ class PaginatedQueue(Generic[_QueuedType]):
 
     # --------------------------------------------------------------------------------
     async def clear(self):
-        metadata = MetaData()
-        table    = Table("queued_objects", metadata, autoload_with=self.database_engine)
-        self.session.query(table).filter(table.c.record_id > 0).delete()
-        self.session.query(table).filter(table.c.record_id < 0).delete()
-        self.session.query(table).filter(table.c.record_id == 0).delete()
-        self.session.commit()
-        self.front_page = QueuePage(self.queued_type)
-        self.back_page  = self.front_page
+        async with self.__lock:
+            await self.__in_storage_thread(self.storage.clear, apply=lambda _: self.__cleared())
 
+    # --------------------------------------------------------------------------------
+    def __cleared(self):
+        self.__journal_out([entry.span_key for entry in self.front_page.get_page_list()])
+        if self.back_page is not self.front_page:
+            self.__journal_out([entry.span_key for entry in self.back_page.get_page_list()])
+        self.stored_size = 0
+        self.front_page  = QueuePage(self.queued_type)
+        self.back_page   = self.front_page
+
+    # shut_down can't wait for the lock. But the lock is only ever held across storage work.
+    # So once what the storage thread is at is done, and applied, the pages are as they
+    # would be once the lock is free. Whoever was waiting for that work, finds it done.
+    # Work that failed changed nothing, and has nothing to apply.
     # --------------------------------------------------------------------------------
     def shut_down(self):
+        if self.__in_flight is not None and self.__in_flight.future.exception() is None:
+            self.__in_flight.finish()
+        written: List[SpanKey] = []
         if self.front_page is self.back_page:
             if self.front_page.size() > 0:
-                self.__write_front_page()
+                written += self.__write_page_on_shut_down(self.front_page, self.storage.prepend_page)
         else:
             if self.front_page.size() > 0:
-                self.__write_front_page()
+                written += self.__write_page_on_shut_down(self.front_page, self.storage.prepend_page)
 
             if self.back_page.size() > 0:
-                self.__write_back_page()
-        self.session.close()
+                written += self.__write_page_on_shut_down(self.back_page, self.storage.append_page)
+        self.front_page = QueuePage(self.queued_type)
+        self.back_page  = self.front_page
+        self.__wait_for_storage_thread(self.storage.close)
+        self.__executor.shutdown()
+        if self.__journal is not None:
+            self.__journal.close(written + list(self.__journaling)) # Pushes still in flight, never returned.
@@ -3,6 +3,8 @@ import logging
 from typing import Any, List
 from pydantic import BaseModel as PydanticBaseModel
 from .paginated_queue import PaginatedQueue
+from .queue_storage import QUEUE_STORAGE_SQLITE, QUEUE_STORAGE_SEGMENTED_LOG, SYNCHRONOUS_FULL
+from .push_journal import DURABILITY_PAGE
 from ..data_transfer_objects import SpanKey
 
 log = logging.getLogger()
@@ -21,6 +23,13 @@ class ErrorEntry(PydanticBaseModel):
     reason  : str
     metadata: dict = {}
 
+# What each queue's storage is called, after the file_basename.
+# --------------------------------------------------------------------------------
+_STORAGE_SUFFIXES = {
+    QUEUE_STORAGE_SQLITE       : ".sqlite",
+    QUEUE_STORAGE_SEGMENTED_LOG: ".log", # A directory.
+}
+
 # --------------------------------------------------------------------------------
 class PendingQueue:
     pending_q: PaginatedQueue[PendingEntry] = None
@@ -28,12 +37,18 @@ class PendingQueue:
 
     def __init__(
         self,
-        directory     : str,
-        file_basename : str,
-        page_size     : int = 100
+        directory       : str,
+        file_basename   : str,
+        page_size       : int   = 100,
+        storage         : str   = QUEUE_STORAGE_SQLITE,
+        synchronous     : str   = SYNCHRONOUS_FULL,
+        durability      : str   = DURABILITY_PAGE,
+        commit_max_items: int   = 100,
+        commit_max_delay: float = 0.002,
     ) -> None:
-        self.__setup_pending_q(f"{directory}/{file_basename}-pending.sqlite", page_size)
-        self.__setup_error_q  (f"{directory}/{file_basename}-error.sqlite"  , page_size)
+        suffix = _STORAGE_SUFFIXES.get(storage, "")
+        self.__setup_pending_q(f"{directory}/{file_basename}-pending{suffix}", page_size, storage, synchronous, durability, commit_max_items, commit_max_delay)
+        self.__setup_error_q  (f"{directory}/{file_basename}-error{suffix}"  , page_size, storage, synchronous, durability, commit_max_items, commit_max_delay)
 
     # --------------------------------------------------------------------------------
     def shut_down(self):
@@ -129,9 +144,9 @@ class PendingQueue:
         return await self.pending_q.pop()
 
     # --------------------------------------------------------------------------------
-    def __setup_pending_q(self, file_path: str, page_size: int):
-        self.pending_q = PaginatedQueue[PendingEntry](file_path, PendingEntry, page_size)
+    def __setup_pending_q(self, file_path: str, page_size: int, storage: str, synchronous: str, durability: str, commit_max_items: int, commit_max_delay: float):
+        self.pending_q = PaginatedQueue[PendingEntry](file_path, PendingEntry, page_size, storage, synchronous, durability, commit_max_items, commit_max_delay)
 
     # --------------------------------------------------------------------------------
-    def __setup_error_q(self, file_path: str, page_size: int):
-        self.error_q = PaginatedQueue[ErrorEntry](file_path, ErrorEntry, page_size)
+    def __setup_error_q(self, file_path: str, page_size: int, storage: str, synchronous: str, durability: str, commit_max_items: int, commit_max_delay: float):
+        self.error_q = PaginatedQueue[ErrorEntry](file_path, ErrorEntry, page_size, storage, synchronous, durability, commit_max_items, commit_max_delay)
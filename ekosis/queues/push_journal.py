@@ -0,0 +1,228 @@
+import asyncio
+import os
+import struct
+import zlib
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Tuple
+
+from .queue_storage import PageEntry
+from ..data_transfer_objects import SpanKey
+
+DURABILITY_PAGE   : str = "page"    # Entries are on disk once the page they are in, is written to storage.
+DURABILITY_JOURNAL: str = "journal" # Entries are on disk before a push returns.
+
+JOURNAL_SUFFIX      : str = ".journal"
+DEFAULT_COMPACT_SIZE: int = 4 * 1024 * 1024 # The journal is rewritten once it is this big, and mostly stale.
+
+_IN : int = 1 # The entry is only in memory. From a push, or from a page loaded from storage.
+_OUT: int = 2 # It no longer is. It was popped, or written to storage.
+
+_SPAN_KEY_SIZE: int           = 24
+_RECORD_HEADER: struct.Struct = struct.Struct(">BII") # Type, body length, crc32 of the body.
+
+_Record = Tuple[int, bytes, str | None] # Type, span_key, object_string.
+
+# --------------------------------------------------------------------------------
+# Keeps what a PaginatedQueue only has in memory, on disk as well. So entries survive
+# a crash from the moment their push returns, not from when their page is written.
+#
+# Records are collected for up to max_delay seconds after the first one, or until
+# there are max_items of them. Then they are written together, with a single fsync,
+# and every push that was waiting on them returns. That is group commit: The cost of
+# an fsync is shared by all the pushes in the group. Groups that only have _OUT
+# records are not fsynced. Losing one of those, means an entry is processed again
+# after a crash, not that one is lost.
+#
+# The file is only written to, from a thread of its own. That thread also keeps the
+# _IN records still current. Once the file is compact_size, and less than half of
+# it is current, it is rewritten with only those.
+# --------------------------------------------------------------------------------
+class PushJournal:
+    def __init__(
+        self,
+        file_path   : str,
+        max_items   : int   = 100,
+        max_delay   : float = 0.002,
+        compact_size: int   = DEFAULT_COMPACT_SIZE,
+    ):
+        self.file_path     : str                      = file_path
+        self.max_items     : int                      = max(1, max_items)
+        self.max_delay     : float                    = max(0.0, max_delay)
+        self.compact_size  : int                      = compact_size
+        self.__records     : List[_Record]            = []
+        self.__waiters     : List[asyncio.Future]     = []
+        self.__timer       : asyncio.TimerHandle|None = None
+        self.__current     : Dict[bytes, bytes]       = {} # span_key -> its _IN record. Only used in the thread.
+        self.__current_size: int                      = 0
+        self.__file        : BinaryIO | None          = None
+        self.__file_size   : int                      = 0
+        self.__closed      : bool                     = False
+        self.__executor    : ThreadPoolExecutor       = ThreadPoolExecutor(
+            max_workers        = 1,
+            thread_name_prefix = f"journal-{os.path.basename(file_path)}"
+        )
+
+    # Reads what is in the journal from before. Returns the entries that were only in memory, oldest first.
+    # --------------------------------------------------------------------------------
+    def recover(self) -> List[PageEntry]:
+        return self.__executor.submit(self.__recover).result()
+
+    # Returns once entries are on disk. Along with everything else written in the meantime.
+    # --------------------------------------------------------------------------------
+    async def write_in(self, entries: List[PageEntry]):
+        if not entries:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.__records.extend((_IN, entry.span_key.bytes, entry.object_string) for entry in entries)
+        self.__waiters.append(future)
+        self.__schedule()
+        await future
+
+    # For where there is no event loop to wait on. Blocks until entries are on disk.
+    # --------------------------------------------------------------------------------
+    def write_in_now(self, entries: List[PageEntry]):
+        if entries:
+            self.__executor.submit(self.__write, [(_IN, entry.span_key.bytes, entry.object_string) for entry in entries], True).result()
+
+    # Goes out with the next group. Nothing waits for it. Once closed, close() has taken care of it.
+    # --------------------------------------------------------------------------------
+    def write_out(self, span_keys: List[SpanKey]):
+        if not span_keys or self.__closed:
+            return
+        self.__records.extend((_OUT, span_key.bytes, None) for span_key in span_keys)
+        self.__schedule()
+
+    # span_keys are those of the pages the queue wrote to storage, as it shut down. They are no longer only in memory.
+    # --------------------------------------------------------------------------------
+    def close(self, span_keys: List[SpanKey]):
+        self.__closed = True
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        records = self.__records + [(_OUT, span_key.bytes, None) for span_key in span_keys]
+        waiters = self.__waiters
+        self.__records, self.__waiters = [], []
+        self.__executor.submit(self.__close, records).result()
+        self.__executor.shutdown()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    # --------------------------------------------------------------------------------
+    def __schedule(self):
+        if len(self.__records) >= self.max_items:
+            self.flush()
+        elif self.__timer is None:
+            self.__timer = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+
+    # Groups are written one after the other, in the order they were flushed. Before
+    # anything that write_in_now is called with after, too.
+    # --------------------------------------------------------------------------------
+    def flush(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        records, self.__records = self.__records, []
+        waiters, self.__waiters = self.__waiters, []
+        if not records:
+            return
+        written = asyncio.get_running_loop().run_in_executor(self.__executor, self.__write, records, len(waiters) > 0)
+        written.add_done_callback(lambda done: self.__acknowledge(done, waiters))
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __acknowledge(written: asyncio.Future, waiters: List[asyncio.Future]):
+        exception = written.exception()
+        for waiter in waiters:
+            if waiter.done(): # The push was cancelled.
+                continue
+            if exception is not None:
+                waiter.set_exception(exception)
+            else:
+                waiter.set_result(None)
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __encode_record(record_type: int, body: bytes) -> bytes:
+        return _RECORD_HEADER.pack(record_type, len(body), zlib.crc32(body)) + body
+
+    # The ones after a record that was only partly written, are left out. There are none, bar a crash while writing.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __read_records(data: bytes) -> List[Tuple[int, bytes]]:
+        records = []
+        offset  = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            record_type, length, crc = _RECORD_HEADER.unpack_from(data, offset)
+            body = data[offset + _RECORD_HEADER.size:offset + _RECORD_HEADER.size + length]
+            if record_type not in (_IN, _OUT) or len(body) != length or zlib.crc32(body) != crc:
+                break
+            records.append((record_type, body))
+            offset += _RECORD_HEADER.size + length
+        return records
+
+    # --------------------------------------------------------------------------------
+    def __apply(self, record_type: int, span_key: bytes, record: bytes):
+        if span_key in self.__current:
+            self.__current_size -= len(self.__current.pop(span_key))
+        if record_type == _IN:
+            self.__current[span_key]  = record
+            self.__current_size      += len(record)
+
+    # --------------------------------------------------------------------------------
+    def __recover(self) -> List[PageEntry]:
+        try:
+            with open(self.file_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        for record_type, body in self.__read_records(data):
+            self.__apply(record_type, body[:_SPAN_KEY_SIZE], self.__encode_record(record_type, body))
+        self.__rewrite()
+        return [
+            PageEntry(span_key=SpanKey.from_bytes(span_key), object_string=record[_RECORD_HEADER.size + _SPAN_KEY_SIZE:].decode())
+            for span_key, record in self.__current.items()
+        ]
+
+    # --------------------------------------------------------------------------------
+    def __write(self, records: List[_Record], sync: bool):
+        data = []
+        for record_type, span_key, object_string in records:
+            record = self.__encode_record(record_type, span_key if object_string is None else span_key + object_string.encode())
+            self.__apply(record_type, span_key, record)
+            data.append(record)
+        data = b"".join(data)
+        self.__file.write(data)
+        self.__file.flush()
+        if sync:
+            os.fsync(self.__file.fileno())
+        self.__file_size += len(data)
+        if self.__file_size >= max(self.compact_size, 2 * self.__current_size):
+            self.__rewrite()
+
+    # Written to a file of its own first. So there is always a whole journal, even after a crash.
+    # The rename is only on disk once the directory is.
+    # --------------------------------------------------------------------------------
+    def __rewrite(self):
+        data = b"".join(self.__current.values())
+        with open(f"{self.file_path}.tmp", "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if self.__file is not None:
+            self.__file.close()
+        os.replace(f"{self.file_path}.tmp", self.file_path)
+        directory = os.open(os.path.dirname(os.path.abspath(self.file_path)), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        self.__file      = open(self.file_path, "ab")
+        self.__file_size = len(data)
+
+    # --------------------------------------------------------------------------------
+    def __close(self, records: List[_Record]):
+        self.__write(records, False)
+        self.__rewrite()
+        self.__file.close()
@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from typing import Callable, List
+
+from pydantic import BaseModel as PydanticBaseModel
+
+from ..data_transfer_objects import SpanKey
+
+QUEUE_STORAGE_SQLITE       : str = "sqlite"
+QUEUE_STORAGE_SEGMENTED_LOG: str = "segmented_log"
+
+# How hard storage works to have a write survive a power cut, before it returns.
+# The same names as Sqlite's "PRAGMA synchronous" levels. FULL survives one. NORMAL
+# survives the process crashing. OFF leaves it all to the operating system.
+SYNCHRONOUS_OFF   : str = "OFF"
+SYNCHRONOUS_NORMAL: str = "NORMAL"
+SYNCHRONOUS_FULL  : str = "FULL"
+SYNCHRONOUS_EXTRA : str = "EXTRA"
+SYNCHRONOUS_MODES : tuple[str, ...] = (SYNCHRONOUS_OFF, SYNCHRONOUS_NORMAL, SYNCHRONOUS_FULL, SYNCHRONOUS_EXTRA)
+
+# --------------------------------------------------------------------------------
+class PageEntry(PydanticBaseModel):
+    span_key     : SpanKey
+    object_string: str
+
+# --------------------------------------------------------------------------------
+# Where a PaginatedQueue keeps the entries that are not in its front or back page.
+# Pages are written and loaded whole. Entries are always kept in queue order.
+# Storage is made, used and closed in a thread of its own. One at a time.
+# --------------------------------------------------------------------------------
+class QueueStorageBase(ABC):
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def size(self) -> int: # pragma: no cover
+        pass
+
+    # Behind everything already stored.
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def append_page(self, entries: List[PageEntry]): # pragma: no cover
+        pass
+
+    # In front of everything already stored.
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def prepend_page(self, entries: List[PageEntry]): # pragma: no cover
+        pass
+
+    # Removes, and returns, up to how_many of the oldest entries. Oldest first.
+    # before_delete, when given, is called with them while they are still in storage. Should the
+    # process die before it returns, they still are. Should it raise, they are not removed.
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def pop_front_page(self, how_many: int, before_delete: Callable[[List[PageEntry]], None] | None = None) -> List[PageEntry]: # pragma: no cover
+        pass
+
+    # Removes, and returns, up to how_many of the newest entries. Oldest first. As pop_front_page does.
+    # Storage that can only be consumed from the front, returns none.
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def pop_back_page(self, how_many: int, before_delete: Callable[[List[PageEntry]], None] | None = None) -> List[PageEntry]: # pragma: no cover
+        pass
+
+    # Unlike the rest, this is called from the event loop. So it has to be quick, and not
+    # care which thread it is called from. It is never called while anything else is running.
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def has_entry(self, span_key: SpanKey) -> bool: # pragma: no cover
+        pass
+
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def inspect_entry(self, span_key: SpanKey) -> PageEntry | None: # pragma: no cover
+        pass
+
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def pop_entry(self, span_key: SpanKey) -> PageEntry | None: # pragma: no cover
+        pass
+
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def clear(self): # pragma: no cover
+        pass
+
+    # --------------------------------------------------------------------------------
+    @abstractmethod
+    def close(self): # pragma: no cover
+        pass
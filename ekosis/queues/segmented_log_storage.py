@@ -0,0 +1,322 @@
+import logging
+import os
+import struct
+import zlib
+
+from typing import BinaryIO, Callable, Dict, Iterator, List, Tuple
+
+from .queue_storage import QueueStorageBase, PageEntry, SYNCHRONOUS_MODES, SYNCHRONOUS_OFF, SYNCHRONOUS_NORMAL, SYNCHRONOUS_FULL
+from ..data_transfer_objects import SpanKey
+
+SEGMENT_SUFFIX : str = ".segment"
+CHECKPOINT_FILE: str = "checkpoint"
+
+DEFAULT_SEGMENT_SIZE: int = 4 * 1024 * 1024 # A new segment is started once the last one is this big.
+
+_RECORD   : int = 1
+_TOMBSTONE: int = 2 # An entry that was taken out of the middle of the queue.
+
+_SPAN_KEY_SIZE    : int           = 24
+_RECORD_HEADER    : struct.Struct = struct.Struct(">BII") # Type, body length, crc32 of the body.
+_CHECKPOINT_COUNT : struct.Struct = struct.Struct(">I")   # How many segments follow.
+_CHECKPOINT_START : struct.Struct = struct.Struct(">qQ")  # Segment, and the offset reading it starts from.
+_CHECKPOINT_CRC   : struct.Struct = struct.Struct(">I")   # Of everything before it.
+
+# --------------------------------------------------------------------------------
+# An append-only log, in a directory of its own. Entries are appended to the last
+# of a series of numbered segment files, and only ever read from the front. Where
+# reading has got to, is kept in a small checkpoint file. A segment is deleted
+# whole, once everything in it has been read. So a page is one sequential write,
+# and loading one is a sequential read.
+#
+# An entry taken out of the middle of the queue, gets a tombstone appended. A page
+# written to the front, gets a segment numbered before the first one. That is why
+# the checkpoint has a start offset for every segment that has been read from, not
+# only the first one.
+#
+# Where each entry that is still queued is, is kept in memory. It is rebuilt when
+# the log is opened, by replaying the segments from their start offsets. A segment
+# ending in a record that was only partly written (the process died while writing
+# it), is cut back to the last whole record.
+#
+# With synchronous at FULL, every write is fsynced. At NORMAL, appends are only
+# flushed to the operating system, the way Sqlite's WAL mode does it. The checkpoint,
+# and pages written to the front, are still fsynced. At OFF, nothing is.
+# --------------------------------------------------------------------------------
+class SegmentedLogStorage(QueueStorageBase):
+    def __init__(self, directory: str, segment_size: int = DEFAULT_SEGMENT_SIZE, synchronous: str = SYNCHRONOUS_FULL):
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode [{synchronous}]. Use one of {list(SYNCHRONOUS_MODES)}.")
+        self.directory       : str                          = directory
+        self.segment_size    : int                          = max(1, segment_size)
+        self.synchronous     : str                          = synchronous
+        self.__log           : logging.Logger               = logging.getLogger()
+        self.__segments      : List[int]                    = []
+        self.__starts        : Dict[int, int]               = {} # segment -> offset. Everything before it has been read.
+        self.__index         : Dict[bytes, Tuple[int, int]] = {} # span_key -> (segment, offset), of entries still queued.
+        self.__write_file    : BinaryIO | None              = None
+        self.__write_size    : int                          = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.__recover()
+
+    # --------------------------------------------------------------------------------
+    def __sync(self, f: BinaryIO, is_append: bool):
+        f.flush()
+        if self.synchronous == SYNCHRONOUS_OFF:
+            return
+        if is_append and self.synchronous == SYNCHRONOUS_NORMAL:
+            return
+        os.fsync(f.fileno())
+
+    # --------------------------------------------------------------------------------
+    def __segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment}{SEGMENT_SUFFIX}")
+
+    # --------------------------------------------------------------------------------
+    def __list_segments(self) -> List[int]:
+        segments = []
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(SEGMENT_SUFFIX):
+                try:
+                    segments.append(int(file_name[:-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(segments)
+
+    # --------------------------------------------------------------------------------
+    def __read_checkpoint(self) -> Dict[int, int]:
+        try:
+            with open(os.path.join(self.directory, CHECKPOINT_FILE), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+        try:
+            (count,) = _CHECKPOINT_COUNT.unpack_from(data)
+            end      = _CHECKPOINT_COUNT.size + count * _CHECKPOINT_START.size
+            (crc,)   = _CHECKPOINT_CRC.unpack_from(data, end)
+        except struct.error:
+            crc, end = None, 0
+        if crc is None or zlib.crc32(data[:end]) != crc:
+            self.__log.warning(f"Queue log [{self.directory}]: Broken checkpoint. Reading every segment from the start.")
+            return {}
+        return dict(
+            _CHECKPOINT_START.unpack_from(data, _CHECKPOINT_COUNT.size + i * _CHECKPOINT_START.size)
+            for i in range(count)
+        )
+
+    # Written to a file of its own first. So there is always a whole checkpoint, even after a crash.
+    # --------------------------------------------------------------------------------
+    def __write_checkpoint(self):
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        data = _CHECKPOINT_COUNT.pack(len(self.__starts)) + b"".join(
+            _CHECKPOINT_START.pack(segment, offset) for segment, offset in self.__starts.items()
+        )
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(data + _CHECKPOINT_CRC.pack(zlib.crc32(data)))
+            self.__sync(f, False)
+        os.replace(f"{path}.tmp", path)
+
+    # Yields the type, offset, and body of every whole record, from offset on. Stops at the
+    # end of the segment, or at the first record that is broken. Then yields its offset, and None.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __read_records(f: BinaryIO, offset: int) -> Iterator[Tuple[int, int, bytes | None]]:
+        f.seek(offset)
+        while True:
+            header = f.read(_RECORD_HEADER.size)
+            if not header:
+                return
+            if len(header) < _RECORD_HEADER.size:
+                yield 0, offset, None
+                return
+            record_type, length, crc = _RECORD_HEADER.unpack(header)
+            body                     = f.read(length)
+            if len(body) < length or zlib.crc32(body) != crc or record_type not in (_RECORD, _TOMBSTONE):
+                yield 0, offset, None
+                return
+            yield record_type, offset, body
+            offset += _RECORD_HEADER.size + length
+
+    # --------------------------------------------------------------------------------
+    def __replay_segment(self, segment: int):
+        with open(self.__segment_path(segment), "r+b") as f:
+            for record_type, record_offset, body in self.__read_records(f, self.__starts.get(segment, 0)):
+                if body is None:
+                    self.__log.warning(f"Queue log [{self.directory}]: Segment [{segment}] cut back to [{record_offset}] bytes.")
+                    f.truncate(record_offset)
+                    return
+                span_key = body[:_SPAN_KEY_SIZE]
+                if record_type == _RECORD:
+                    self.__index[span_key] = (segment, record_offset)
+                else:
+                    self.__index.pop(span_key, None)
+
+    # Segments read to the end, but not deleted yet when the last run stopped, are deleted now.
+    # --------------------------------------------------------------------------------
+    def __recover(self):
+        starts = self.__read_checkpoint()
+        for segment in self.__list_segments():
+            start = starts.get(segment, 0)
+            if start > 0 and start >= os.path.getsize(self.__segment_path(segment)):
+                os.remove(self.__segment_path(segment))
+                continue
+            self.__segments.append(segment)
+            if start > 0:
+                self.__starts[segment] = start
+
+        for segment in self.__segments:
+            self.__replay_segment(segment)
+        if not self.__segments:
+            self.__segments.append(max(starts.keys(), default=-1) + 1)
+        self.__write_checkpoint()
+        self.__open_write_segment(self.__segments[-1])
+
+    # --------------------------------------------------------------------------------
+    def __open_write_segment(self, segment: int):
+        if self.__write_file is not None:
+            self.__write_file.close()
+        self.__write_file = open(self.__segment_path(segment), "ab")
+        self.__write_size = self.__write_file.tell()
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __encode_record(record_type: int, body: bytes) -> bytes:
+        return _RECORD_HEADER.pack(record_type, len(body), zlib.crc32(body)) + body
+
+    # Writes the records, one after the other, at the end of the last segment. Returns where each one starts.
+    # --------------------------------------------------------------------------------
+    def __append_records(self, records: List[bytes]) -> List[Tuple[int, int]]:
+        if self.__write_size >= self.segment_size:
+            self.__segments.append(self.__segments[-1] + 1)
+            self.__open_write_segment(self.__segments[-1])
+        segment   = self.__segments[-1]
+        locations = []
+        for record in records:
+            locations.append((segment, self.__write_size))
+            self.__write_size += len(record)
+        self.__write_file.write(b"".join(records))
+        self.__sync(self.__write_file, True)
+        return locations
+
+    # --------------------------------------------------------------------------------
+    def __read_entry(self, segment: int, offset: int) -> PageEntry:
+        with open(self.__segment_path(segment), "rb") as f:
+            _, _, body = next(self.__read_records(f, offset))
+        return PageEntry(span_key=SpanKey.from_bytes(body[:_SPAN_KEY_SIZE]), object_string=body[_SPAN_KEY_SIZE:].decode())
+
+    # --------------------------------------------------------------------------------
+    def size(self) -> int:
+        return len(self.__index)
+
+    # --------------------------------------------------------------------------------
+    def append_page(self, entries: List[PageEntry]):
+        if not entries:
+            return
+        records   = [self.__encode_record(_RECORD, entry.span_key.bytes + entry.object_string.encode()) for entry in entries]
+        locations = self.__append_records(records)
+        for entry, location in zip(entries, locations):
+            self.__index[entry.span_key.bytes] = location
+
+    # The segment is complete before it is renamed into place. So it is either there whole, or not at all.
+    # Its number could be that of a segment deleted since the last checkpoint. So that one is written first.
+    # --------------------------------------------------------------------------------
+    def prepend_page(self, entries: List[PageEntry]):
+        if not entries:
+            return
+        self.__write_checkpoint()
+        segment = self.__segments[0] - 1
+        path    = self.__segment_path(segment)
+        offset  = 0
+        with open(f"{path}.tmp", "wb") as f:
+            for entry in entries:
+                record = self.__encode_record(_RECORD, entry.span_key.bytes + entry.object_string.encode())
+                f.write(record)
+                self.__index[entry.span_key.bytes] = (segment, offset)
+                offset += len(record)
+            self.__sync(f, False)
+        os.replace(f"{path}.tmp", path)
+        self.__segments.insert(0, segment)
+
+    # Records taken out of the queue since they were written, are skipped. Segments read to the
+    # end are deleted, once the checkpoint says so. The last one stays, it is still written to.
+    # Until the checkpoint is written, the entries are still in the log. before_delete goes first.
+    # --------------------------------------------------------------------------------
+    def pop_front_page(self, how_many: int, before_delete: Callable[[List[PageEntry]], None] | None = None) -> List[PageEntry]:
+        entries : List[PageEntry]                    = []
+        removed : List[Tuple[bytes, Tuple[int, int]]] = []
+        finished: List[int]                          = []
+        starts  : Dict[int, int]                     = dict(self.__starts)
+        for segment in self.__segments:
+            with open(self.__segment_path(segment), "rb") as f:
+                for record_type, offset, body in self.__read_records(f, self.__starts.get(segment, 0)):
+                    if body is None:
+                        break
+                    self.__starts[segment] = offset + _RECORD_HEADER.size + len(body)
+                    span_key               = body[:_SPAN_KEY_SIZE]
+                    if record_type == _RECORD and self.__index.get(span_key) == (segment, offset):
+                        removed.append((span_key, self.__index.pop(span_key)))
+                        entries.append(PageEntry(span_key=SpanKey.from_bytes(span_key), object_string=body[_SPAN_KEY_SIZE:].decode()))
+                        if len(entries) >= how_many:
+                            break
+            if len(entries) >= how_many or segment == self.__segments[-1]:
+                break
+            finished.append(segment)
+
+        if before_delete is not None and entries:
+            try:
+                before_delete(entries)
+            except BaseException:
+                self.__starts = starts
+                self.__index.update(removed)
+                raise
+        self.__write_checkpoint()
+        for segment in finished:
+            os.remove(self.__segment_path(segment))
+            self.__segments.remove(segment)
+            self.__starts.pop(segment, None)
+        return entries
+
+    # --------------------------------------------------------------------------------
+    def pop_back_page(self, how_many: int, before_delete: Callable[[List[PageEntry]], None] | None = None) -> List[PageEntry]:
+        return []
+
+    # --------------------------------------------------------------------------------
+    def has_entry(self, span_key: SpanKey) -> bool:
+        return span_key.bytes in self.__index
+
+    # --------------------------------------------------------------------------------
+    def inspect_entry(self, span_key: SpanKey) -> PageEntry | None:
+        location = self.__index.get(span_key.bytes)
+        if location is None:
+            return None
+        return self.__read_entry(*location)
+
+    # --------------------------------------------------------------------------------
+    def pop_entry(self, span_key: SpanKey) -> PageEntry | None:
+        location = self.__index.get(span_key.bytes)
+        if location is None:
+            return None
+        entry = self.__read_entry(*location)
+        self.__append_records([self.__encode_record(_TOMBSTONE, span_key.bytes)])
+        del self.__index[span_key.bytes]
+        return entry
+
+    # Segment numbers carry on from where they were. So what the checkpoint still says about
+    # the old segments, can't be mistaken for something about the new one.
+    # --------------------------------------------------------------------------------
+    def clear(self):
+        next_segment = self.__segments[-1] + 1
+        for segment in self.__segments:
+            os.remove(self.__segment_path(segment))
+        self.__index.clear()
+        self.__starts.clear()
+        self.__segments = [next_segment]
+        self.__open_write_segment(next_segment)
+        self.__write_checkpoint()
+
+    # --------------------------------------------------------------------------------
+    def close(self):
+        if self.__write_file is not None:
+            self.__write_file.close()
+            self.__write_file = None
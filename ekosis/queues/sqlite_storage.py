@@ -0,0 +1,166 @@
+import sqlite3
+
+from typing import Callable, List, Tuple
+
+from .queue_storage import QueueStorageBase, PageEntry, SYNCHRONOUS_MODES, SYNCHRONOUS_FULL
+from ..data_transfer_objects import SpanKey
+
+# Files made before, by SqlAlchemy, have record_id as a BIGINT. Those work just the same.
+_CREATE_TABLE = "CREATE TABLE IF NOT EXISTS queued_objects (record_id INTEGER PRIMARY KEY, span_key BLOB NOT NULL UNIQUE, object_string TEXT)"
+_COUNT        = "SELECT COUNT(*) FROM queued_objects"
+_MIN_MAX      = "SELECT MIN(record_id), MAX(record_id) FROM queued_objects"
+_INSERT       = "INSERT INTO queued_objects (record_id, span_key, object_string) VALUES (?, ?, ?)"
+_EXISTS       = "SELECT 1 FROM queued_objects WHERE span_key = ?"
+_SELECT_ONE   = "SELECT record_id, object_string FROM queued_objects WHERE span_key = ?"
+_DELETE_ONE   = "DELETE FROM queued_objects WHERE record_id = ?"
+_DELETE_ALL   = "DELETE FROM queued_objects"
+
+# The order RETURNING hands rows back in, is not defined. So they are sorted afterwards.
+_DELETE_FRONT = "DELETE FROM queued_objects WHERE record_id IN (SELECT record_id FROM queued_objects ORDER BY record_id ASC LIMIT ?) RETURNING record_id, span_key, object_string"
+_DELETE_BACK  = "DELETE FROM queued_objects WHERE record_id IN (SELECT record_id FROM queued_objects ORDER BY record_id DESC LIMIT ?) RETURNING record_id, span_key, object_string"
+_SELECT_FRONT = "SELECT record_id, span_key, object_string FROM queued_objects ORDER BY record_id ASC LIMIT ?"
+_SELECT_BACK  = "SELECT record_id, span_key, object_string FROM queued_objects ORDER BY record_id DESC LIMIT ?"
+
+HAS_RETURNING: bool = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# --------------------------------------------------------------------------------
+# A single table in an Sqlite database file. Entries are kept in queue order by their
+# record_id. Pages written to the front, get ids below the lowest one. Pages written
+# to the back, above the highest one.
+#
+# The statements are always the same text. So sqlite3's statement cache only ever
+# prepares each one once. The database is in WAL mode, so a commit is one append to
+# the write-ahead log, rather than a rewrite of the pages it touched.
+#
+# How many entries there are, and the range their record_ids are in, are counted
+# once when the file is opened. From then on, they are kept up to date in memory.
+# The range may be wider than what is stored, never narrower. That is all writing a
+# page needs, and it saves a query for every write.
+#
+# has_entry has a connection of its own, that only reads. In WAL mode, that never
+# waits on the one that writes. So it can be used from any thread.
+# --------------------------------------------------------------------------------
+class SqliteQueueStorage(QueueStorageBase):
+    def __init__(self, file_path: str, synchronous: str = SYNCHRONOUS_FULL):
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unknown synchronous mode [{synchronous}]. Use one of {list(SYNCHRONOUS_MODES)}.")
+        self.file_path  : str                = file_path
+        self.synchronous: str                = synchronous
+        self.connection : sqlite3.Connection = sqlite3.connect(file_path)
+
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA synchronous={synchronous}")
+        with self.connection:
+            self.connection.execute(_CREATE_TABLE)
+        self.__reader   : sqlite3.Connection = sqlite3.connect(file_path, check_same_thread=False)
+
+        min_record_id, max_record_id = self.connection.execute(_MIN_MAX).fetchone()
+        self.__size         : int = self.connection.execute(_COUNT).fetchone()[0]
+        self.__min_record_id: int = min_record_id or 0
+        self.__max_record_id: int = max_record_id or 0
+
+    # --------------------------------------------------------------------------------
+    def size(self) -> int:
+        return self.__size
+
+    # --------------------------------------------------------------------------------
+    def __removed(self, how_many: int):
+        self.__size -= how_many
+        if self.__size == 0:
+            self.__min_record_id = 0
+            self.__max_record_id = 0
+
+    # before_delete is called before the delete is committed. Should it raise, it is rolled back.
+    # --------------------------------------------------------------------------------
+    def __delete_page(
+        self,
+        how_many        : int,
+        delete_statement: str,
+        select_statement: str,
+        before_delete   : Callable[[List[PageEntry]], None] | None,
+    ) -> Tuple[List[int], List[PageEntry]]:
+        if self.__size == 0:
+            return [], []
+        with self.connection:
+            if HAS_RETURNING:
+                rows = self.connection.execute(delete_statement, (how_many,)).fetchall()
+            else: # pragma: no cover
+                rows = self.connection.execute(select_statement, (how_many,)).fetchall()
+                self.connection.executemany(_DELETE_ONE, [(row[0],) for row in rows])
+            rows.sort(key=lambda row: row[0])
+            entries = [PageEntry(span_key=SpanKey.from_bytes(span_key), object_string=object_string) for _, span_key, object_string in rows]
+            if before_delete is not None and entries:
+                before_delete(entries)
+        return [row[0] for row in rows], entries
+
+    # --------------------------------------------------------------------------------
+    def pop_front_page(self, how_many: int, before_delete: Callable[[List[PageEntry]], None] | None = None) -> List[PageEntry]:
+        record_ids, entries = self.__delete_page(how_many, _DELETE_FRONT, _SELECT_FRONT, before_delete)
+        if record_ids:
+            self.__min_record_id = record_ids[-1] + 1
+            self.__removed(len(record_ids))
+        return entries
+
+    # --------------------------------------------------------------------------------
+    def pop_back_page(self, how_many: int, before_delete: Callable[[List[PageEntry]], None] | None = None) -> List[PageEntry]:
+        record_ids, entries = self.__delete_page(how_many, _DELETE_BACK, _SELECT_BACK, before_delete)
+        if record_ids:
+            self.__max_record_id = record_ids[0] - 1
+            self.__removed(len(record_ids))
+        return entries
+
+    # --------------------------------------------------------------------------------
+    def prepend_page(self, entries: List[PageEntry]):
+        if not entries:
+            return
+        min_record_id = self.__min_record_id - len(entries)
+        with self.connection:
+            self.connection.executemany(_INSERT, [
+                (min_record_id + i, entry.span_key.bytes, entry.object_string) for i, entry in enumerate(entries)
+            ])
+        self.__min_record_id  = min_record_id
+        self.__size          += len(entries)
+
+    # --------------------------------------------------------------------------------
+    def append_page(self, entries: List[PageEntry]):
+        if not entries:
+            return
+        max_record_id = self.__max_record_id + 1
+        with self.connection:
+            self.connection.executemany(_INSERT, [
+                (max_record_id + i, entry.span_key.bytes, entry.object_string) for i, entry in enumerate(entries)
+            ])
+        self.__max_record_id  = max_record_id + len(entries) - 1
+        self.__size          += len(entries)
+
+    # --------------------------------------------------------------------------------
+    def has_entry(self, span_key: SpanKey) -> bool:
+        return self.__reader.execute(_EXISTS, (span_key.bytes,)).fetchone() is not None
+
+    # --------------------------------------------------------------------------------
+    def inspect_entry(self, span_key: SpanKey) -> PageEntry | None:
+        row = self.connection.execute(_SELECT_ONE, (span_key.bytes,)).fetchone()
+        if row is None:
+            return None
+        return PageEntry(span_key=span_key, object_string=row[1])
+
+    # --------------------------------------------------------------------------------
+    def pop_entry(self, span_key: SpanKey) -> PageEntry | None:
+        with self.connection:
+            row = self.connection.execute(_SELECT_ONE, (span_key.bytes,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(_DELETE_ONE, (row[0],))
+        self.__removed(1)
+        return PageEntry(span_key=span_key, object_string=row[1])
+
+    # --------------------------------------------------------------------------------
+    def clear(self):
+        with self.connection:
+            self.connection.execute(_DELETE_ALL)
+        self.__removed(self.__size)
+
+    # --------------------------------------------------------------------------------
+    def close(self):
+        self.__reader.close()
+        self.connection.close()
@@ -8,6 +8,8 @@ from .buffered_handler import BufferedHandler
 
 from ..state_keepers.buffered_handler_keeper import BufferedHandlerKeeper
 from ..data_transfer_objects import EmptyDto
+from ..queues.queue_storage import QUEUE_STORAGE_SQLITE
+from ..queues.push_journal import DURABILITY_PAGE
 
 _T = TypeVar("_T", bound=PydanticBaseModel)
 
@@ -15,8 +17,12 @@ _T = TypeVar("_T", bound=PydanticBaseModel)
 def buffered_endpoint(
     route_key       : str,
     request_dto_type: Type[_T] = EmptyDto,
-    page_size       : int = 100,
-    max_retries     : int = 0,
+    page_size       : int      = 100,
+    max_retries     : int      = 0,
+    storage         : str      = QUEUE_STORAGE_SQLITE,
+    durability      : str      = DURABILITY_PAGE,
+    commit_max_items: int      = 100,
+    commit_max_delay: float    = 0.002,
 ):
     def inner_decorator(function):
         router                  = RequestRouter()
@@ -28,7 +34,11 @@ def buffered_endpoint(
             request_dto_type,
             page_size,
             max_retries,
-            accepted_parameters
+            accepted_parameters,
+            storage,
+            durability,
+            commit_max_items,
+            commit_max_delay
         )
         router.register_handler(new_handler)
         buffered_handler_keeper.add_buffered_handler(new_handler)
@@ -2,6 +2,9 @@ from typing import Type, TypeVar, Generic
 from pydantic import BaseModel as PydanticBaseModel
 from .buffered_handler_base import BufferedRequestHandlerBase
 
+from ..queues.queue_storage import QUEUE_STORAGE_SQLITE
+from ..queues.push_journal import DURABILITY_PAGE
+
 _T = TypeVar("_T", bound=PydanticBaseModel)
 
 class BufferedHandler(Generic[_T], BufferedRequestHandlerBase[_T]):
@@ -12,14 +15,22 @@ class BufferedHandler(Generic[_T], BufferedRequestHandlerBase[_T]):
         request_dto_type   : Type[_T],
         page_size          : int      = 100,
         max_retries        : int      = 0,
-        accepted_parameters: set[str] = set()
+        accepted_parameters: set[str] = set(),
+        storage            : str      = QUEUE_STORAGE_SQLITE,
+        durability         : str      = DURABILITY_PAGE,
+        commit_max_items   : int      = 100,
+        commit_max_delay   : float    = 0.002,
     ):
         super().__init__(
             route_key,
             request_dto_type,
             page_size,
             max_retries,
-            accepted_parameters
+            accepted_parameters,
+            storage,
+            durability,
+            commit_max_items,
+            commit_max_delay
         )
         self.function = function
 
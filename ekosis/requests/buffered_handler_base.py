@@ -6,12 +6,14 @@ from abc import ABC, abstractmethod
 from typing import Type, TypeVar, Generic, List
 
 from .handler_base import HandlerBase
-from .request_context import _set_current_span_key, _reset_current_span_key
+from .request_context import _set_current_span_key, _reset_current_span_key, _copy_context_without_deadline
 from .status import Status
 
 from ..util.fire_and_forget_tasks import fire_and_forget_task
 from ..data_transfer_objects import BufferedEndpointResponseDTO, SpanKey
 from ..queues.pending_queue import PendingQueue
+from ..queues.queue_storage import QUEUE_STORAGE_SQLITE, SYNCHRONOUS_FULL
+from ..queues.push_journal import DURABILITY_PAGE, DURABILITY_JOURNAL
 from ..state_keepers.statistics_keeper import StatisticsKeeper
 from ..middleware.buffered_middleware_manager import BufferedMiddlewareManager
 
@@ -36,14 +38,22 @@ class BufferedRequestHandlerBase(Generic[_T], HandlerBase, ABC):
         request_dto_type   : Type[_T],
         page_size          : int = 0,
         max_retries        : int = 0,
-        accepted_parameters: set[str] = set()
+        accepted_parameters: set[str] = set(),
+        storage            : str      = QUEUE_STORAGE_SQLITE,
+        durability         : str      = DURABILITY_PAGE,
+        commit_max_items   : int      = 100,
+        commit_max_delay   : float    = 0.002,
     ):
-        super().__init__(route_key, request_dto_type, accepted_parameters)
+        super().__init__(route_key, request_dto_type, accepted_parameters, cancellable=False)
         self.running             : bool             = False
         self.statistics_keeper   : StatisticsKeeper = StatisticsKeeper()
         self.log                 : logging.Logger   = logging.getLogger()
         self.page_size           : int              = page_size
         self.max_retries         : int              = max_retries
+        self.storage             : str              = storage
+        self.durability          : str              = durability
+        self.commit_max_items    : int              = commit_max_items
+        self.commit_max_delay    : float            = commit_max_delay
         self.shutdown            : bool             = False
         self._receiving_paused   : bool             = True
         self._processing_paused  : bool             = True
@@ -105,15 +115,19 @@ class BufferedRequestHandlerBase(Generic[_T], HandlerBase, ABC):
     # --------------------------------------------------------------------------------
     async def reprocess_error_queue(self):
         self._processing_paused = True
-        await self.queue.move_all_error_to_pending()
-        self._processing_paused = False
+        try:
+            await self.queue.move_all_error_to_pending()
+        finally:
+            self._processing_paused = False
         self.__check_process_queue()
 
     # --------------------------------------------------------------------------------
     async def reprocess_error_queue_span_key(self, span_key: SpanKey) -> _T|None:
         self._processing_paused = True
-        buffered_request        = await self.queue.move_one_error_to_pending(span_key)
-        self._processing_paused = False
+        try:
+            buffered_request = await self.queue.move_one_error_to_pending(span_key)
+        finally:
+            self._processing_paused = False
         self.__check_process_queue()
         if not buffered_request:
             return None
@@ -125,12 +139,18 @@ class BufferedRequestHandlerBase(Generic[_T], HandlerBase, ABC):
         directory       : str,
         application_name: str,
         instance_id     : str,
+        synchronous     : str,
     ):
         app_instance_string = f"{application_name}-{instance_id}"
         self.queue = PendingQueue(
             directory,
             f"{app_instance_string}-{self._route_key}-endpoint",
-            self.page_size
+            self.page_size,
+            self.storage,
+            synchronous,
+            self.durability,
+            self.commit_max_items,
+            self.commit_max_delay
         )
         self.statistics_keeper.add_persisted_queue(f"buffered_endpoint_sizes.{self._route_key}.pending", self.queue.pending_q)
         self.statistics_keeper.add_persisted_queue(f"buffered_endpoint_sizes.{self._route_key}.error"  , self.queue.error_q)
@@ -141,10 +161,11 @@ class BufferedRequestHandlerBase(Generic[_T], HandlerBase, ABC):
         directory       : str,
         application_name: str,
         instance_id     : str,
+        synchronous     : str = SYNCHRONOUS_FULL,
     ):
         route_key = self.get_route_key()
         self.log.info(f"Buffered handler [{route_key}] setup.")
-        self.__configure_queue(directory, application_name, instance_id)
+        self.__configure_queue(directory, application_name, instance_id, synchronous)
         self.unpause_receiving()
         self.unpause_processing()
 
@@ -211,11 +232,14 @@ class BufferedRequestHandlerBase(Generic[_T], HandlerBase, ABC):
     async def process_buffered_request(self, **kwargs) -> bool:
         pass
 
+    # Started from the request that found the queue idle. The rest of the queue is not bound by its deadline.
     # --------------------------------------------------------------------------------
     def __check_process_queue(self):
         if self.__process_queue_task is None or self.__process_queue_task.done():
-            self.__process_queue_task = asyncio.create_task(self._process_queue())
+            self.__process_queue_task = asyncio.create_task(self._process_queue(), context=_copy_context_without_deadline())
 
+    # With durability at DURABILITY_JOURNAL, the response only goes out once the request is on disk.
+    # The push itself is not bound by the request's deadline. Once started, it is done.
     # --------------------------------------------------------------------------------
     async def run(self, **kwargs) -> PydanticBaseModel:
         self.log.debug(f"BufferedRequestHandlerBase.run 000 [{kwargs}]")
@@ -224,7 +248,10 @@ class BufferedRequestHandlerBase(Generic[_T], HandlerBase, ABC):
         if self._receiving_paused:
             raise BufferedRequestHandlerReceivingPausedException(self._route_key)
         metadata = await BufferedMiddlewareManager().collect_push_metadata(span_key, dto)
-        fire_and_forget_task(self.queue.push_pending(span_key, dto, 0, metadata))
+        if self.durability == DURABILITY_JOURNAL:
+            await asyncio.shield(fire_and_forget_task(self.queue.push_pending(span_key, dto, 0, metadata), _copy_context_without_deadline()))
+        else:
+            fire_and_forget_task(self.queue.push_pending(span_key, dto, 0, metadata), _copy_context_without_deadline())
         response = BufferedEndpointResponseDTO(span_key = span_key)
         self.__check_process_queue()
         return response
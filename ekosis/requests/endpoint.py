@@ -8,12 +8,24 @@ from .standard_handler import StandardHandler
 
 from ..data_transfer_objects import EmptyDto
 
+# max_concurrency: The most requests this endpoint handles at the same time. Those over the
+#                  limit are answered with APPLICATION_BUSY. The default of 0 means no limit.
+# priority       : Requests for this endpoint may use the capacity a server keeps in reserve,
+#                  once it is at max_concurrent. Always the case for eco.* endpoints.
+# cancellable    : Whether a request still being handled at its deadline, is cancelled. Set it to
+#                  False for handlers that must not stop halfway. Never the case for eco.* endpoints.
 # --------------------------------------------------------------------------------
-def endpoint(route_key: str, request_dto_type: Type[PydanticBaseModel] = EmptyDto):
+def endpoint(
+    route_key       : str,
+    request_dto_type: Type[PydanticBaseModel] = EmptyDto,
+    max_concurrency : int                     = 0,
+    priority        : bool                    = False,
+    cancellable     : bool                    = True,
+):
     def inner_decorator(function):
         router              = RequestRouter()
         accepted_parameters = set(inspect.signature(function).parameters)
-        new_handler         = StandardHandler(route_key, function, request_dto_type, accepted_parameters)
+        new_handler         = StandardHandler(route_key, function, request_dto_type, accepted_parameters, max_concurrency, priority, cancellable)
         router.register_handler(new_handler)
         return function
     return inner_decorator
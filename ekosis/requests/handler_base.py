@@ -14,17 +14,37 @@ class HandlerBase(ABC):
         self,
         route_key: str,
         request_dto_type   : Type[PydanticBaseModel] = EmptyDto,
-        accepted_parameters: set[str]                = set()
+        accepted_parameters: set[str]                = set(),
+        max_concurrency    : int                     = 0,
+        priority           : bool                    = False,
+        cancellable        : bool                    = True,
     ):
         self._route_key      : str                     = route_key
         self.request_dto_type: Type[PydanticBaseModel] = request_dto_type
         self._accepted_params: set[str]                = accepted_parameters
+        self.max_concurrency : int                     = max(0, max_concurrency) # 0 means no limit.
+        self._concurrent     : int                     = 0
+        self.priority        : bool                    = priority # See: RequestRouter.is_priority_route
+        self.cancellable     : bool                    = cancellable # See: RequestRouter.is_cancellable_route
 
     def get_route_key(self) -> str:
         return self._route_key
 
+    # Every request admitted, has to be released again once it has been handled.
+    def admit(self) -> bool:
+        if self.max_concurrency and self._concurrent >= self.max_concurrency:
+            return False
+        self._concurrent += 1
+        return True
+
+    def release(self):
+        self._concurrent -= 1
+
     async def attempt_request(self, protocol_dto, **kwargs) -> PydanticBaseModel:
-        kwargs["dto"] = self.request_dto_type(**protocol_dto.data)
+        if isinstance(protocol_dto.data, self.request_dto_type): # Already validated by the router's typed request adapter.
+            kwargs["dto"] = protocol_dto.data
+        else:
+            kwargs["dto"] = self.request_dto_type(**protocol_dto.data)
         return await self.run(**kwargs)
 
     @abstractmethod
@@ -1,4 +1,6 @@
-from contextvars import ContextVar, Token
+import asyncio
+
+from contextvars import Context, ContextVar, Token, copy_context
 from typing import Optional
 
 from ..data_transfer_objects import SpanKey
@@ -27,3 +29,37 @@ def _reset_current_span_key(token: Token):
 # --------------------------------------------------------------------------------
 def _get_current_span_key() -> Optional[SpanKey]:
     return _current_span_key.get()
+
+# The deadline of the request currently being handled, as a loop.time(). Clients
+# read it, so the requests an endpoint sends on, are given no more time than it
+# has left itself.
+_current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+# --------------------------------------------------------------------------------
+def _set_current_deadline(deadline: Optional[float]) -> Token:
+    return _current_deadline.set(deadline)
+
+# --------------------------------------------------------------------------------
+def _reset_current_deadline(token: Token):
+    _current_deadline.reset(token)
+
+# --------------------------------------------------------------------------------
+def _get_current_deadline() -> Optional[float]:
+    return _current_deadline.get()
+
+# For tasks that outlive the request that started them, like the ones draining a queue.
+# A copy of the current context would hand them its deadline, long gone by the time
+# they get to most of their work.
+# --------------------------------------------------------------------------------
+def _copy_context_without_deadline() -> Context:
+    context = copy_context()
+    context.run(_current_deadline.set, None)
+    return context
+
+# Seconds until the current deadline. None when there is none, negative once it has passed.
+# --------------------------------------------------------------------------------
+def _get_remaining_time() -> Optional[float]:
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
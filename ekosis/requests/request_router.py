@@ -1,7 +1,7 @@
 import logging
 
-from typing import Dict, List, cast
-from pydantic import BaseModel as PydanticBaseModel
+from typing import Annotated, Any, Dict, List, Literal, Union, cast
+from pydantic import BaseModel as PydanticBaseModel, Field, TypeAdapter, create_model
 
 from .handler_base import HandlerBase
 from .buffered_handler_base import BufferedRequestHandlerBase
@@ -11,6 +11,8 @@ from ..middleware.manager import MiddlewareManager
 from ..data_transfer_objects import RequestDTO
 from ..util import SingletonType
 from ..state_keepers.statistics_keeper import StatisticsKeeper
+from ..state_keepers.worker_context import WorkerContext
+from ..workers.buffer_owner import BufferOwnerForwarder, BUFFER_OWNER_ROUTE_PREFIXES
 from ..exceptions.application_level import ApplicationProcessingException
 
 # --------------------------------------------------------------------------------
@@ -30,20 +32,81 @@ class UnknownRouteKeyException(RoutingExceptionBase):
     def __init__(self, route_key: str):
         super().__init__(Status.ROUTE_KEY_UNKNOWN.value, f"Unknown route key '{route_key}'")
 
+# --------------------------------------------------------------------------------
+class RouteBusyException(RoutingExceptionBase):
+    def __init__(self, route_key: str, max_concurrency: int):
+        super().__init__(Status.APPLICATION_BUSY.value, f"Route '{route_key}' is at its limit of [{max_concurrency}] concurrent requests")
+
+# --------------------------------------------------------------------------------
+class DeadlineExceededRoutingException(RoutingExceptionBase):
+    def __init__(self, route_key: str):
+        super().__init__(Status.DEADLINE_EXCEEDED.value, f"Deadline of '{route_key}' exceeded")
+
+# --------------------------------------------------------------------------------
+class ForwardedRequestException(RoutingExceptionBase):
+    def __init__(self, status: int, message: str):
+        super().__init__(status, message)
+        self.message = message # Already formatted by the worker that handled the request.
+
+# Management endpoints. Monitoring and the command line tools, have to get through most when an application is busiest.
+PRIORITY_ROUTE_PREFIX: str = "eco."
+
 # --------------------------------------------------------------------------------
 class RequestRouter(metaclass=SingletonType):
     _logger             : logging.Logger         = logging.getLogger()
     __statistics_keeper : StatisticsKeeper       = StatisticsKeeper()
     __routing_table     : Dict[str, HandlerBase] = {}
     __middleware_manager: MiddlewareManager      = MiddlewareManager()
+    __typed_adapter     : TypeAdapter | None     = None
+    __worker_context    : WorkerContext          = WorkerContext()
 
     def register_handler(self, handler: HandlerBase):
         if handler.get_route_key() not in self.__routing_table:
             self.__routing_table[handler.get_route_key()] = handler
             self.__statistics_keeper.track_endpoint_data(handler.get_route_key())
+            RequestRouter.__typed_adapter = None # Rebuilt on first use, to include the new route.
         else:
             raise Exception(f"Handler command id [{handler.get_route_key()}] already exists")
 
+    # Every route gets a request envelope, where data is the DTO type of its handler.
+    # Together they form a union on route_key, so a request can be parsed and
+    # validated, all the way down to its DTO, in a single pass.
+    # --------------------------------------------------------------------------------
+    def __build_typed_adapter(self) -> TypeAdapter:
+        envelopes = tuple(
+            create_model(
+                f"RequestDTO[{route_key}]",
+                __base__  = RequestDTO,
+                route_key = (Literal[route_key], ...),
+                data      = (handler.request_dto_type, ...),
+            )
+            for route_key, handler in self.__routing_table.items()
+        )
+        if len(envelopes) == 1:
+            return TypeAdapter(envelopes[0])
+        return TypeAdapter(Annotated[Union[envelopes], Field(discriminator="route_key")])
+
+    # Middleware may change the request data before routing, and expects a dict.
+    # So single pass validation is only available while there is no middleware.
+    # --------------------------------------------------------------------------------
+    def get_typed_request_adapter(self) -> TypeAdapter | None:
+        if not self.__routing_table or self.__middleware_manager.get_list():
+            return None
+        if RequestRouter.__typed_adapter is None:
+            RequestRouter.__typed_adapter = self.__build_typed_adapter()
+        return RequestRouter.__typed_adapter
+
+    # Only registered routes. So neither unknown route keys, nor batches, ever count as priority.
+    def is_priority_route(self, route_key: str) -> bool:
+        handler = self.__routing_table.get(route_key)
+        return handler is not None and (handler.priority or route_key.startswith(PRIORITY_ROUTE_PREFIX))
+
+    # Buffered handlers, and eco.* routes, change state that has to be left whole. They are
+    # never cancelled halfway. Unknown route keys are never handled, so they can't be.
+    def is_cancellable_route(self, route_key: str) -> bool:
+        handler = self.__routing_table.get(route_key)
+        return handler is None or (handler.cancellable and not route_key.startswith(PRIORITY_ROUTE_PREFIX))
+
     def get_buffered_handlers(self):
         response: List[BufferedRequestHandlerBase] = []
         for queue in self.__routing_table.values():
@@ -51,17 +114,42 @@ class RequestRouter(metaclass=SingletonType):
                 response.append(cast(BufferedRequestHandlerBase, queue))
         return response
 
+    def __is_buffer_owned(self, route_key: str) -> bool:
+        if route_key.startswith(BUFFER_OWNER_ROUTE_PREFIXES):
+            return True
+        return isinstance(self.__routing_table[route_key], BufferedRequestHandlerBase)
+
+    # Only worker 0 has the buffered queues. Other workers hand those requests to it,
+    # as they are. So middleware runs once, in worker 0.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    async def __forward_to_buffer_owner(protocol_dto: RequestDTO) -> Any:
+        response = await BufferOwnerForwarder().forward(protocol_dto.route_key, protocol_dto.span_key, protocol_dto.data)
+        if response.status != Status.SUCCESS.value:
+            raise ForwardedRequestException(response.status, str(response.data))
+        return response.data
+
     async def route_request(self, protocol_dto: RequestDTO, **kwargs) -> PydanticBaseModel:
         if protocol_dto.route_key not in self.__routing_table.keys():
             raise UnknownRouteKeyException(protocol_dto.route_key)
 
+        if not self.__worker_context.owns_buffers() and self.__is_buffer_owned(protocol_dto.route_key):
+            return await self.__forward_to_buffer_owner(protocol_dto)
+
+        handler = self.__routing_table[protocol_dto.route_key]
+        if not handler.admit():
+            self.__statistics_keeper.increment(f"endpoint_data.{protocol_dto.route_key}.busy_count")
+            raise RouteBusyException(protocol_dto.route_key, handler.max_concurrency)
+
         try:
             kwargs["protocol_dto"]  = protocol_dto
             middleware_protocol_dto = await self.__middleware_manager.run_before_routing(**kwargs) # Middleware before routing
             kwargs["protocol_dto"]  = middleware_protocol_dto
-            kwargs["response_dto"]  = await self.__routing_table[protocol_dto.route_key].attempt_request(**kwargs)
+            kwargs["response_dto"]  = await handler.attempt_request(**kwargs)
             kwargs["protocol_dto"]  = middleware_protocol_dto
             response                = await self.__middleware_manager.run_after_routing(**kwargs)  # Middleware after routing
             return response
         except ApplicationProcessingException as e:
             raise RouterProcessingException(protocol_dto.route_key, e.message)
+        finally:
+            handler.release()
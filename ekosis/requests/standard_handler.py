@@ -12,9 +12,12 @@ class StandardHandler(HandlerBase):
         route_key: str,
         function,
         request_dto_type   : Type[PydanticBaseModel],
-        accepted_parameters: set[str]
+        accepted_parameters: set[str],
+        max_concurrency    : int  = 0,
+        priority           : bool = False,
+        cancellable        : bool = True,
     ):
-        super().__init__(route_key, request_dto_type, accepted_parameters)
+        super().__init__(route_key, request_dto_type, accepted_parameters, max_concurrency, priority, cancellable)
         self.function = function
 
     async def run(self, **kwargs) -> PydanticBaseModel:
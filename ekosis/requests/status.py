@@ -12,4 +12,5 @@ class Status(Enum):
     # Server is broken
     APPLICATION_BUSY          = 500 # used by server applications to inform requesters that a request won't be processed due to server overload.
     PROCESSING_FAILURE        = 600 # For use by apps that need to report on an internal processing failure.
+    DEADLINE_EXCEEDED         = 700 # The deadline of the request passed, before it was processed. Processing was abandoned.
     UNHANDLED                 = 999 # And unhandled exception occurred.
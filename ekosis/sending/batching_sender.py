@@ -0,0 +1,39 @@
+from typing import Type, TypeVar
+from pydantic import BaseModel as PydanticBaseModel
+
+from .batching_sender_class import BatchingSenderClass
+
+from ..clients import ClientBase
+from ..data_transfer_objects import EmptyDto
+
+_RequestDTOType  = TypeVar("_RequestDTOType" , bound=PydanticBaseModel)
+_ResponseDTOType = TypeVar("_ResponseDTOType", bound=PydanticBaseModel)
+
+
+# --------------------------------------------------------------------------------
+def batching_sender(
+    client           : ClientBase,
+    route_key        : str,
+    response_dto_type: Type[_ResponseDTOType] = EmptyDto,
+    max_items        : int                    = 100,
+    max_delay        : float                  = 0.002,
+    ordered          : bool                   = False,
+):
+    def inner_decorator(function):
+        batching_sender_instance = BatchingSenderClass[_RequestDTOType, _ResponseDTOType](
+            client,
+            route_key,
+            response_dto_type,
+            max_items,
+            max_delay,
+            ordered
+        )
+
+        async def wrapper(*args, **kwargs) -> _ResponseDTOType:
+            span_key_to_use = None
+            if "span_key" in kwargs.keys():
+                span_key_to_use = kwargs["span_key"]
+
+            return await batching_sender_instance.send(await function(*args, **kwargs), span_key_to_use)
+        return wrapper
+    return inner_decorator
@@ -0,0 +1,112 @@
+import asyncio
+import contextvars
+
+from typing import Generic, List, Set, Tuple, Type, TypeVar
+from pydantic import BaseModel as PydanticBaseModel
+
+from ..clients import ClientBase
+from ..data_transfer_objects import EmptyDto, SpanKey
+from ..exceptions import DeadlineExceededException
+from ..requests.request_context import _get_current_deadline, _set_current_deadline, _get_remaining_time
+
+_RequestDTOType  = TypeVar("_RequestDTOType" , bound=PydanticBaseModel)
+_ResponseDTOType = TypeVar("_ResponseDTOType", bound=PydanticBaseModel)
+
+_PendingCall = Tuple[PydanticBaseModel, SpanKey | None, float | None, asyncio.Future]
+
+
+# --------------------------------------------------------------------------------
+# Collects the calls made within max_delay seconds of the first one, and sends them
+# together, as one batch. A batch is sent sooner, as soon as it has max_items calls in it.
+# Every caller waits for, and gets, the response to its own request. Or the exception.
+#
+# With max_delay at 0, only calls made before the event loop gets around to it, are
+# sent together. i.e. Those made in the same pass, like from asyncio.gather.
+#
+# A batch is given the latest of the deadlines its calls inherited. Calls whose
+# deadline has already passed, are not batched at all.
+# --------------------------------------------------------------------------------
+class BatchingSenderClass(Generic[_RequestDTOType, _ResponseDTOType]):
+    def __init__(
+        self,
+        client           : ClientBase,
+        route_key        : str,
+        response_dto_type: Type[_ResponseDTOType] = EmptyDto,
+        max_items        : int                    = 100,
+        max_delay        : float                  = 0.002,
+        ordered          : bool                   = False,
+    ):
+        self._client           : ClientBase               = client
+        self._route_key        : str                      = route_key
+        self._response_dto_type: Type[_ResponseDTOType]   = response_dto_type
+        self._max_items        : int                      = max(1, max_items)
+        self._max_delay        : float                    = max(0.0, max_delay)
+        self._ordered          : bool                     = ordered
+        self.__pending         : List[_PendingCall]       = []
+        self.__timer           : asyncio.TimerHandle|None = None
+        self.__sending         : Set[asyncio.Task]        = set() # Tasks are only weakly referenced by the loop.
+
+    # --------------------------------------------------------------------------------
+    def get_route_key(self) -> str:
+        return self._route_key
+
+    # --------------------------------------------------------------------------------
+    async def send(self, data: _RequestDTOType, span_key: SpanKey = None) -> _ResponseDTOType:
+        remaining = _get_remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededException(f"Deadline exceeded before '{self._route_key}' was sent")
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append((data, span_key, _get_current_deadline(), future))
+        if len(self.__pending) >= self._max_items:
+            self.__flush()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self._max_delay, self.__flush)
+        return await future
+
+    # None, when any of the calls can wait as long as it takes.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __latest_deadline(calls: List[_PendingCall]) -> float | None:
+        deadlines = [deadline for _, _, deadline, _ in calls]
+        return None if None in deadlines else max(deadlines)
+
+    # Whichever call happens to flush, the batch is sent with a deadline of its own.
+    # --------------------------------------------------------------------------------
+    def __flush(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        calls, self.__pending = self.__pending, []
+        if calls:
+            context = contextvars.copy_context()
+            context.run(_set_current_deadline, self.__latest_deadline(calls))
+            task    = asyncio.get_running_loop().create_task(self.__send_calls(calls), context=context)
+            self.__sending.add(task)
+            task.add_done_callback(self.__sending.discard)
+
+    # A single call is not worth the envelope. It goes out as it would have without batching.
+    # --------------------------------------------------------------------------------
+    async def __send_calls(self, calls: List[_PendingCall]):
+        try:
+            if len(calls) == 1:
+                data, span_key, _, _ = calls[0]
+                results = [await self._client.send_message(self._route_key, data, self._response_dto_type, span_key)]
+            else:
+                results = await self._client.send_batch(
+                    self._route_key,
+                    [data for data, _, _, _ in calls],
+                    self._response_dto_type,
+                    self._ordered,
+                    span_keys = [span_key for _, span_key, _, _ in calls]
+                )
+        except Exception as e:
+            results = [e] * len(calls)
+
+        for (_, _, _, future), result in zip(calls, results):
+            if future.done(): # The caller was cancelled.
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -5,6 +5,7 @@ from .buffered_sender_class import BufferedSenderClass
 
 from ..clients import ClientBase
 from ..data_transfer_objects import EmptyDto
+from ..queues.queue_storage import QUEUE_STORAGE_SQLITE
 from ..state_keepers.buffered_sender_keeper import BufferedSenderKeeper
 
 _RequestDTOType  = TypeVar("_RequestDTOType" , bound=PydanticBaseModel)
@@ -20,6 +21,7 @@ def buffered_sender(
     wait_period      : float                  = 0,
     page_size        : int                    = 100,
     max_retries      : int                    = 0,
+    storage          : str                    = QUEUE_STORAGE_SQLITE,
 ):
     def inner_decorator(function):
         buffered_sender_keeper   = BufferedSenderKeeper()
@@ -30,7 +32,8 @@ def buffered_sender(
             response_dto_type,
             wait_period,
             page_size,
-            max_retries
+            max_retries,
+            storage
         )
         buffered_sender_keeper.add_buffered_sender(buffered_sender_instance)
 
@@ -1,16 +1,21 @@
 import asyncio
 import logging
 
-from typing import Type, TypeVar, Generic, List
+from typing import Any, Dict, Type, TypeVar, Generic, List
 from pydantic import BaseModel as PydanticBaseModel
 
 from .sender_base import SenderBase
 
 from ..clients import ClientBase
-from ..data_transfer_objects import EmptyDto, SpanKey
+from ..data_transfer_objects import EmptyDto, SpanKey, WorkerBufferedSendRequestDto
 from ..queues.pending_queue import PendingQueue
+from ..queues.queue_storage import QUEUE_STORAGE_SQLITE, SYNCHRONOUS_FULL
+from ..requests.request_context import _copy_context_without_deadline
+from ..requests.status import Status
 from ..state_keepers.statistics_keeper import StatisticsKeeper
-from ..exceptions import ServerBusyException, CommunicationsMaxRetriesReached
+from ..state_keepers.worker_context import WorkerContext
+from ..workers.buffer_owner import BufferOwnerForwarder
+from ..exceptions import ServerBusyException, DeadlineExceededException, CommunicationsMaxRetriesReached
 
 _RequestDTOType  = TypeVar("_RequestDTOType" , bound=PydanticBaseModel)
 _ResponseDTOType = TypeVar("_ResponseDTOType", bound=PydanticBaseModel)
@@ -27,6 +32,7 @@ class BufferedSenderBase(Generic[_RequestDTOType, _ResponseDTOType], SenderBase[
         wait_period      : float                  = 0,
         page_size        : int                    = 100,
         max_retries      : int                    = 0,
+        storage          : str                    = QUEUE_STORAGE_SQLITE,
     ):
         super().__init__(
             client,
@@ -42,6 +48,7 @@ class BufferedSenderBase(Generic[_RequestDTOType, _ResponseDTOType], SenderBase[
         self.wait_period              : float            = wait_period
         self.page_size                : int              = page_size
         self.max_retries              : int              = max_retries
+        self.storage                  : str              = storage
         self.shutdown                 : bool             = False
         self.queue                    : PendingQueue     = None
         self.on_shutdown_future       : asyncio.Future   = None
@@ -55,13 +62,34 @@ class BufferedSenderBase(Generic[_RequestDTOType, _ResponseDTOType], SenderBase[
     async def enqueue(self, request_data: _RequestDTOType, span_key: SpanKey = None) -> None:
         span_key_to_use = span_key if span_key else SpanKey.generate()
 
+        if not WorkerContext().owns_buffers():
+            await self.__enqueue_on_buffer_owner(request_data, span_key_to_use)
+            return
+
         await self.queue.push_pending(span_key_to_use, request_data, 0)
         self.__check_process_send_queue()
 
+    # Only worker 0 has the queue, so other workers have it do the queueing for them.
+    # --------------------------------------------------------------------------------
+    async def __enqueue_on_buffer_owner(self, request_data: _RequestDTOType, span_key: SpanKey):
+        forwarded_request = WorkerBufferedSendRequestDto(
+            route_key = self.get_route_key(),
+            span_key  = span_key,
+            data      = request_data.model_dump(),
+        )
+        response = await BufferOwnerForwarder().forward("eco.worker.buffered_sender.enqueue", span_key, forwarded_request)
+        if response.status != Status.SUCCESS.value:
+            raise ClientBase.generate_response_exception(response)
+
+    # --------------------------------------------------------------------------------
+    async def enqueue_data(self, data: Dict[str, Any], span_key: SpanKey) -> None:
+        await self.enqueue(self._request_dto_type(**data), span_key)
+
+    # Often started from an endpoint. The sends it does later on, are not bound by that request's deadline.
     # --------------------------------------------------------------------------------
     def __check_process_send_queue(self):
         if self.__send_process_task is None or self.__send_process_task.done():
-            self.__send_process_task = asyncio.create_task(self.__process_send_queue())
+            self.__send_process_task = asyncio.create_task(self.__process_send_queue(), context=_copy_context_without_deadline())
 
     # --------------------------------------------------------------------------------
     def shut_down(self):
@@ -94,7 +122,7 @@ class BufferedSenderBase(Generic[_RequestDTOType, _ResponseDTOType], SenderBase[
                 if self.wait_period > 0:
                     await asyncio.sleep(self.wait_period)
                 await self.send_data(request_data, span_key)
-            except (ServerBusyException, CommunicationsMaxRetriesReached): # Only retry sending, if the sending is retryable
+            except (ServerBusyException, DeadlineExceededException, CommunicationsMaxRetriesReached): # Only retry sending, if the sending is retryable
                 retries += 1
                 if retries >= self.max_retries:
                     await self.queue.push_error(span_key, request_data, "Max retries reached.")
@@ -156,15 +184,19 @@ class BufferedSenderBase(Generic[_RequestDTOType, _ResponseDTOType], SenderBase[
     # --------------------------------------------------------------------------------
     async def reprocess_error_queue(self):
         self._sending_paused = True
-        await self.queue.move_all_error_to_pending()
-        self._sending_paused = False
+        try:
+            await self.queue.move_all_error_to_pending()
+        finally:
+            self._sending_paused = False
         self.__check_process_send_queue()
 
     # --------------------------------------------------------------------------------
     async def reprocess_error_queue_span_key(self, span_key: SpanKey) -> _RequestDTOType|None:
         self._sending_paused = True
-        buffered_request     = await self.queue.move_one_error_to_pending(span_key)
-        self._sending_paused = False
+        try:
+            buffered_request = await self.queue.move_one_error_to_pending(span_key)
+        finally:
+            self._sending_paused = False
         self.__check_process_send_queue()
         if not buffered_request:
             return None
@@ -176,12 +208,15 @@ class BufferedSenderBase(Generic[_RequestDTOType, _ResponseDTOType], SenderBase[
         directory       : str,
         application_name: str,
         instance_id     : str,
+        synchronous     : str,
     ):
         app_instance_string = f"{application_name}-{instance_id}"
         self.queue = PendingQueue(
             directory,
             f"{app_instance_string}-{self._route_key}-sender",
-            self.page_size
+            self.page_size,
+            self.storage,
+            synchronous
         )
         self.statistics_keeper.add_persisted_queue(f"buffered_sender_sizes.{self._route_key}.pending", self.queue.pending_q)
         self.statistics_keeper.add_persisted_queue(f"buffered_sender_sizes.{self._route_key}.error"  , self.queue.error_q)
@@ -189,13 +224,14 @@ class BufferedSenderBase(Generic[_RequestDTOType, _ResponseDTOType], SenderBase[
     # --------------------------------------------------------------------------------
     async def setup(
         self,
-        directory: str,
+        directory       : str,
         application_name: str,
         instance_id     : str,
+        synchronous     : str = SYNCHRONOUS_FULL,
     ):
         route_key = self.get_route_key()
         self.log.info(f"Buffered sender [{route_key}] setup.")
-        self.__configure_queue(directory, application_name, instance_id)
+        self.__configure_queue(directory, application_name, instance_id, synchronous)
         self.unpause_send_process()
 
         self.__check_process_send_queue()
@@ -5,6 +5,7 @@ from .buffered_sender_base import BufferedSenderBase
 
 from ..clients import ClientBase
 from ..data_transfer_objects import EmptyDto, SpanKey
+from ..queues.queue_storage import QUEUE_STORAGE_SQLITE
 
 _RequestDTOType  = TypeVar("_RequestDTOType" , bound=PydanticBaseModel)
 _ResponseDTOType = TypeVar("_ResponseDTOType", bound=PydanticBaseModel)
@@ -20,6 +21,7 @@ class BufferedSenderClass(Generic[_RequestDTOType, _ResponseDTOType], BufferedSe
         wait_period      : float                  = 0,
         page_size        : int                    = 100,
         max_retries      : int                    = 0,
+        storage          : str                    = QUEUE_STORAGE_SQLITE,
     ):
         super().__init__(
             client,
@@ -28,7 +30,8 @@ class BufferedSenderClass(Generic[_RequestDTOType, _ResponseDTOType], BufferedSe
             response_dto_type,
             wait_period,
             page_size,
-            max_retries
+            max_retries,
+            storage
         )
 
     async def push_message(self, message: _RequestDTOType, span_key: SpanKey = None):
@@ -1,13 +1,22 @@
 import asyncio
 
 from ..stream_server_base import StreamServerBase
+from ..stream_protocol import StreamProtocolConnection
 
 from ...configuration.config_models import ConfigTCP
 
 # --------------------------------------------------------------------------------
 class TCPServer(StreamServerBase):
     def __init__(self, configuration : ConfigTCP):
-        super().__init__()
+        super().__init__(
+            configuration.max_in_flight,
+            configuration.binary_framing,
+            configuration.max_concurrent,
+            configuration.max_connections,
+            configuration.stream_engine,
+            configuration.compression_threshold,
+            configuration.priority_reserve,
+        )
         self.host: str = configuration.host
         self.port: int = configuration.port
         self.set_transport_type("TCP")
@@ -34,9 +43,17 @@ class TCPServer(StreamServerBase):
             self._logger.info(f"Stopping TCP server for {self.host}:{self.port}.")
             self._server.close()
 
+    # --------------------------------------------------------------------------------
+    def __new_connection(self) -> StreamProtocolConnection:
+        return StreamProtocolConnection(self)
+
     # --------------------------------------------------------------------------------
     async def __setup_server(self):
-        self._server   = await asyncio.start_server(self._handle_request, self.host, self.port)
+        if self._protocol_engine:
+            loop         = asyncio.get_running_loop()
+            self._server = await loop.create_server(self.__new_connection, self.host, self.port, reuse_port=self._reuse_port)
+        else:
+            self._server = await asyncio.start_server(self._handle_request, self.host, self.port, reuse_port=self._reuse_port)
         serving_address = self._server.sockets[0].getsockname()
         self._logger.info(f'Serving TCP on {serving_address}')
 
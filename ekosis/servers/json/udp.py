@@ -1,9 +1,30 @@
+import socket
+import random
 import asyncio
 import logging
+import itertools
 
+from typing import Iterator, List
+
+from .batched_datagram import BatchedDatagramTransport
 from ..server_base import ServerBase
 
+from ...codecs import JSON_CODEC, available_encodings
 from ...configuration.config_models import ConfigUDP
+from ...exceptions import FramingException
+from ...framing import (
+    MessageType,
+    FrameHeader,
+    BINARY_FRAMING_ENQ,
+    CAPABILITY_FRAGMENTS,
+    FLAG_ACCEPTS_FRAGMENTS,
+    FragmentReassembler,
+    decode_datagram_frame,
+    encode_binary_framing_ack,
+    enlarge_receive_buffer,
+    is_binary_frame,
+    split_into_fragments,
+)
 
 log = logging.getLogger()
 
@@ -14,40 +35,129 @@ class DatagramProtocolServer(asyncio.DatagramProtocol):
     __LF_byte     : int   = 10 # Decimal 10 = Ascii LF (line feed) character = '\n'
     __ACK_response: bytes = bytes([__ACK_byte, __LF_byte])
 
-    def __init__(self, build_response_function):
+    def __init__(
+        self,
+        build_response_function,
+        admit_function,
+        busy_response_function,
+        binary_framing    : bool  = False,
+        binary_framing_ack: bytes = b'',
+        reassemble_function = None,
+        fragment_function   = None,
+    ):
         self.build_response_function = build_response_function
+        self.admit_function          = admit_function
+        self.busy_response_function  = busy_response_function
+        self.binary_framing          = binary_framing
+        self.binary_framing_ack      = binary_framing_ack
+        self.reassemble_function     = reassemble_function # Only set when fragments are accepted.
+        self.fragment_function       = fragment_function
 
         self.transport     : asyncio.DatagramTransport = None
         self.loop          : asyncio.AbstractEventLoop = None
-        self.__write_lock  : asyncio.Lock              = asyncio.Lock()
 
     def connection_made(self, transport):
         self.transport = transport
         self.loop      = asyncio.get_running_loop()
 
-    async def do_response(self, message, addr):
-        async with self.__write_lock:
-            response = await self.build_response_function(message)
-            self.transport.sendto(response.encode(), addr)
+    # Responses are only fragmented for clients that said they can put them back together.
+    def __send(self, response, addr, header: FrameHeader | None):
+        if self.fragment_function is not None and header is not None and header.flags & FLAG_ACCEPTS_FRAGMENTS:
+            try:
+                for datagram in self.fragment_function(response):
+                    self.transport.sendto(datagram, addr)
+            except FramingException as e:
+                log.warning(f"Dropping response: {e}")
+        else:
+            self.transport.sendto(response, addr)
+
+    # Requests are handled concurrently. sendto never interleaves datagrams, so sending needs no lock either.
+    async def do_response(self, message, addr, header: FrameHeader | None = None):
+        response = await self.build_response_function(message, header) # Goes back the same way the request came in.
+        if not self.transport.is_closing():
+            self.__send(response, addr, header)
 
-    # TODO: find a way to deal with partial bytes read
+    # Datagrams the server has no room for, are answered right here. No task is created for them.
+    def __respond(self, message, addr, header: FrameHeader | None = None):
+        if self.admit_function(message, header):
+            self.loop.create_task(self.do_response(message, addr, header))
+        else:
+            self.__send(self.busy_response_function(message, header), addr, header)
+
+    def __binary_frame_received(self, bytes_read, addr):
+        try:
+            header, payload = decode_datagram_frame(bytes_read)
+            if header.message_type == MessageType.FRAGMENT.value and self.reassemble_function is not None:
+                message = self.reassemble_function(payload, addr)
+                if message is not None: # That was the last fragment. Handle it as if it arrived in one piece.
+                    self.datagram_received(message, addr)
+                return
+        except FramingException as e:
+            log.warning(f"Dropping datagram: {e}")
+            return
+        if header.message_type == MessageType.REQUEST.value:
+            self.__respond(payload, addr, header)
+
+    # Datagrams arrive whole, or not at all. Messages too large for a single datagram,
+    # arrive as fragments, when fragmentation is turned on.
     def datagram_received(self, bytes_read, addr):
-        if bytes_read and bytes_read[-1] == self.__LF_byte:
+        if self.binary_framing and is_binary_frame(bytes_read):
+            self.__binary_frame_received(bytes_read, addr)
+        elif bytes_read and bytes_read[-1] == self.__LF_byte:
             if bytes_read[0] == self.__ACK_byte: # The client wants to know we are here.
                 self.transport.sendto(self.__ACK_response, addr)
+            elif self.binary_framing and bytes_read == BINARY_FRAMING_ENQ: # The client is asking for binary framing.
+                self.transport.sendto(self.binary_framing_ack, addr)
             else:
-                request_data: str = bytes_read.decode()
-                self.loop.create_task(self.do_response(request_data, addr))
+                self.__respond(bytes_read, addr)
 
 # --------------------------------------------------------------------------------
 class UDPServer(ServerBase):
     def __init__(self, configuration : ConfigUDP):
-        ServerBase.__init__(self)
-        self.host       : str                       = configuration.host
-        self.port       : int                       = configuration.port
-        self.__transport: asyncio.DatagramTransport = None
-        self.__loop     : asyncio.AbstractEventLoop = None
+        ServerBase.__init__(
+            self,
+            configuration.binary_framing,
+            configuration.max_concurrent,
+            configuration.compression_threshold,
+            configuration.priority_reserve,
+        )
+        self.host        : str                       = configuration.host
+        self.port        : int                       = configuration.port
+        self.__batch_size   : int                        = max(0, configuration.batch_size)
+        self.__fragment_size: int                        = max(0, configuration.fragment_size)
+        self.__reassembler  : FragmentReassembler | None = None
+        self.__message_ids  : Iterator[int]              = itertools.count(random.getrandbits(32))
+        self.__transport    : asyncio.DatagramTransport  = None
+        self.__loop         : asyncio.AbstractEventLoop  = None
         self.set_transport_type("UDP")
+        if self.__fragment_size:
+            self.__enable_fragments()
+
+    # Fragments are binary frames. So accepting them, means accepting binary framing too.
+    # --------------------------------------------------------------------------------
+    def __enable_fragments(self):
+        self._binary_framing     = True
+        self._binary_framing_ack = encode_binary_framing_ack(available_encodings() + (CAPABILITY_FRAGMENTS,))
+        self.__reassembler       = FragmentReassembler(on_drop=lambda count: self.__count("dropped_messages", count))
+
+    # --------------------------------------------------------------------------------
+    def __count(self, name: str, value: int = 1):
+        if self._record_statistics:
+            self._statistics_keeper.increment(f"fragmentation.{self._transport_type}.{name}", value)
+
+    # --------------------------------------------------------------------------------
+    def __reassemble(self, payload: bytes, addr) -> bytes | None:
+        message = self.__reassembler.add(addr, payload)
+        if message is not None:
+            self.__count("reassembled_messages")
+        return message
+
+    # --------------------------------------------------------------------------------
+    def __fragment(self, response: bytes) -> List[bytes]:
+        if len(response) <= self.__fragment_size:
+            return [response]
+        self.__count("fragmented_responses")
+        return split_into_fragments(response, next(self.__message_ids) & 0xFFFFFFFF, self.__fragment_size)
 
     # --------------------------------------------------------------------------------
     async def __aenter__(self):
@@ -65,18 +175,75 @@ class UDPServer(ServerBase):
             self._logger.info(f"Stopping UDP server for {self.host}:{self.port}.")
 
     # --------------------------------------------------------------------------------
-    async def __process_received_data(self, received_data: str):
-        response_dict = await self._route_request(received_data)
-        return response_dict.model_dump_json()
+    async def __process_received_data(self, received_data: bytes, header: FrameHeader | None) -> bytes:
+        try:
+            if header is not None:
+                return await self._route_frame(received_data, header)
+            return JSON_CODEC.encode(await self._route_request(received_data))
+        finally:
+            self._release()
+
+    # --------------------------------------------------------------------------------
+    def __busy_received_data(self, received_data: bytes, header: FrameHeader | None) -> bytes:
+        if header is not None:
+            return self._busy_frame(received_data, header)
+        return JSON_CODEC.encode(self._busy_response(received_data))
+
+    # --------------------------------------------------------------------------------
+    def __create_protocol(self) -> DatagramProtocolServer:
+        return DatagramProtocolServer(
+            self.__process_received_data,
+            self._admit,
+            self.__busy_received_data,
+            self._binary_framing,
+            self._binary_framing_ack,
+            self.__reassemble if self.__reassembler is not None else None,
+            self.__fragment   if self.__reassembler is not None else None,
+        )
+
+    # --------------------------------------------------------------------------------
+    def __bind_socket(self) -> socket.socket:
+        family, _, _, _, address = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_DGRAM)[0]
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            if self._reuse_port:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.setblocking(False)
+            sock.bind(address)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    # Returns None where the event loop can't watch a socket for us. e.g. The Windows proactor.
+    # --------------------------------------------------------------------------------
+    def __create_batched_transport(self) -> BatchedDatagramTransport | None:
+        statistics_prefix = f"batching.{self._transport_type}" if self._record_statistics else None
+        sock              = self.__bind_socket()
+        transport         = BatchedDatagramTransport(sock, self.__create_protocol(), self.__batch_size, statistics_prefix)
+        try:
+            transport.start()
+        except NotImplementedError:
+            self._logger.warning("Batched UDP is not supported by this event loop. Using one callback per datagram.")
+            sock.close()
+            return None
+        self._logger.info(f"Batching up to [{self.__batch_size}] datagrams per read.")
+        return transport
 
     # --------------------------------------------------------------------------------
     async def __create_datagram_listener(self):
         self._logger.info(f"Serving UDP on [{self.host}:{self.port}]")
         self.__loop = asyncio.get_running_loop()
-        self.__transport, protocol = await self.__loop.create_datagram_endpoint(
-            lambda: DatagramProtocolServer(self.__process_received_data),
-            local_addr=(self.host, self.port)
-        )
+        if self.__batch_size > 0:
+            self.__transport = self.__create_batched_transport()
+        if self.__transport is None:
+            self.__transport, protocol = await self.__loop.create_datagram_endpoint(
+                self.__create_protocol,
+                local_addr=(self.host, self.port),
+                reuse_port=self._reuse_port
+            )
+        if self.__reassembler is not None:
+            enlarge_receive_buffer(self.__transport.get_extra_info("socket"))
 
         try:
             while self._running:
@@ -1,18 +1,51 @@
+import os
 import asyncio
 import socket
+import inspect
+import functools
 
 from ..stream_server_base import StreamServerBase
+from ..stream_protocol import StreamProtocolConnection
 
 from ...configuration.config_models import ConfigUDS
 
 # --------------------------------------------------------------------------------
 class UDSServer(StreamServerBase):
     def __init__(self, configuration : ConfigUDS):
-        super().__init__()
-        self.__server_path  : str  = f"{configuration.directory}/{configuration.socket_file_name}"
-        self.__uds_supported: bool = hasattr(socket, "AF_UNIX")
+        super().__init__(
+            configuration.max_in_flight,
+            configuration.binary_framing,
+            configuration.max_concurrent,
+            configuration.max_connections,
+            configuration.stream_engine,
+            configuration.compression_threshold,
+            configuration.priority_reserve,
+        )
+        self.__server_path  : str                  = f"{configuration.directory}/{configuration.socket_file_name}"
+        self.__uds_supported: bool                 = hasattr(socket, "AF_UNIX")
+        self.__shared_socket: socket.socket | None = None
         self.set_transport_type("UDS")
 
+    # In worker mode, the parent binds the socket before forking.
+    # All workers then accept connections on the same, inherited, socket.
+    # --------------------------------------------------------------------------------
+    def bind_shared_socket(self):
+        if not self.__uds_supported:
+            return
+        if os.path.exists(self.__server_path):
+            os.remove(self.__server_path)
+        self.__shared_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__shared_socket.bind(self.__server_path)
+        self.__shared_socket.listen(100)
+
+    # --------------------------------------------------------------------------------
+    def close_shared_socket(self):
+        if self.__shared_socket is not None:
+            self.__shared_socket.close()
+            self.__shared_socket = None
+            if os.path.exists(self.__server_path):
+                os.remove(self.__server_path)
+
     # --------------------------------------------------------------------------------
     async def __aenter__(self):
         if self.__uds_supported:
@@ -39,9 +72,25 @@ class UDSServer(StreamServerBase):
             self._logger.info(f"Stopping UDS server for {self.__server_path}.")
             self._server.close()
 
+    # --------------------------------------------------------------------------------
+    def __new_connection(self) -> StreamProtocolConnection:
+        return StreamProtocolConnection(self)
+
     # --------------------------------------------------------------------------------
     async def __setup_server(self):
-        self._server   = await asyncio.start_unix_server(self._handle_request, self.__server_path)
+        create_server = asyncio.get_running_loop().create_unix_server
+        if self._protocol_engine:
+            start_server = functools.partial(create_server, self.__new_connection)
+        else:
+            start_server = functools.partial(asyncio.start_unix_server, self._handle_request)
+
+        if self.__shared_socket is not None:
+            # The socket file belongs to the parent. A worker stopping must not remove it.
+            # Not every event loop knows about cleanup_socket. Those that don't, never remove it.
+            cleanup      = {"cleanup_socket": False} if "cleanup_socket" in inspect.signature(create_server).parameters else {}
+            self._server = await start_server(sock=self.__shared_socket, **cleanup)
+        else:
+            self._server = await start_server(self.__server_path)
         serving_address = self._server.sockets[0].getsockname()
         self._logger.info(f'Serving UDS on {serving_address}')
 
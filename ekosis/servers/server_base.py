@@ -1,77 +1,328 @@
-import json
+import asyncio
 import logging
 import timeit
 
-from pydantic import ValidationError
+from typing import Any, Callable, Tuple
 
-from ..data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
-from ..requests.request_router import RequestRouter, RoutingExceptionBase
+from pydantic import BaseModel as PydanticBaseModel, ValidationError
+
+from ..codecs import CodecBase, JSON_CODEC, find_codec, available_encodings
+from ..data_transfer_objects import RequestDTO, ResponseDTO, SpanKey, BATCH_ROUTE_KEY, BatchRequestDto, BatchResponseDto
+from ..exceptions import CodecException
+from ..framing import MessageType, FrameHeader, encode_frame, encode_frame_header, encode_binary_framing_ack, compress_payload
+from ..requests.request_router import RequestRouter, RoutingExceptionBase, DeadlineExceededRoutingException
 from ..requests.request_context import _set_current_span_key, _reset_current_span_key
+from ..requests.request_context import _set_current_deadline, _reset_current_deadline, _get_current_deadline
 from ..requests.status import Status
 from ..state_keepers.statistics_keeper import StatisticsKeeper
 
+# Only what is needed to tell the priority of a request, without validating the rest of it.
+# --------------------------------------------------------------------------------
+class _RouteKeyDto(PydanticBaseModel):
+    route_key: str
+
 # --------------------------------------------------------------------------------
 class ServerBase:
-    def __init__(self):
-        self._running          : bool             = False
-        self._logger           : logging.Logger   = logging.getLogger()
-        self._request_router   : RequestRouter    = RequestRouter()
-        self._statistics_keeper: StatisticsKeeper = StatisticsKeeper()
-        self._transport_type   : str              = ""
+    def __init__(
+        self,
+        binary_framing       : bool = False,
+        max_concurrent       : int  = 0,
+        compression_threshold: int  = 0,
+        priority_reserve     : int  = 0,
+    ):
+        self._running              : bool             = False
+        self._binary_framing       : bool             = binary_framing or compression_threshold > 0 # Only frames can be compressed.
+        self._binary_framing_ack   : bytes            = encode_binary_framing_ack(available_encodings())
+        self._logger               : logging.Logger   = logging.getLogger()
+        self._request_router       : RequestRouter    = RequestRouter()
+        self._statistics_keeper    : StatisticsKeeper = StatisticsKeeper()
+        self._transport_type       : str              = ""
+        self._reuse_port           : bool             = False
+        self._record_statistics    : bool             = True
+        self._max_concurrent       : int              = max(0, max_concurrent) # 0 means no limit.
+        self._concurrent           : int              = 0
+        self._compression_threshold: int              = max(0, compression_threshold) # 0 means never compress.
+        self._priority_reserve     : int              = max(0, priority_reserve) # On top of max_concurrent, for priority routes only.
 
     # --------------------------------------------------------------------------------
     def set_transport_type(self, transport_type: str):
         self._transport_type = transport_type
 
+    # In worker mode, every worker binds the same address. The kernel spreads the load.
+    # --------------------------------------------------------------------------------
+    def enable_reuse_port(self):
+        self._reuse_port = True
+
+    # For servers that only receive requests already counted somewhere else.
+    # --------------------------------------------------------------------------------
+    def disable_statistics(self):
+        self._record_statistics = False
+
     # --------------------------------------------------------------------------------
     def get_transport_type(self) -> str:
         return self._transport_type
 
+    # Admission is checked before any work is done on a request, or a task is created for it.
+    # Every request admitted, has to be released again once its response has been built.
+    #
+    # Once at max_concurrent, there is still room for priority_reserve more requests, as long
+    # as they are for priority routes. Only then is the route key of a request looked at. So
+    # below the limit, admission costs nothing more than it did.
+    # --------------------------------------------------------------------------------
+    def _admit(self, request_data: bytes | str = None, header: FrameHeader | None = None) -> bool:
+        return self.__admit(lambda: request_data is not None and self.__is_priority_request(request_data, header))
+
     # --------------------------------------------------------------------------------
-    async def _route_request(self, request_text: str) -> ResponseDTO:
+    def __admit(self, is_priority: Callable[[], bool]) -> bool:
+        if self._max_concurrent and self._concurrent >= self._max_concurrent:
+            if self._concurrent >= self._max_concurrent + self._priority_reserve:
+                return False
+            if not is_priority():
+                return False
+            if self._record_statistics:
+                self._statistics_keeper.increment(f"admission.{self._transport_type}.priority_requests")
+        self._concurrent += 1
+        return True
+
+    # --------------------------------------------------------------------------------
+    def __is_priority_request(self, request_data: bytes | str, header: FrameHeader | None) -> bool:
+        codec = JSON_CODEC if header is None else find_codec(header.encoding)
+        if codec is None:
+            return False
+        try:
+            return self._request_router.is_priority_route(codec.decode(request_data, _RouteKeyDto).route_key)
+        except (CodecException, ValidationError):
+            return False
+
+    # --------------------------------------------------------------------------------
+    def _release(self):
+        self._concurrent -= 1
+
+    # Only the span_key is of interest here. Anything that can't be decoded, gets a response without one.
+    # --------------------------------------------------------------------------------
+    def _busy_response(self, request_data: bytes | str, codec: CodecBase = JSON_CODEC, reason: str = None) -> ResponseDTO:
         span_key: SpanKey = None
         try:
-            start_time   = timeit.default_timer()
-            request_dict = json.loads(request_text.strip())
-            protocol_dto = RequestDTO(**request_dict)
-            span_key     = protocol_dto.span_key
-            token        = _set_current_span_key(span_key)
+            span_key = codec.decode(request_data, RequestDTO).span_key
+        except (CodecException, ValidationError):
+            pass
+        return self.__busy_response(span_key, reason)
+
+    # --------------------------------------------------------------------------------
+    def __busy_response(self, span_key: SpanKey | None, reason: str = None) -> ResponseDTO:
+        if self._record_statistics:
+            self._statistics_keeper.increment(f"admission.{self._transport_type}.rejected_requests")
+        return ResponseDTO(
+            span_key = span_key,
+            status   = Status.APPLICATION_BUSY.value,
+            data     = reason or f"{self._transport_type} server is at its limit of [{self._max_concurrent}] concurrent requests."
+        )
+
+    # Requests are decoded straight into the DTO of the route they are for, when
+    # possible. Anything that does not fit, is decoded again as a plain RequestDTO.
+    # That way, errors are reported exactly the same, no matter which way we went.
+    # --------------------------------------------------------------------------------
+    def __decode_request(self, request_data: bytes | str, codec: CodecBase) -> RequestDTO:
+        typed_adapter = self._request_router.get_typed_request_adapter()
+        if typed_adapter is not None:
+            try:
+                return codec.decode_adapted(request_data, typed_adapter)
+            except ValidationError:
+                pass
+        return codec.decode(request_data, RequestDTO)
+
+    # Sub-requests of a batch arrive already decoded. They are validated the same two ways.
+    # --------------------------------------------------------------------------------
+    def __validate_request(self, request: Any) -> RequestDTO:
+        typed_adapter = self._request_router.get_typed_request_adapter()
+        if typed_adapter is not None:
             try:
-                request      = {
-                    "span_key"    : span_key,
-                    "protocol_dto": protocol_dto,
-                }
-                response     = await self._request_router.route_request(**request)
-                end_time     = timeit.default_timer() - start_time
+                return typed_adapter.validate_python(request)
+            except ValidationError:
+                pass
+        return RequestDTO.model_validate(request)
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __error_response(span_key: SpanKey | None, e: Exception) -> ResponseDTO:
+        if isinstance(e, CodecException):
+            return ResponseDTO(span_key = span_key, status = Status.PROTOCOL_PARSING_ERROR.value, data = str(e))
+        if isinstance(e, ValidationError):
+            return ResponseDTO(span_key = span_key, status = Status.PYDANTIC_VALIDATION_ERROR.value, data = str(e))
+        if isinstance(e, RoutingExceptionBase):
+            return ResponseDTO(span_key = span_key, status = e.status, data = e.message)
+        return ResponseDTO(span_key = span_key, status = Status.UNHANDLED.value, data = str(e))
+
+    # --------------------------------------------------------------------------------
+    async def _route_request(self, request_data: bytes | str, codec: CodecBase = JSON_CODEC) -> ResponseDTO:
+        start_time = timeit.default_timer()
+        try:
+            protocol_dto = self.__decode_request(request_data, codec)
+        except Exception as e:
+            return self.__error_response(None, e)
+        if protocol_dto.route_key == BATCH_ROUTE_KEY:
+            return await self.__route_batch(protocol_dto)
+        return await self.__route_decoded_request(protocol_dto, start_time)
+
+    # The deadline of a request, as a loop.time(). Sub-requests of a batch, can't have more time than the batch has.
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __local_deadline(protocol_dto: RequestDTO) -> float | None:
+        inherited = _get_current_deadline()
+        if protocol_dto.deadline is None:
+            return inherited
+        deadline  = asyncio.get_running_loop().time() + protocol_dto.deadline
+        return deadline if inherited is None else min(deadline, inherited)
+
+    # --------------------------------------------------------------------------------
+    def __count_deadline_exceeded(self, statistic: str):
+        if self._record_statistics:
+            self._statistics_keeper.increment(f"deadlines.{self._transport_type}.{statistic}")
+
+    # A request whose deadline has passed, is not started on. One that is still being handled
+    # when it passes, is cancelled. Nobody is waiting for its response anymore. Unless its
+    # handler is not to be stopped halfway. That one is left to finish.
+    # --------------------------------------------------------------------------------
+    async def __route_before_deadline(self, request: dict, deadline: float) -> Any:
+        route_key = request["protocol_dto"].route_key
+        if asyncio.get_running_loop().time() >= deadline:
+            self.__count_deadline_exceeded("expired_requests")
+            raise DeadlineExceededRoutingException(route_key)
+        if not self._request_router.is_cancellable_route(route_key):
+            return await self._request_router.route_request(**request)
+        timeout   = asyncio.timeout_at(deadline)
+        try:
+            async with timeout:
+                return await self._request_router.route_request(**request)
+        except TimeoutError:
+            if not timeout.expired(): # Raised by the handler itself.
+                raise
+            self.__count_deadline_exceeded("cancelled_requests")
+            raise DeadlineExceededRoutingException(route_key)
+
+    # Whatever the handler sends on, inherits the span_key and deadline of its request.
+    # --------------------------------------------------------------------------------
+    async def __route_decoded_request(self, protocol_dto: RequestDTO, start_time: float) -> ResponseDTO:
+        span_key       = protocol_dto.span_key
+        deadline       = self.__local_deadline(protocol_dto)
+        token          = _set_current_span_key(span_key)
+        deadline_token = _set_current_deadline(deadline)
+        try:
+            request      = {
+                "span_key"    : span_key,
+                "protocol_dto": protocol_dto,
+            }
+            if deadline is None:
+                response = await self._request_router.route_request(**request)
+            else:
+                response = await self.__route_before_deadline(request, deadline)
+            end_time     = timeit.default_timer() - start_time
+            if self._record_statistics:
                 self._statistics_keeper.add_endpoint_stats(protocol_dto.route_key, end_time)
-                return ResponseDTO(
-                    span_key = span_key,
-                    status   = Status.SUCCESS.value,
-                    data     = response
-                )
-            finally:
-                _reset_current_span_key(token)
-        except json.decoder.JSONDecodeError as e:
-            return ResponseDTO(
-                span_key = span_key,
-                status   = Status.PROTOCOL_PARSING_ERROR.value,
-                data     = str(e)
-            )
-        except ValidationError as e:
-            return ResponseDTO(
-                span_key = span_key,
-                status   = Status.PYDANTIC_VALIDATION_ERROR.value,
-                data     = str(e)
-            )
-        except RoutingExceptionBase as e:
             return ResponseDTO(
                 span_key = span_key,
-                status   = e.status,
-                data     = e.message
+                status   = Status.SUCCESS.value,
+                data     = response
             )
         except Exception as e:
-            return ResponseDTO(
-                span_key = span_key,
-                status   = Status.UNHANDLED.value,
-                data     = str(e)
-            )
+            return self.__error_response(span_key, e)
+        finally:
+            _reset_current_deadline(deadline_token)
+            _reset_current_span_key(token)
+
+    # With admit, the request needs a slot of its own. Without, it runs in the one the batch was admitted in.
+    # --------------------------------------------------------------------------------
+    async def __route_batched_request(self, request: Any, admit: bool = False) -> ResponseDTO:
+        start_time = timeit.default_timer()
+        try:
+            protocol_dto = self.__validate_request(request)
+        except ValidationError as e:
+            return self.__error_response(None, e)
+        if not admit:
+            return await self.__route_decoded_request(protocol_dto, start_time)
+        if not self.__admit(lambda: self._request_router.is_priority_route(protocol_dto.route_key)):
+            return self.__busy_response(protocol_dto.span_key)
+        try:
+            return await self.__route_decoded_request(protocol_dto, start_time)
+        finally:
+            self._release()
+
+    # Every request in a batch gets a response of its own, in the same order. The batch
+    # itself only fails, when it can't be unpacked. Batches within a batch are not routed.
+    #
+    # An ordered batch only ever runs one request at a time, in the slot it was admitted
+    # in. An unordered one runs them all at once. There, the first request takes the
+    # batch's slot, and every other one is admitted on its own. Those there is no room
+    # for, are answered with APPLICATION_BUSY. So a batch can't get past max_concurrent.
+    # --------------------------------------------------------------------------------
+    async def __route_batch(self, protocol_dto: RequestDTO) -> ResponseDTO:
+        try:
+            batch = BatchRequestDto.model_validate(protocol_dto.data)
+        except ValidationError as e:
+            return self.__error_response(protocol_dto.span_key, e)
+
+        token = _set_current_deadline(self.__local_deadline(protocol_dto)) # Copied into the tasks gather creates.
+        try:
+            if batch.ordered:
+                responses = [await self.__route_batched_request(request) for request in batch.requests]
+            else:
+                responses = await asyncio.gather(*[
+                    self.__route_batched_request(request, admit=index > 0) for index, request in enumerate(batch.requests)
+                ])
+        finally:
+            _reset_current_deadline(token)
+        if self._record_statistics:
+            self._statistics_keeper.increment(f"batches.{self._transport_type}.received_batches")
+            self._statistics_keeper.increment(f"batches.{self._transport_type}.batched_requests", len(responses))
+        return ResponseDTO(
+            span_key = protocol_dto.span_key,
+            status   = Status.SUCCESS.value,
+            data     = BatchResponseDto(responses=responses)
+        )
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __unsupported_encoding_frame(header: FrameHeader) -> bytes:
+        response = ResponseDTO(
+            status = Status.PROTOCOL_PARSING_ERROR.value,
+            data   = f"Unsupported payload encoding [{header.encoding}]."
+        )
+        return encode_frame(MessageType.RESPONSE.value, JSON_CODEC.encode(response))
+
+    # Only responses to clients that said they can decompress them, and only when that's worth it.
+    # --------------------------------------------------------------------------------
+    def __compress(self, response: bytes, request_flags: int) -> Tuple[int, bytes]:
+        if not self._compression_threshold or len(response) < self._compression_threshold:
+            return 0, response
+        flags, compressed = compress_payload(response, request_flags)
+        if flags and self._record_statistics:
+            self._statistics_keeper.increment(f"compression.{self._transport_type}.compressed_responses")
+            self._statistics_keeper.increment(f"compression.{self._transport_type}.bytes_saved", len(response) - len(compressed))
+        return flags, compressed
+
+    # Frames are answered with the encoding they were sent in. The frame header and
+    # the payload are kept apart, for writers that can send them without joining them.
+    # --------------------------------------------------------------------------------
+    async def _route_frame_parts(self, payload: bytes, header: FrameHeader) -> Tuple[bytes, ...]:
+        codec = find_codec(header.encoding)
+        if codec is None:
+            return (self.__unsupported_encoding_frame(header),)
+        response        = codec.encode(await self._route_request(payload, codec))
+        flags, response = self.__compress(response, header.flags)
+        return encode_frame_header(MessageType.RESPONSE.value, len(response), flags, header.encoding), response
+
+    # --------------------------------------------------------------------------------
+    async def _route_frame(self, payload: bytes, header: FrameHeader) -> bytes:
+        return b''.join(await self._route_frame_parts(payload, header))
+
+    # --------------------------------------------------------------------------------
+    def _busy_frame_parts(self, payload: bytes, header: FrameHeader, reason: str = None) -> Tuple[bytes, ...]:
+        codec = find_codec(header.encoding)
+        if codec is None:
+            return (self.__unsupported_encoding_frame(header),)
+        response = codec.encode(self._busy_response(payload, codec, reason))
+        return encode_frame_header(MessageType.RESPONSE.value, len(response), encoding=header.encoding), response
+
+    # --------------------------------------------------------------------------------
+    def _busy_frame(self, payload: bytes, header: FrameHeader, reason: str = None) -> bytes:
+        return b''.join(self._busy_frame_parts(payload, header, reason))
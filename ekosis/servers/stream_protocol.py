@@ -0,0 +1,160 @@
+import asyncio
+
+from collections import deque
+from typing import Deque, Set, Tuple
+
+from .stream_server_base import StreamServerBase, MessageParts, REJECTED_CONNECTION_TIMEOUT
+
+from ..framing import FrameHeader, StreamMessageParser
+from ..exceptions import FramingException
+
+# Messages received, but not started on yet, because the connection is at its max_in_flight.
+# Once there are this many, we stop reading from the connection, until they are worked off.
+MAX_QUEUED_MESSAGES: int = 64
+
+# --------------------------------------------------------------------------------
+# One connection of a stream server, with the "protocol" stream engine. Bytes are
+# handed to us by the event loop as they arrive, and split into messages by a
+# parser of our own. Responses go straight to the transport. So there is no
+# StreamReader or StreamWriter, and no coroutine, between a message and its route.
+#
+# It behaves the same as the "streams" engine does:
+#   - At most max_in_flight requests per connection are processed at the same time.
+#     Everything after them waits its turn. With max_in_flight at 1, responses go
+#     out in the order the requests came in.
+#   - Requests the server has no room for, are answered with APPLICATION_BUSY.
+#   - A connection over max_connections, gets its first request answered with
+#     APPLICATION_BUSY, and is then closed.
+# --------------------------------------------------------------------------------
+class StreamProtocolConnection(asyncio.Protocol):
+    def __init__(self, server: StreamServerBase):
+        self.__server         : StreamServerBase                        = server
+        self.__parser         : StreamMessageParser                     = StreamMessageParser(server._binary_framing)
+        self.__transport      : asyncio.Transport                       = None
+        self.__queue          : Deque[Tuple[bytes, FrameHeader | None]] = deque()
+        self.__tasks          : Set[asyncio.Task]                       = set()
+        self.__in_flight      : int                                     = 0
+        self.__reading_paused : bool                                    = False
+        self.__writing_paused : bool                                    = False
+        self.__eof_received   : bool                                    = False
+        self.__counted        : bool                                    = False
+        self.__rejected_reason: str | None                              = None
+        self.__reject_timer   : asyncio.TimerHandle | None              = None
+
+    # --------------------------------------------------------------------------------
+    def connection_made(self, transport: asyncio.Transport):
+        self.__transport = transport
+        server           = self.__server
+        if not server._running:
+            transport.close()
+        elif server._max_connections and server._connections >= server._max_connections:
+            self.__rejected_reason = server._reject_connection_reason()
+            self.__reject_timer    = asyncio.get_running_loop().call_later(REJECTED_CONNECTION_TIMEOUT, transport.close)
+        else:
+            server._connections += 1
+            self.__counted       = True
+
+    # --------------------------------------------------------------------------------
+    def connection_lost(self, exc: Exception | None):
+        if self.__counted:
+            self.__server._connections -= 1
+            self.__counted = False
+        if self.__reject_timer is not None:
+            self.__reject_timer.cancel()
+        self.__queue.clear()
+
+    # --------------------------------------------------------------------------------
+    def data_received(self, data: bytes):
+        try:
+            self.__queue.extend(self.__parser.feed(data))
+        except FramingException as e:
+            self.__close(e)
+            return
+        self.__dispatch()
+
+    # Whatever is still queued or in flight, gets its response before the connection is closed.
+    # --------------------------------------------------------------------------------
+    def eof_received(self) -> bool:
+        self.__eof_received = True
+        return bool(self.__queue) or self.__in_flight > 0
+
+    # --------------------------------------------------------------------------------
+    def pause_writing(self):
+        self.__writing_paused = True
+
+    # --------------------------------------------------------------------------------
+    def resume_writing(self):
+        self.__writing_paused = False
+        self.__dispatch()
+
+    # --------------------------------------------------------------------------------
+    def __close(self, e: Exception):
+        self.__server._logger.warning(f"Closing connection: {e}")
+        self.__queue.clear()
+        self.__transport.close()
+
+    # --------------------------------------------------------------------------------
+    def __write(self, parts: MessageParts):
+        if not self.__transport.is_closing():
+            self.__transport.writelines(parts)
+
+    # --------------------------------------------------------------------------------
+    def __answer_rejected(self, bytes_read: bytes, header: FrameHeader | None):
+        server = self.__server
+        if server._is_enquiry(bytes_read, header):
+            self.__write(server._enquiry_response(bytes_read))
+            return
+        self.__queue.clear()
+        self.__write(server._busy_message(bytes_read, header, self.__rejected_reason))
+        self.__transport.close()
+
+    # --------------------------------------------------------------------------------
+    def __start(self, bytes_read: bytes, header: FrameHeader | None):
+        server = self.__server
+        if self.__rejected_reason is not None:
+            self.__answer_rejected(bytes_read, header)
+        elif server._is_enquiry(bytes_read, header):
+            self.__write(server._enquiry_response(bytes_read))
+        elif not server._admit(bytes_read, header):
+            self.__write(server._busy_message(bytes_read, header))
+        else:
+            self.__in_flight += 1
+            task = asyncio.get_running_loop().create_task(self.__process(bytes_read, header))
+            self.__tasks.add(task) # The event loop only keeps a weak reference to tasks.
+            task.add_done_callback(self.__tasks.discard)
+
+    # Takes on as many of the queued messages, as there is room for.
+    # --------------------------------------------------------------------------------
+    def __dispatch(self):
+        try:
+            while (
+                self.__queue and
+                not self.__writing_paused and
+                self.__in_flight < self.__server._max_in_flight and
+                not self.__transport.is_closing()
+            ):
+                self.__start(*self.__queue.popleft())
+        except FramingException as e:
+            self.__close(e)
+            return
+
+        if self.__transport.is_closing():
+            return
+        if len(self.__queue) >= MAX_QUEUED_MESSAGES and not self.__reading_paused:
+            self.__reading_paused = True
+            self.__transport.pause_reading()
+        elif len(self.__queue) < MAX_QUEUED_MESSAGES and self.__reading_paused:
+            self.__reading_paused = False
+            self.__transport.resume_reading()
+        if self.__eof_received and not self.__queue and self.__in_flight == 0:
+            self.__transport.close()
+
+    # --------------------------------------------------------------------------------
+    async def __process(self, bytes_read: bytes, header: FrameHeader | None):
+        try:
+            self.__write(await self.__server._process_admitted_message(bytes_read, header))
+        except FramingException as e:
+            self.__close(e)
+        finally:
+            self.__in_flight -= 1
+            self.__dispatch()
@@ -1,46 +1,265 @@
 import asyncio
 
+from typing import Set, Tuple
+
 from .server_base import ServerBase
 
+from ..codecs import JSON_CODEC
+from ..framing import (
+    MessageType,
+    FrameHeader,
+    BINARY_FRAMING_ENQ,
+    read_message,
+)
+from ..exceptions import FramingException
+
+# How long a connection over the limit gets, to send the request it will be told is rejected.
+REJECTED_CONNECTION_TIMEOUT: float = 1
+
+# Responses are only drained, once this much is waiting to be sent on a connection.
+# Below it, the transport sends them as it can, without us waiting on it for every response.
+WRITE_HIGH_WATER_MARK: int = 64 * 1024
+
+# A response, in the parts it was encoded in. e.g. A payload and its line feed, or a
+# frame header and its payload. They are written as they are, without being joined first.
+MessageParts = Tuple[bytes, ...]
+
+# How connections are handled. See: get_stream_engine in the configuration.
+STREAM_ENGINE_STREAMS : str = "streams"
+STREAM_ENGINE_PROTOCOL: str = "protocol"
+
 # --------------------------------------------------------------------------------
 class StreamServerBase(ServerBase):
-    def __init__(self):
-        super().__init__()
-        self._server       : asyncio.Server = None
+    def __init__(
+        self,
+        max_in_flight        : int  = 1,
+        binary_framing       : bool = False,
+        max_concurrent       : int  = 0,
+        max_connections      : int  = 0,
+        stream_engine        : str  = STREAM_ENGINE_STREAMS,
+        compression_threshold: int  = 0,
+        priority_reserve     : int  = 0,
+    ):
+        super().__init__(binary_framing, max_concurrent, compression_threshold, priority_reserve)
+        self._server         : asyncio.Server = None
+        self._max_in_flight  : int            = max(1, max_in_flight)
+        self._max_connections: int            = max(0, max_connections) # 0 means no limit.
+        self._connections    : int            = 0
+        self._protocol_engine: bool           = self.__is_protocol_engine(stream_engine)
         self.__ENQ_byte    : int            =  5 # Decimal  5 = Ascii ENQ (enquiry) character
         self.__ACK_byte    : int            =  6 # Decimal  6 = Ascii ACK (acknowledge) character
         self.__LF_byte     : int            = 10 # Decimal 10 = Ascii LF (line feed) character = '\n'
         self.__ACK_response: bytes          = bytes([self.__ACK_byte, self.__LF_byte])
+        self.__LF_delimiter: bytes          = bytes([self.__LF_byte])
+
+    # --------------------------------------------------------------------------------
+    def __is_protocol_engine(self, stream_engine: str) -> bool:
+        stream_engine = stream_engine.strip().lower()
+        if stream_engine not in (STREAM_ENGINE_STREAMS, STREAM_ENGINE_PROTOCOL):
+            self._logger.warning(f"Unknown stream engine [{stream_engine}]. Using [{STREAM_ENGINE_STREAMS}] instead.")
+        return stream_engine == STREAM_ENGINE_PROTOCOL
+
+    # --------------------------------------------------------------------------------
+    async def __write_data(self, writer: asyncio.StreamWriter, parts: MessageParts):
+        writer.writelines(parts)
+        if writer.transport.get_write_buffer_size() >= WRITE_HIGH_WATER_MARK:
+            await writer.drain()
+
+    # --------------------------------------------------------------------------------
+    def __is_complete_line(self, bytes_read: bytes) -> bool:
+        # Take note: An incomplete read due to EOF is treated as a client disconnect,
+        # So we check if the last byte read is '\n' i.e. Decimal 10/Ascii symbol: LF
+        return bool(bytes_read) and bytes_read[-1] == self.__LF_byte
+
+    # Returns what was read, and the frame header if it was a binary frame.
+    # Nothing read, means the client closed the connection.
+    # --------------------------------------------------------------------------------
+    async def __read_message(self, reader: asyncio.StreamReader) -> Tuple[bytes, FrameHeader | None]:
+        if not self._binary_framing: # Only newline delimited messages are possible.
+            bytes_read = await reader.readline()
+        else:
+            bytes_read, header = await read_message(reader)
+            if header is not None:
+                return bytes_read, header
+
+        if not self.__is_complete_line(bytes_read):
+            return b'', None
+        return bytes_read, None
+
+    # --------------------------------------------------------------------------------
+    def _is_enquiry(self, bytes_read: bytes, header: FrameHeader | None) -> bool:
+        return header is None and bytes_read[0] == self.__ENQ_byte
+
+    # The client is asking if we are still connected, and might be asking for binary framing.
+    # --------------------------------------------------------------------------------
+    def _enquiry_response(self, bytes_read: bytes) -> MessageParts:
+        if self._binary_framing and bytes_read == BINARY_FRAMING_ENQ:
+            return (self._binary_framing_ack,)
+        return (self.__ACK_response,)
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def __check_frame_type(header: FrameHeader):
+        if header.message_type != MessageType.REQUEST.value:
+            raise FramingException(f"Unexpected frame message type [{header.message_type}].")
+
+    # Responses go back the same way the request came in.
+    # --------------------------------------------------------------------------------
+    async def __process_message(self, bytes_read: bytes, header: FrameHeader | None) -> MessageParts:
+        if header is None:
+            return JSON_CODEC.encode(await self._route_request(bytes_read)), self.__LF_delimiter
+
+        self.__check_frame_type(header)
+        return await self._route_frame_parts(bytes_read, header)
+
+    # Only called for requests that were admitted.
+    # --------------------------------------------------------------------------------
+    async def _process_admitted_message(self, bytes_read: bytes, header: FrameHeader | None) -> MessageParts:
+        try:
+            return await self.__process_message(bytes_read, header)
+        finally:
+            self._release()
+
+    # --------------------------------------------------------------------------------
+    def _busy_message(self, bytes_read: bytes, header: FrameHeader | None, reason: str = None) -> MessageParts:
+        if header is None:
+            return JSON_CODEC.encode(self._busy_response(bytes_read, reason=reason)), self.__LF_delimiter
+
+        self.__check_frame_type(header)
+        return self._busy_frame_parts(bytes_read, header, reason)
 
     # --------------------------------------------------------------------------------
-    async def __write_data(self, writer: asyncio.StreamWriter, data: bytes):
-        writer.write(data)
-        await writer.drain()
+    async def __answer_rejected_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, reason: str) -> None:
+        while True:
+            bytes_read, header = await self.__read_message(reader)
+            if not bytes_read and header is None:
+                return
+            if self._is_enquiry(bytes_read, header):
+                await self.__write_data(writer, self._enquiry_response(bytes_read))
+            else:
+                await self.__write_data(writer, self._busy_message(bytes_read, header, reason))
+                return
+
+    # --------------------------------------------------------------------------------
+    def _reject_connection_reason(self) -> str:
+        if self._record_statistics:
+            self._statistics_keeper.increment(f"admission.{self._transport_type}.rejected_connections")
+        return f"{self._transport_type} server is at its limit of [{self._max_connections}] connections."
+
+    # A connection over the limit, still gets to ask if we are here, and to negotiate
+    # binary framing. Its first request is then answered with APPLICATION_BUSY, and
+    # the connection closed. That way clients get a retryable error, not a broken connection.
+    # --------------------------------------------------------------------------------
+    async def __reject_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        reason = self._reject_connection_reason()
+        try:
+            await asyncio.wait_for(self.__answer_rejected_connection(reader, writer, reason), REJECTED_CONNECTION_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionResetError, FramingException):
+            pass
+        writer.close()
 
     # TODO: Check client against white-list!
     # --------------------------------------------------------------------------------
     async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         if not self._running:
             return
+        if self._max_connections and self._connections >= self._max_connections:
+            await self.__reject_connection(reader, writer)
+            return
+        self._connections += 1
+        try:
+            if self._max_in_flight > 1:
+                await self.__handle_pipelined(reader, writer)
+            else:
+                await self.__handle_sequential(reader, writer)
+        except FramingException as e:
+            self._logger.warning(f"Closing connection: {e}")
+        finally:
+            self._connections -= 1
+        writer.close()
+
+    # One request at a time: read, process, respond, and only then read the next.
+    # --------------------------------------------------------------------------------
+    async def __handle_sequential(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         while True: # We keep the connection open.
             try:
-                bytes_read = await reader.readline()
+                bytes_read, header = await self.__read_message(reader)
 
                 # Check if the client closed the connection.
-                # Take note: An incomplete read due to EOF is treated as a client disconnect,
-                # So we check if the last byte read is '\n' i.e. Decimal 10/Ascii symbol: LF
-                if not bytes_read or bytes_read[-1] != self.__LF_byte:
+                if not bytes_read and header is None:
                     break
 
-                if bytes_read[0] == self.__ENQ_byte: # The client is asking if we are still connected.
-                    await self.__write_data(writer, self.__ACK_response)
+                if self._is_enquiry(bytes_read, header):
+                    await self.__write_data(writer, self._enquiry_response(bytes_read))
+                elif not self._admit(bytes_read, header):
+                    await self.__write_data(writer, self._busy_message(bytes_read, header))
                 else:
-                    response_dict = await self._route_request(bytes_read.decode())
-                    await self.__write_data(
-                        writer,
-                        (response_dict.model_dump_json() + '\n').encode()
-                    )
+                    await self.__write_data(writer, await self._process_admitted_message(bytes_read, header))
             except ConnectionResetError:
                 self._logger.info("Connection reset by peer")
                 break
-        writer.close()
+
+    # Pipelined: We keep reading requests off the connection while earlier ones
+    # are still being processed. At most _max_in_flight requests are processed
+    # concurrently per connection. Requests the server has no room for, are
+    # answered with APPLICATION_BUSY straight away, without creating a task.
+    # Responses are written in the order they complete, which is NOT necessarily
+    # the order they were received in. Clients match responses to requests using
+    # the span_key in the response.
+    # --------------------------------------------------------------------------------
+    async def __handle_pipelined(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock: asyncio.Lock      = asyncio.Lock()
+        in_flight : asyncio.Semaphore = asyncio.Semaphore(self._max_in_flight)
+        tasks     : Set[asyncio.Task] = set()
+        try:
+            while True:
+                try:
+                    bytes_read, header = await self.__read_message(reader)
+
+                    if not bytes_read and header is None:
+                        break
+
+                    if self._is_enquiry(bytes_read, header):
+                        async with write_lock:
+                            await self.__write_data(writer, self._enquiry_response(bytes_read))
+                        continue
+
+                    await in_flight.acquire()
+                    if not self._admit(bytes_read, header):
+                        in_flight.release()
+                        async with write_lock:
+                            await self.__write_data(writer, self._busy_message(bytes_read, header))
+                        continue
+
+                    task = asyncio.create_task(
+                        self.__process_pipelined(bytes_read, header, writer, write_lock, in_flight)
+                    )
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                except ConnectionResetError:
+                    self._logger.info("Connection reset by peer")
+                    break
+        finally:
+            if tasks: # Let whatever is still in flight finish, before the connection gets closed.
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    # --------------------------------------------------------------------------------
+    async def __process_pipelined(
+        self,
+        bytes_read: bytes,
+        header    : FrameHeader | None,
+        writer    : asyncio.StreamWriter,
+        write_lock: asyncio.Lock,
+        in_flight : asyncio.Semaphore,
+    ) -> None:
+        try:
+            response = await self._process_admitted_message(bytes_read, header)
+            async with write_lock:
+                await self.__write_data(writer, response)
+        except (ConnectionResetError, BrokenPipeError):
+            self._logger.info("Connection lost before response could be written")
+        except FramingException as e:
+            self._logger.warning(f"Closing connection: {e}")
+            writer.close()
+        finally:
+            in_flight.release()
@@ -0,0 +1,15 @@
+from pydantic import BaseModel as PydanticBaseModel
+
+from ..requests.endpoint import endpoint
+from ..state_keepers.buffered_sender_keeper import BufferedSenderKeeper
+from ..data_transfer_objects import WorkerBufferedSendRequestDto, EmptyDto
+from ..exceptions.application_level import ApplicationProcessingException
+
+# Used by workers that are not worker 0, to have worker 0 queue their buffered sends.
+# --------------------------------------------------------------------------------
+@endpoint("eco.worker.buffered_sender.enqueue", WorkerBufferedSendRequestDto)
+async def eco_worker_buffered_sender_enqueue(dto: WorkerBufferedSendRequestDto, **kwargs) -> PydanticBaseModel:
+    buffered_sender_keeper = BufferedSenderKeeper()
+    if not await buffered_sender_keeper.enqueue(dto.route_key, dto.span_key, dto.data):
+        raise ApplicationProcessingException(f"No buffered sender with route key: [{dto.route_key}]")
+    return EmptyDto()
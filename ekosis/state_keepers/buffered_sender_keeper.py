@@ -19,6 +19,13 @@ class BufferedSenderKeeper(metaclass=SingletonType):
     def add_buffered_sender(self, buffered_sender: BufferedSenderClass):
         self.__buffered_senders[buffered_sender.get_route_key()] = buffered_sender
 
+    # --------------------------------------------------------------------------------
+    async def enqueue(self, route_key: str, span_key: SpanKey, data: Dict[str, Any]) -> bool:
+        if route_key not in self.__buffered_senders.keys():
+            return False
+        await self.__buffered_senders[route_key].enqueue_data(data, span_key)
+        return True
+
     # --------------------------------------------------------------------------------
     async def get_queue_information(self, route_key: str) -> Dict[str, Any] | None:
         if route_key not in self.__buffered_senders.keys():
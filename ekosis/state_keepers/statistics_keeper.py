@@ -4,15 +4,17 @@ import logging
 import statistics
 import time
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
 from ..util import SingletonType
 from ..queues import PaginatedQueue
 from ..configuration.config_models import AppConfiguration
+from .worker_context import WorkerContext
 
 # --------------------------------------------------------------------------------
 class StatisticsKeeper(metaclass=SingletonType):
     __config              : AppConfiguration          = AppConfiguration()
+    __worker_context      : WorkerContext             = WorkerContext()
     __running             : bool                      = False
     __logger              : logging.Logger            = logging.getLogger()
     __gather_period       : int                       = 300
@@ -22,6 +24,7 @@ class StatisticsKeeper(metaclass=SingletonType):
     __statistics_history  : List[Dict[str, Any]]      = []
     __persisted_queues    : Dict[str, PaginatedQueue] = {}
     __endpoint_durations  : Dict[str, List[float]]    = {}
+    __gathered_listener   : Callable[[Dict], None]    = None
 
     def __init__(self):
         pass
@@ -60,6 +63,8 @@ class StatisticsKeeper(metaclass=SingletonType):
         self.__statistics_current['application']             = {}
         self.__statistics_current['application']['name']     = self.__config.name
         self.__statistics_current['application']['instance'] = self.__config.instance
+        if self.__worker_context.is_worker_mode():
+            self.__statistics_current['application']['worker'] = self.__worker_context.get_index()
 
         endpoint_percentiles = await self.get_endpoint_percentiles()
         for key, percentiles in endpoint_percentiles.items():
@@ -82,6 +87,14 @@ class StatisticsKeeper(metaclass=SingletonType):
     async def get_full_gathered_statistics(self) -> List[Dict[str, Any]]:
         return self.__statistics_history
 
+    # In worker mode, gathered statistics are handed to the listener instead of being kept.
+    # The history is then set from the outside, once it has been merged with those of the other workers.
+    def set_gathered_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        StatisticsKeeper.__gathered_listener = listener
+
+    def set_gathered_statistics(self, history: List[Dict[str, Any]]):
+        StatisticsKeeper.__statistics_history = history
+
     def set_statistic_value(self, key: str, value: float):
         keys = key.split('.')
         self.__deep_set(self.__statistics_current, keys, value)
@@ -160,7 +173,10 @@ class StatisticsKeeper(metaclass=SingletonType):
             if self.__running:
                 self.__logger.info(f"Gathering statistics")
                 await self.__update_current_statistics()
-                self.__statistics_history.insert(0, copy.deepcopy(self.__statistics_current))
-                if len(self.__statistics_history) > self.__history_length:
-                    self.__statistics_history.pop()
+                if self.__gathered_listener is not None:
+                    self.__gathered_listener(copy.deepcopy(self.__statistics_current))
+                else:
+                    self.__statistics_history.insert(0, copy.deepcopy(self.__statistics_current))
+                    if len(self.__statistics_history) > self.__history_length:
+                        self.__statistics_history.pop()
                 await self.__reset_current_statistics()
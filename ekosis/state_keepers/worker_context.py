@@ -0,0 +1,43 @@
+from ..util import SingletonType
+
+# --------------------------------------------------------------------------------
+# Tells the code running in a process, which worker it is.
+#
+# Outside of worker mode, there is exactly one process, and it is worker 0.
+# Worker 0 is always the one that owns the buffered handlers and buffered senders.
+# Their SQLite backed queues can only be safely written by a single process, so
+# every other worker hands buffered work to worker 0, over a private UDS socket.
+# --------------------------------------------------------------------------------
+class WorkerContext(metaclass=SingletonType):
+    __index            : int = 0
+    __count            : int = 1
+    __owner_socket_path: str = ""
+
+    def __init__(self):
+        pass
+
+    # --------------------------------------------------------------------------------
+    def set_worker(self, index: int, count: int, owner_socket_path: str):
+        WorkerContext.__index             = index
+        WorkerContext.__count             = count
+        WorkerContext.__owner_socket_path = owner_socket_path
+
+    # --------------------------------------------------------------------------------
+    def get_index(self) -> int:
+        return self.__index
+
+    # --------------------------------------------------------------------------------
+    def get_count(self) -> int:
+        return self.__count
+
+    # --------------------------------------------------------------------------------
+    def get_owner_socket_path(self) -> str:
+        return self.__owner_socket_path
+
+    # --------------------------------------------------------------------------------
+    def is_worker_mode(self) -> bool:
+        return self.__count > 1
+
+    # --------------------------------------------------------------------------------
+    def owns_buffers(self) -> bool:
+        return self.__index == 0
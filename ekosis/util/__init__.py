@@ -1,2 +1,3 @@
 from .singleton import SingletonType
 from .singleton import SingletonBase
+from .event_loops import run_on_event_loop, available_event_loops, EVENT_LOOP_ASYNCIO, EVENT_LOOP_UVLOOP
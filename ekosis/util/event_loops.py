@@ -0,0 +1,41 @@
+import asyncio
+import logging
+
+from typing import Any, Callable, Coroutine
+
+log = logging.getLogger()
+
+EVENT_LOOP_ASYNCIO: str = "asyncio"
+EVENT_LOOP_UVLOOP : str = "uvloop"
+
+try:
+    import uvloop
+except ImportError: # pragma: no cover
+    uvloop = None
+
+# --------------------------------------------------------------------------------
+def available_event_loops() -> list[str]:
+    loops = [EVENT_LOOP_ASYNCIO]
+    if uvloop is not None:
+        loops.append(EVENT_LOOP_UVLOOP)
+    return loops
+
+# Anything that is not available here, falls back to the loop that comes with asyncio.
+# That way, a configuration shared between machines does not stop an application
+# from starting, on a machine where uvloop was never installed.
+# --------------------------------------------------------------------------------
+def get_event_loop_factory(event_loop: str) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    event_loop = event_loop.strip().lower()
+    if event_loop == EVENT_LOOP_UVLOOP:
+        if uvloop is not None:
+            return uvloop.new_event_loop
+        log.warning("Event loop [uvloop] is not installed. Using asyncio instead.")
+    elif event_loop != EVENT_LOOP_ASYNCIO:
+        log.warning(f"Event loop [{event_loop}] is unknown. Using asyncio instead.")
+    return None
+
+# The equivalent of asyncio.run, on the event loop asked for.
+# --------------------------------------------------------------------------------
+def run_on_event_loop(coroutine: Coroutine[Any, Any, Any], event_loop: str = EVENT_LOOP_ASYNCIO) -> Any:
+    with asyncio.Runner(loop_factory=get_event_loop_factory(event_loop)) as runner:
+        return runner.run(coroutine)
@@ -1,5 +1,7 @@
 import asyncio
 
+from contextvars import Context
+
 FIRE_AND_FORGET_TASKS = set()
 
 # --------------------------------------------------------------------------------
@@ -11,9 +13,9 @@ def fire_and_forget_task_for_loop(loop: asyncio.AbstractEventLoop, coroutine):
     return task
 
 # --------------------------------------------------------------------------------
-def fire_and_forget_task(coroutine):
+def fire_and_forget_task(coroutine, context: Context | None = None):
     global FIRE_AND_FORGET_TASKS
-    task = asyncio.create_task(coroutine)
+    task = asyncio.create_task(coroutine, context=context)
     FIRE_AND_FORGET_TASKS.add(task)
     # Should this rather be:
     # task.add_done_callback(lambda x: FIRE_AND_FORGET_TASKS.discard(x))
@@ -0,0 +1,4 @@
+from ..state_keepers.worker_context import WorkerContext
+from .worker_pool import WorkerPool
+from .buffer_owner import BufferOwnerForwarder, BUFFER_OWNER_ROUTE_PREFIXES, OWNER_MAX_IN_FLIGHT
+from .statistics_aggregator import WorkerStatisticsAggregator
@@ -0,0 +1,37 @@
+from typing import Any
+
+from ..clients import PersistedUDSClient
+from ..data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ..state_keepers.worker_context import WorkerContext
+from ..util import SingletonType
+
+# Route keys that work on the buffered queues, and so have to be run by worker 0.
+BUFFER_OWNER_ROUTE_PREFIXES = ("eco.buffered_handler.", "eco.buffered_sender.", "eco.worker.buffered_sender.")
+
+# Timeouts are not retried. A request that timed out, may still have been queued.
+OWNER_MAX_RETRIES   : int = 1
+OWNER_MAX_IN_FLIGHT : int = 64
+
+# --------------------------------------------------------------------------------
+class BufferOwnerForwarder(metaclass=SingletonType):
+    __client: PersistedUDSClient = None
+
+    def __init__(self):
+        pass
+
+    # The client is only created once it is needed. That way it is never shared
+    # between processes, or between event loops.
+    # --------------------------------------------------------------------------------
+    def __get_client(self) -> PersistedUDSClient:
+        if BufferOwnerForwarder.__client is None:
+            BufferOwnerForwarder.__client = PersistedUDSClient(
+                WorkerContext().get_owner_socket_path(),
+                max_retries = OWNER_MAX_RETRIES,
+                multiplexed = True,
+            )
+        return BufferOwnerForwarder.__client
+
+    # --------------------------------------------------------------------------------
+    async def forward(self, route_key: str, span_key: SpanKey, data: Any) -> ResponseDTO:
+        request = RequestDTO(route_key = route_key, span_key = span_key, data = data)
+        return await self.__get_client()._send_message_retry_loop(request, span_key)
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List
+
+# Values where adding up the numbers of the workers makes no sense. The highest one is kept instead.
+MAX_MERGED_KEYS = ("p95", "p99", "timestamp", "uptime", "gather_period")
+
+# --------------------------------------------------------------------------------
+class WorkerStatisticsAggregator:
+    def __init__(self, history_length: int):
+        self.__history_length: int                       = history_length
+        self.__history       : List[Dict[str, Any]]      = []
+        self.__pending       : Dict[int, Dict[str, Any]] = {}
+
+    # --------------------------------------------------------------------------------
+    def get_history(self) -> List[Dict[str, Any]]:
+        return self.__history
+
+    # Worker 0 reporting in, marks the end of a gather period. A worker that
+    # reports twice before that, means worker 0 is missing. So in both cases,
+    # whatever is pending gets merged. Nothing is counted twice, or dropped.
+    # Returns True when the history changed.
+    # --------------------------------------------------------------------------------
+    def add(self, index: int, statistics: Dict[str, Any]) -> bool:
+        merged = False
+        if index in self.__pending:
+            self.__merge_pending()
+            merged = True
+        self.__pending[index] = statistics
+        if index == 0:
+            self.__merge_pending()
+            merged = True
+        return merged
+
+    # --------------------------------------------------------------------------------
+    def __merge_pending(self):
+        if not self.__pending:
+            return
+        merged: Dict[str, Any] = {}
+        for index in sorted(self.__pending.keys()):
+            self.__merge(merged, self.__pending[index])
+
+        application = merged.setdefault("application", {})
+        application.pop("worker", None)
+        application["workers"] = len(self.__pending)
+        self.__pending = {}
+
+        self.__history.insert(0, merged)
+        if len(self.__history) > self.__history_length:
+            self.__history.pop()
+
+    # --------------------------------------------------------------------------------
+    def __merge(self, target: Dict[str, Any], source: Dict[str, Any]):
+        for key, value in source.items():
+            if isinstance(value, dict):
+                self.__merge(target.setdefault(key, {}), value)
+            elif key not in target:
+                target[key] = value
+            elif isinstance(value, (int, float)) and isinstance(target[key], (int, float)):
+                if key in MAX_MERGED_KEYS:
+                    target[key] = max(target[key], value)
+                else:
+                    target[key] += value
@@ -0,0 +1,59 @@
+import os
+import json
+import signal
+import socket
+import asyncio
+import logging
+
+from typing import Any, Dict
+
+from ..state_keepers.statistics_keeper import StatisticsKeeper
+
+# Statistics go back and forth as JSON lines. With many endpoints, those lines get long.
+STATISTICS_LINE_LIMIT: int = 16 * 1024 * 1024
+
+# --------------------------------------------------------------------------------
+# The worker side of the socket pair, shared with the parent process.
+#
+# Every set of statistics this worker gathers is sent to the parent. The parent
+# merges them with those of the other workers, and sends back the merged history.
+# That history is what "eco.statistics.get" hands out, no matter which worker answers.
+# --------------------------------------------------------------------------------
+class WorkerStatisticsChannel:
+    def __init__(self, channel: socket.socket):
+        self.__channel          : socket.socket        = channel
+        self.__writer           : asyncio.StreamWriter = None
+        self.__logger           : logging.Logger       = logging.getLogger()
+        self.__statistics_keeper: StatisticsKeeper     = StatisticsKeeper()
+
+    # --------------------------------------------------------------------------------
+    def __send_gathered(self, statistics: Dict[str, Any]):
+        if self.__writer is not None and not self.__writer.is_closing():
+            self.__writer.write(json.dumps(statistics, default=str).encode() + b'\n')
+
+    # A line that is too long, or is not JSON, is skipped. The next one is as good. Returns None once the parent is gone.
+    # --------------------------------------------------------------------------------
+    async def __read_statistics(self, reader: asyncio.StreamReader) -> Dict | None:
+        while True:
+            try:
+                line = await reader.readline()
+                return json.loads(line) if line else None
+            except ValueError as e: # json.JSONDecodeError is one too.
+                self.__logger.warning(f"Skipped statistics from the parent process. {e}")
+
+    # --------------------------------------------------------------------------------
+    async def serve(self):
+        reader, self.__writer = await asyncio.open_connection(sock=self.__channel, limit=STATISTICS_LINE_LIMIT)
+        self.__statistics_keeper.set_gathered_listener(self.__send_gathered)
+        try:
+            while (statistics := await self.__read_statistics(reader)) is not None:
+                self.__statistics_keeper.set_gathered_statistics(statistics)
+        except asyncio.exceptions.CancelledError:
+            return
+        finally:
+            self.__writer.close()
+
+        # Only the parent closes its end of the channel. Without a parent, nobody
+        # supervises us, so we shut down the same way we would on a signal.
+        self.__logger.info("Worker lost contact with its parent process. Shutting down.")
+        os.kill(os.getpid(), signal.SIGTERM)
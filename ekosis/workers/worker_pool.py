@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import signal
+import socket
+import logging
+import selectors
+import traceback
+
+from typing import Callable, Dict, List
+
+from .statistics_aggregator import WorkerStatisticsAggregator
+
+# --------------------------------------------------------------------------------
+class _Worker:
+    def __init__(self, index: int, process_id: int, channel: socket.socket):
+        self.index       : int           = index
+        self.process_id  : int           = process_id
+        self.channel     : socket.socket = channel
+        self.started     : float         = time.time()
+        self.buffer      : bytes         = b''
+        self.outgoing    : bytes         = b'' # What the channel did not take yet.
+        self.disconnected: bool          = False
+
+# --------------------------------------------------------------------------------
+# Forks worker processes, and keeps them running until told to stop.
+#
+# Each worker runs the full asyncio application. The parent does no request
+# handling of its own. It restarts workers that die, and merges the statistics
+# the workers send it over their socket pairs.
+# --------------------------------------------------------------------------------
+class WorkerPool:
+    def __init__(
+        self,
+        worker_count  : int,
+        run_worker    : Callable[[int, socket.socket], None],
+        history_length: int   = 12,
+        restart_delay : float = 1,
+        stop_timeout  : float = 10,
+    ):
+        self.__worker_count : int                                  = worker_count
+        self.__run_worker   : Callable[[int, socket.socket], None] = run_worker
+        self.__restart_delay: float                                = restart_delay
+        self.__stop_timeout : float                                = stop_timeout
+        self.__logger       : logging.Logger                       = logging.getLogger()
+        self.__running      : bool                                 = False
+        self.__selector     : selectors.BaseSelector               = selectors.DefaultSelector()
+        self.__workers      : Dict[int, _Worker]                   = {}
+        self.__restarts     : Dict[int, float]                     = {} # worker index -> time to restart at
+        self.__aggregator   : WorkerStatisticsAggregator           = WorkerStatisticsAggregator(history_length)
+
+    # --------------------------------------------------------------------------------
+    @staticmethod
+    def is_supported() -> bool:
+        return hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")
+
+    # --------------------------------------------------------------------------------
+    def __run_child(self, index: int, channel: socket.socket):
+        exit_code = 0
+        try:
+            self.__selector.close()
+            for worker in self.__workers.values():
+                worker.channel.close()
+            self.__run_worker(index, channel)
+        except BaseException: # pragma: no cover
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            os._exit(exit_code) # Never return into the code of the parent.
+
+    # --------------------------------------------------------------------------------
+    def __start_worker(self, index: int):
+        parent_channel, child_channel = socket.socketpair()
+        process_id = os.fork()
+        if process_id == 0:
+            parent_channel.close()
+            self.__run_child(index, child_channel)
+
+        child_channel.close()
+        parent_channel.setblocking(False)
+        worker = _Worker(index, process_id, parent_channel)
+        self.__workers[index] = worker
+        self.__selector.register(parent_channel, selectors.EVENT_READ, worker)
+        self.__logger.info(f"Started worker [{index}] with process id [{process_id}].")
+        if self.__aggregator.get_history():
+            self.__send(worker, self.__aggregator.get_history())
+
+    # --------------------------------------------------------------------------------
+    def __remove_worker(self, worker: _Worker):
+        if not worker.disconnected:
+            self.__selector.unregister(worker.channel)
+        worker.channel.close()
+        del self.__workers[worker.index]
+
+    # The process is reaped, and its channel closed, once it has exited.
+    # --------------------------------------------------------------------------------
+    def __disconnect(self, worker: _Worker):
+        if not worker.disconnected:
+            worker.disconnected = True
+            worker.outgoing     = b''
+            self.__selector.unregister(worker.channel)
+            self.__logger.warning(f"Lost the statistics channel of worker [{worker.index}].")
+
+    # A line that does not fit in the channel in one go, is finished once it becomes writable.
+    # --------------------------------------------------------------------------------
+    def __send(self, worker: _Worker, history: List):
+        if worker.disconnected:
+            return
+        worker.outgoing += json.dumps(history).encode() + b'\n'
+        self.__write_outgoing(worker)
+
+    # --------------------------------------------------------------------------------
+    def __write_outgoing(self, worker: _Worker):
+        try:
+            sent = worker.channel.send(worker.outgoing)
+        except BlockingIOError:
+            sent = 0
+        except (BrokenPipeError, ConnectionResetError):
+            self.__disconnect(worker)
+            return
+        worker.outgoing = worker.outgoing[sent:]
+        events          = selectors.EVENT_READ | selectors.EVENT_WRITE if worker.outgoing else selectors.EVENT_READ
+        self.__selector.modify(worker.channel, events, worker)
+
+    # --------------------------------------------------------------------------------
+    def __read_statistics(self, worker: _Worker):
+        try:
+            data = worker.channel.recv(65536)
+        except BlockingIOError:
+            return
+        except ConnectionResetError:
+            data = b''
+        if not data:
+            self.__disconnect(worker)
+            return
+        worker.buffer += data
+        lines         = worker.buffer.split(b'\n')
+        worker.buffer = lines.pop()
+        for line in lines:
+            if line and self.__aggregator.add(worker.index, json.loads(line)):
+                for receiver in self.__workers.values():
+                    self.__send(receiver, self.__aggregator.get_history())
+
+    # Workers that die quickly after being started, are restarted with a delay.
+    # That way a worker that can never start, does not have us fork as fast as we can.
+    # --------------------------------------------------------------------------------
+    def __reap_workers(self):
+        for worker in list(self.__workers.values()):
+            process_id, status = os.waitpid(worker.process_id, os.WNOHANG)
+            if process_id == 0:
+                continue
+            self.__remove_worker(worker)
+            self.__logger.warning(f"Worker [{worker.index}] with process id [{process_id}] exited with status [{status}].")
+            delay = self.__restart_delay if time.time() - worker.started < self.__restart_delay else 0
+            self.__restarts[worker.index] = time.time() + delay
+
+        for index, restart_at in list(self.__restarts.items()):
+            if restart_at <= time.time():
+                del self.__restarts[index]
+                self.__start_worker(index)
+
+    # --------------------------------------------------------------------------------
+    def start(self):
+        self.__running = True
+        for index in range(self.__worker_count):
+            self.__start_worker(index)
+
+        while self.__running:
+            for key, events in self.__selector.select(timeout=1):
+                if events & selectors.EVENT_WRITE:
+                    self.__write_outgoing(key.data)
+                if events & selectors.EVENT_READ and not key.data.disconnected:
+                    self.__read_statistics(key.data)
+            self.__reap_workers()
+
+    # --------------------------------------------------------------------------------
+    def __signal_workers(self, signal_number: int):
+        for worker in self.__workers.values():
+            try:
+                os.kill(worker.process_id, signal_number)
+            except ProcessLookupError:
+                pass
+
+    # --------------------------------------------------------------------------------
+    def stop(self):
+        self.__running  = False
+        self.__restarts = {}
+        self.__logger.info(f"Stopping [{len(self.__workers)}] workers.")
+        self.__signal_workers(signal.SIGTERM)
+
+        stop_before = time.time() + self.__stop_timeout
+        while self.__workers and time.time() < stop_before:
+            for worker in list(self.__workers.values()):
+                if os.waitpid(worker.process_id, os.WNOHANG)[0] != 0:
+                    self.__remove_worker(worker)
+            time.sleep(0.1)
+
+        if self.__workers: # pragma: no cover
+            self.__logger.warning(f"Killing [{len(self.__workers)}] workers that did not stop in time.")
+            self.__signal_workers(signal.SIGKILL)
+            for worker in list(self.__workers.values()):
+                os.waitpid(worker.process_id, 0)
+                self.__remove_worker(worker)
+        self.__selector.close()
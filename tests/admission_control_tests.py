@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+
+from ekosis.clients import TransientTCPClient, TransientUDSClient, UDPClient
+from ekosis.data_transfer_objects import StatsRequestDto, StatsResponseDto
+from ekosis.exceptions import ServerBusyException
+
+from .dtos.dtos import AppResponseDto, AppDelayedEchoRequestDto
+
+# test_app_b limits its UDP server to 2 concurrent requests, with 1 more in reserve for
+# priority routes, its UDS server to 1 connection, and app.b.limited_echo to 1 concurrent request.
+# --------------------------------------------------------------------------------
+TCP_HOST = '127.0.0.1'
+TCP_PORT = 9998
+UDP_PORT = 9999
+UDS_PATH = "/tmp/test_app_b_0.uds.sock"
+
+# --------------------------------------------------------------------------------
+async def delayed_echo(client, route_key: str, message: str, delay: float) -> str:
+    try:
+        response = await client.send_message(route_key, AppDelayedEchoRequestDto(message=message, delay=delay), AppResponseDto)
+        return response.message
+    except ServerBusyException:
+        return "busy"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_udp_requests_over_the_server_limit_are_rejected():
+    results = await asyncio.gather(*[
+        delayed_echo(UDPClient(TCP_HOST, UDP_PORT), "app.b.delayed_echo", f"udp {index}", 0.3)
+        for index in range(4)
+    ])
+    assert results.count("busy") == 2
+    assert sorted(result for result in results if result != "busy") == ["udp 0", "udp 1"]
+
+    # Once those in flight are done, there is room again.
+    assert await delayed_echo(UDPClient(TCP_HOST, UDP_PORT), "app.b.delayed_echo", "udp again", 0) == "udp again"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_requests_over_the_route_limit_are_rejected():
+    results = await asyncio.gather(*[
+        delayed_echo(TransientTCPClient(TCP_HOST, TCP_PORT), "app.b.limited_echo", f"tcp {index}", 0.3)
+        for index in range(3)
+    ])
+    assert results == ["tcp 0", "busy", "busy"]
+
+    # Other routes are not affected by the limit.
+    assert await delayed_echo(TransientTCPClient(TCP_HOST, TCP_PORT), "app.b.delayed_echo", "other", 0) == "other"
+    assert await delayed_echo(TransientTCPClient(TCP_HOST, TCP_PORT), "app.b.limited_echo", "again", 0) == "again"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_connections_over_the_limit_are_rejected():
+    reader, writer = await asyncio.open_unix_connection(UDS_PATH) # Holds the only connection allowed.
+    await asyncio.sleep(0.1)
+    try:
+        assert await delayed_echo(TransientUDSClient(UDS_PATH), "app.b.delayed_echo", "rejected", 0) == "busy"
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    await asyncio.sleep(0.1)
+    assert await delayed_echo(TransientUDSClient(UDS_PATH), "app.b.delayed_echo", "accepted", 0) == "accepted"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_priority_routes_get_through_a_busy_server():
+    saturating = [
+        asyncio.create_task(delayed_echo(UDPClient(TCP_HOST, UDP_PORT), "app.b.delayed_echo", f"udp {index}", 0.6))
+        for index in range(2)
+    ]
+    await asyncio.sleep(0.1)
+    assert await delayed_echo(UDPClient(TCP_HOST, UDP_PORT), "app.b.delayed_echo", "other", 0) == "busy"
+
+    # eco.* routes are always priority routes.
+    stats = await UDPClient(TCP_HOST, UDP_PORT).send_message("eco.statistics.get", StatsRequestDto(type="current"), StatsResponseDto)
+    assert stats.statistics["admission"]["UDP"]["priority_requests"] >= 1
+
+    # So are routes that asked to be. But there is only room for as many as are kept in reserve.
+    priority = asyncio.create_task(delayed_echo(UDPClient(TCP_HOST, UDP_PORT), "app.b.priority_echo", "priority", 0.3))
+    await asyncio.sleep(0.1)
+    assert await delayed_echo(UDPClient(TCP_HOST, UDP_PORT), "app.b.priority_echo", "second", 0) == "busy"
+    assert await priority == "priority"
+    assert await asyncio.gather(*saturating) == ["udp 0", "udp 1"]
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_unordered_batches_are_admitted_per_request():
+    responses = await UDPClient(TCP_HOST, UDP_PORT).send_batch(
+        "app.b.delayed_echo",
+        [AppDelayedEchoRequestDto(message=f"{index}", delay=0.2) for index in range(4)],
+        AppResponseDto
+    )
+    assert [response.message for response in responses[:2]] == ["0", "1"]
+    assert all(isinstance(response, ServerBusyException) for response in responses[2:])
+
+    # Ordered ones only need the one slot.
+    responses = await UDPClient(TCP_HOST, UDP_PORT).send_batch(
+        "app.b.delayed_echo",
+        [AppDelayedEchoRequestDto(message=f"{index}", delay=0) for index in range(4)],
+        AppResponseDto,
+        ordered = True
+    )
+    assert [response.message for response in responses] == ["0", "1", "2", "3"]
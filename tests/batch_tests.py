@@ -0,0 +1,81 @@
+import timeit
+import pytest
+
+from ekosis.clients import TransientTCPClient, PersistedTCPClient, TransientUDSClient, UDPClient
+from ekosis.exceptions import ServerBusyException, RouteKeyUnknownException, PydanticValidationException
+from ekosis.framing import PayloadEncoding
+
+from .dtos.dtos import AppRequestDto, AppDelayedEchoRequestDto, AppResponseDto, WorkerResponseDto
+
+# Uses test_app_c, and test_app_b for its app.b.limited_echo route (max_concurrency=1).
+# --------------------------------------------------------------------------------
+TCP_HOST = '127.0.0.1'
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_type", ["tcp", "tcp msgpack", "udp", "uds"])
+async def test_batch_responses_are_in_request_order(client_type: str):
+    client = {
+        "tcp"        : lambda: TransientTCPClient(TCP_HOST, 9996),
+        "tcp msgpack": lambda: TransientTCPClient(TCP_HOST, 9996, codec=PayloadEncoding.MSGPACK),
+        "udp"        : lambda: UDPClient(TCP_HOST, 9997),
+        "uds"        : lambda: TransientUDSClient("/tmp/test_app_c_0.uds.sock"),
+    }[client_type]()
+    messages  = [f"message {index}" for index in range(100)]
+    responses = await client.send_batch(
+        "app.c.delayed_echo",
+        [AppDelayedEchoRequestDto(message=message, delay=0.01 if index % 2 else 0) for index, message in enumerate(messages)],
+        AppResponseDto
+    )
+    assert [response.message for response in responses] == messages
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [False, True])
+async def test_batch_ordered_or_concurrent(ordered: bool):
+    client     = PersistedTCPClient(TCP_HOST, 9996)
+    start_time = timeit.default_timer()
+    responses  = await client.send_batch(
+        "app.c.delayed_echo",
+        [AppDelayedEchoRequestDto(message=f"{index}", delay=0.1) for index in range(5)],
+        AppResponseDto,
+        ordered = ordered
+    )
+    duration   = timeit.default_timer() - start_time
+    await client.close_connection()
+    assert [response.message for response in responses] == ["0", "1", "2", "3", "4"]
+    if ordered:
+        assert duration >= 0.5
+    else:
+        assert duration < 0.3
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_batch_failures_are_per_request():
+    client    = TransientTCPClient(TCP_HOST, 9998)
+    responses = await client.send_batch(
+        "app.b.limited_echo",
+        [AppDelayedEchoRequestDto(message=f"{index}", delay=0.1) for index in range(3)],
+        AppResponseDto
+    )
+    assert responses[0].message == "0"
+    assert all(isinstance(response, ServerBusyException) for response in responses[1:])
+
+    responses = await client.send_batch(
+        "app.b.limited_echo",
+        [AppDelayedEchoRequestDto(message=f"{index}", delay=0) for index in range(3)],
+        AppResponseDto,
+        ordered = True
+    )
+    assert [response.message for response in responses] == ["0", "1", "2"]
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_batch_with_bad_requests():
+    client    = TransientTCPClient(TCP_HOST, 9996)
+    responses = await client.send_batch("app.c.unknown", [AppRequestDto(message="lost")], AppResponseDto)
+    assert isinstance(responses[0], RouteKeyUnknownException)
+
+    responses = await client.send_batch("app.c.delayed_echo", [AppRequestDto(message="no delay"), WorkerResponseDto(index=0, process_id=0)], AppResponseDto)
+    assert responses[0].message == "no delay"
+    assert isinstance(responses[1], PydanticValidationException)
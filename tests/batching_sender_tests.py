@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+
+from typing import List
+
+from ekosis.clients import TransientTCPClient
+from ekosis.exceptions import ServerBusyException
+from ekosis.sending.batching_sender import batching_sender
+
+from .dtos.dtos import AppDelayedEchoRequestDto, AppResponseDto
+
+# Uses test_app_c, and test_app_b for its app.b.limited_echo route (max_concurrency=1).
+# --------------------------------------------------------------------------------
+class CountingTCPClient(TransientTCPClient):
+    def __init__(self, server_host: str, server_port: int):
+        super().__init__(server_host, server_port)
+        self.batch_sizes: List[int] = []
+
+    async def send_message(self, *args, **kwargs):
+        self.batch_sizes.append(1)
+        return await super().send_message(*args, **kwargs)
+
+    async def send_batch(self, route_key, data_list, *args, **kwargs):
+        self.batch_sizes.append(len(data_list))
+        return await super().send_batch(route_key, data_list, *args, **kwargs)
+
+app_c_client = CountingTCPClient('127.0.0.1', 9996)
+app_b_client = CountingTCPClient('127.0.0.1', 9998)
+
+# --------------------------------------------------------------------------------
+@batching_sender(app_c_client, "app.c.delayed_echo", AppResponseDto, max_items=10, max_delay=0.01)
+async def delayed_echo(message: str, delay: float = 0, **kwargs):
+    return AppDelayedEchoRequestDto(message=message, delay=delay)
+
+# --------------------------------------------------------------------------------
+@batching_sender(app_b_client, "app.b.limited_echo", AppResponseDto, max_delay=0)
+async def limited_echo(message: str, delay: float = 0):
+    return AppDelayedEchoRequestDto(message=message, delay=delay)
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_calls_are_batched_up_to_max_items():
+    app_c_client.batch_sizes.clear()
+    messages  = [f"message {index}" for index in range(25)]
+    responses = await asyncio.gather(*[delayed_echo(message) for message in messages])
+    assert [response.message for response in responses] == messages
+    assert app_c_client.batch_sizes == [10, 10, 5]
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_calls_within_max_delay_are_batched():
+    app_c_client.batch_sizes.clear()
+
+    async def call_later(message: str, delay: float) -> str:
+        await asyncio.sleep(delay)
+        return (await delayed_echo(message)).message
+
+    responses = await asyncio.gather(call_later("first", 0), call_later("second", 0.005), call_later("late", 0.1))
+    assert responses == ["first", "second", "late"]
+    assert app_c_client.batch_sizes == [2, 1]
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_exception():
+    app_b_client.batch_sizes.clear()
+    results = await asyncio.gather(*[limited_echo(f"{index}", 0.1) for index in range(3)], return_exceptions=True)
+    assert app_b_client.batch_sizes == [3]
+    assert results[0].message == "0"
+    assert all(isinstance(result, ServerBusyException) for result in results[1:])
@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+
+from ekosis.clients import (
+    TransientTCPClient,
+    PersistedTCPClient,
+    TransientUDSClient,
+    PersistedUDSClient,
+    UDPClient,
+)
+from ekosis.data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ekosis.exceptions import FramingException
+from ekosis.framing import (
+    MessageType,
+    FRAME_HEADER_SIZE,
+    encode_frame,
+    decode_frame_header,
+    decode_datagram_frame,
+    is_binary_frame,
+    read_message,
+)
+
+from .dtos.dtos import AppRequestDto, AppResponseDto, AppDelayedEchoRequestDto
+
+# test_app_c has binary framing turned on for TCP, UDP and UDS. test_app_a does not.
+# Clients are created per test, because each test runs in its own event loop.
+# --------------------------------------------------------------------------------
+def test_frame_round_trip():
+    payload = b'{"message": "line\\nfeed"}\n'
+    frame   = encode_frame(MessageType.REQUEST.value, payload)
+    assert is_binary_frame(frame)
+    assert len(frame) == FRAME_HEADER_SIZE + len(payload)
+    header, decoded = decode_datagram_frame(frame)
+    assert header.message_type == MessageType.REQUEST.value
+    assert header.length       == len(payload)
+    assert decoded             == payload
+
+# --------------------------------------------------------------------------------
+def test_broken_frames_are_rejected():
+    frame = encode_frame(MessageType.RESPONSE.value, b'{}')
+    with pytest.raises(FramingException):
+        decode_frame_header(frame[:FRAME_HEADER_SIZE - 1])
+    with pytest.raises(FramingException):
+        decode_frame_header(b'{' + frame[1:])
+    with pytest.raises(FramingException):
+        decode_datagram_frame(frame[:-1])
+    assert not is_binary_frame(b'{}\n')
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_read_message_mixed_stream():
+    reader = asyncio.StreamReader()
+    reader.feed_data(encode_frame(MessageType.RESPONSE.value, b'frame\n'))
+    reader.feed_data(b'line\n')
+    reader.feed_eof()
+    assert await read_message(reader) == (b'frame\n', decode_frame_header(encode_frame(2, b'frame\n')))
+    assert await read_message(reader) == (b'line\n', None)
+    assert await read_message(reader) == (b'', None)
+
+# --------------------------------------------------------------------------------
+async def send_echo(client, message: str) -> AppResponseDto:
+    return await client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message=message, delay=0), AppResponseDto)
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_framed_clients():
+    clients = [
+        TransientTCPClient('127.0.0.1', 9996, binary_framing=True),
+        PersistedTCPClient('127.0.0.1', 9996, binary_framing=True),
+        PersistedTCPClient('127.0.0.1', 9996, binary_framing=True, multiplexed=True),
+        TransientUDSClient("/tmp/test_app_c_0.uds.sock", binary_framing=True),
+        PersistedUDSClient("/tmp/test_app_c_0.uds.sock", binary_framing=True),
+        UDPClient('127.0.0.1', 9997, binary_framing=True),
+    ]
+    for client in clients:
+        for message in ["first", "with a\nline feed"]:
+            response = await send_echo(client, message)
+            assert response.message == message
+        if isinstance(client, (PersistedTCPClient, PersistedUDSClient)):
+            await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_fallback_when_server_does_not_frame():
+    clients = [
+        TransientTCPClient('127.0.0.1', 8888, binary_framing=True),
+        PersistedTCPClient('127.0.0.1', 8888, binary_framing=True),
+        UDPClient('127.0.0.1', 8889, binary_framing=True, timeout=0.5),
+    ]
+    for client in clients:
+        response = await client.send_message("app.a.endpoint", AppRequestDto(message="plain"), AppResponseDto)
+        assert response.message == "plain"
+        if isinstance(client, PersistedTCPClient):
+            await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_server_answers_frames_with_frames():
+    reader, writer = await asyncio.open_connection('127.0.0.1', 9996)
+    span_key       = SpanKey.generate()
+    request        = RequestDTO(route_key="app.c.delayed_echo", span_key=span_key, data=AppDelayedEchoRequestDto(message="raw", delay=0))
+    writer.write(encode_frame(MessageType.REQUEST.value, request.model_dump_json().encode()))
+    payload, header = await asyncio.wait_for(read_message(reader), 2)
+    assert header.message_type == MessageType.RESPONSE.value
+    response = ResponseDTO.model_validate_json(payload)
+    assert response.span_key       == span_key
+    assert response.data["message"] == "raw"
+    writer.close()
+    await writer.wait_closed()
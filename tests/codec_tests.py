@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+
+from pydantic import ValidationError
+
+from ekosis.clients import TransientTCPClient, PersistedUDSClient, UDPClient
+from ekosis.codecs import JSON_CODEC, OrjsonCodec, MsgpackCodec, CborCodec, find_codec, available_encodings
+from ekosis.data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ekosis.exceptions import CodecException
+from ekosis.framing import (
+    MessageType,
+    PayloadEncoding,
+    encode_frame,
+    read_message,
+    encode_binary_framing_ack,
+    decode_binary_framing_ack,
+)
+from ekosis.requests.status import Status
+
+from .dtos.dtos import AppRequestDto, AppResponseDto, AppDelayedEchoRequestDto
+
+# Binary codecs are only tested where their libraries are installed.
+# --------------------------------------------------------------------------------
+def make_codecs():
+    codecs = [JSON_CODEC]
+    for codec_type in (OrjsonCodec, MsgpackCodec, CborCodec):
+        try:
+            codecs.append(codec_type())
+        except CodecException:
+            pass
+    return codecs
+
+# --------------------------------------------------------------------------------
+@pytest.mark.parametrize("codec", make_codecs(), ids=lambda codec: codec.name)
+def test_codec_round_trip(codec):
+    request = RequestDTO(route_key="app.c.delayed_echo", span_key=SpanKey.generate(), data=AppRequestDto(message="hi\n"))
+    decoded = codec.decode(codec.encode(request), RequestDTO)
+    assert decoded.route_key == request.route_key
+    assert decoded.span_key  == request.span_key
+    assert decoded.data      == {"message": "hi\n"}
+
+# --------------------------------------------------------------------------------
+@pytest.mark.parametrize("codec", make_codecs(), ids=lambda codec: codec.name)
+def test_codec_errors(codec):
+    with pytest.raises(CodecException):
+        codec.decode(b'\xc1{not valid', RequestDTO)
+    with pytest.raises(ValidationError):
+        codec.decode(codec.encode(ResponseDTO(status=0, data=None)), RequestDTO)
+
+# --------------------------------------------------------------------------------
+def test_binary_framing_ack():
+    assert decode_binary_framing_ack(encode_binary_framing_ack((0, 1, 2))) == (0, 1, 2)
+    assert decode_binary_framing_ack(bytes([6, 2, 10])) == (PayloadEncoding.JSON.value,)
+    assert decode_binary_framing_ack(bytes([6, 10])) == ()
+    assert available_encodings()[0] == PayloadEncoding.JSON.value
+
+# test_app_c has binary framing turned on. test_app_a does not.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding", [PayloadEncoding.MSGPACK, PayloadEncoding.CBOR], ids=lambda encoding: encoding.name)
+async def test_codec_clients(encoding):
+    if find_codec(encoding.value) is None:
+        pytest.skip(f"No {encoding.name} codec installed.")
+    clients = [
+        TransientTCPClient('127.0.0.1', 9996, codec=encoding),
+        PersistedUDSClient("/tmp/test_app_c_0.uds.sock", codec=encoding, multiplexed=True),
+        UDPClient('127.0.0.1', 9997, codec=encoding),
+    ]
+    for client in clients:
+        assert client.binary_framing
+        response = await client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message="coded", delay=0), AppResponseDto)
+        assert response.message == "coded"
+        if isinstance(client, PersistedUDSClient):
+            await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_codec_client_falls_back_to_json_lines():
+    if find_codec(PayloadEncoding.MSGPACK.value) is None:
+        pytest.skip("No msgpack codec installed.")
+    client   = TransientTCPClient('127.0.0.1', 8888, codec=PayloadEncoding.MSGPACK)
+    response = await client.send_message("app.a.endpoint", AppRequestDto(message="plain"), AppResponseDto)
+    assert response.message == "plain"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_unsupported_encoding_is_a_parsing_error():
+    reader, writer = await asyncio.open_connection('127.0.0.1', 9996)
+    writer.write(encode_frame(MessageType.REQUEST.value, b'whatever', encoding=200))
+    payload, header = await asyncio.wait_for(read_message(reader), 2)
+    response        = JSON_CODEC.decode(payload, ResponseDTO)
+    assert header.encoding == PayloadEncoding.JSON.value
+    assert response.status == Status.PROTOCOL_PARSING_ERROR.value
+    writer.close()
+    await writer.wait_closed()
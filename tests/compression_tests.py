@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+
+from ekosis.clients import TransientTCPClient, PersistedUDSClient, UDPClient
+from ekosis.data_transfer_objects import RequestDTO, ResponseDTO, SpanKey, StatsRequestDto, StatsResponseDto
+from ekosis.exceptions import FramingException
+from ekosis.framing import (
+    MessageType,
+    Compression,
+    FLAG_ACCEPTS_ZLIB,
+    FLAG_ACCEPTS_ZSTD,
+    FLAG_ACCEPTS_LZ4,
+    available_compressions,
+    accepted_compression_flags,
+    get_compression,
+    compress_payload,
+    decompress_payload,
+    encode_frame,
+    read_message,
+)
+from ekosis.framing.binary_frames import MAX_PAYLOAD_SIZE
+
+from .dtos.dtos import AppResponseDto, AppDelayedEchoRequestDto
+
+# test_app_c compresses responses of 1024 bytes and more, on TCP, UDP and UDS.
+# --------------------------------------------------------------------------------
+HOST     = '127.0.0.1'
+TCP_PORT = 9996
+UDP_PORT = 9997
+UDS_PATH = "/tmp/test_app_c_0.uds.sock"
+
+# --------------------------------------------------------------------------------
+def test_every_available_compression_round_trips():
+    payload = b'{"message": "' + b'compress me ' * 1000 + b'"}'
+    accepts = {Compression.ZLIB: FLAG_ACCEPTS_ZLIB, Compression.ZSTD: FLAG_ACCEPTS_ZSTD, Compression.LZ4: FLAG_ACCEPTS_LZ4}
+    assert Compression.ZLIB in available_compressions()
+    for compression in available_compressions():
+        flags, compressed = compress_payload(payload, accepts[compression])
+        assert get_compression(flags) == compression
+        assert len(compressed) < len(payload)
+        assert decompress_payload(compressed, flags) == payload
+
+    flags, _ = compress_payload(payload, accepted_compression_flags()) # The first one preferred, of those available.
+    assert get_compression(flags) == available_compressions()[0]
+
+# --------------------------------------------------------------------------------
+def test_payloads_are_only_compressed_when_accepted_and_smaller():
+    assert compress_payload(b'x' * 2000, 0) == (0, b'x' * 2000)
+    assert compress_payload(b'{}', FLAG_ACCEPTS_ZLIB) == (0, b'{}')
+    assert decompress_payload(b'{}', 0) == b'{}'
+
+    flags, _ = compress_payload(b'x' * 2000, FLAG_ACCEPTS_ZLIB)
+    assert get_compression(flags) == Compression.ZLIB
+    with pytest.raises(FramingException):
+        decompress_payload(b'not compressed at all', flags)
+
+# A small payload, that decompresses to more than any frame may be.
+# --------------------------------------------------------------------------------
+@pytest.mark.parametrize("compression", [Compression.ZLIB, Compression.ZSTD, Compression.LZ4])
+def test_decompressing_stops_at_the_payload_limit(compression: Compression):
+    if compression not in available_compressions():
+        pytest.skip(f"[{compression.name}] is not installed.")
+    accepts     = {Compression.ZLIB: FLAG_ACCEPTS_ZLIB, Compression.ZSTD: FLAG_ACCEPTS_ZSTD, Compression.LZ4: FLAG_ACCEPTS_LZ4}
+    flags, bomb = compress_payload(bytes(MAX_PAYLOAD_SIZE + 1), accepts[compression])
+    assert get_compression(flags) == compression
+    with pytest.raises(FramingException, match="exceeds maximum"):
+        decompress_payload(bomb, flags)
+
+# --------------------------------------------------------------------------------
+async def exchange_frame(message: str, flags: int) -> tuple[int, bytes]:
+    reader, writer = await asyncio.open_connection(HOST, TCP_PORT)
+    request        = RequestDTO(
+        route_key = "app.c.delayed_echo",
+        span_key  = SpanKey.generate(),
+        data      = AppDelayedEchoRequestDto(message=message)
+    )
+    writer.write(encode_frame(MessageType.REQUEST.value, request.model_dump_json().encode(), flags=flags))
+    payload, header = await asyncio.wait_for(read_message(reader), 2)
+    writer.close()
+    await writer.wait_closed()
+    return header.flags, payload
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_only_clients_that_accept_it_get_compressed_responses():
+    message        = "large " * 1000
+    flags, payload = await exchange_frame(message, 0)
+    assert get_compression(flags) == Compression.NONE
+    assert ResponseDTO.model_validate_json(payload).data["message"] == message
+
+    flags, payload = await exchange_frame(message, FLAG_ACCEPTS_ZLIB)
+    assert get_compression(flags) == Compression.ZLIB
+    assert len(payload) < len(message)
+    assert ResponseDTO.model_validate_json(decompress_payload(payload, flags)).data["message"] == message
+
+    flags, _       = await exchange_frame("small", FLAG_ACCEPTS_ZLIB) # Under the threshold.
+    assert get_compression(flags) == Compression.NONE
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_clients_with_compression():
+    message = "large " * 1000
+    clients = [
+        TransientTCPClient(HOST, TCP_PORT, compression=True),
+        PersistedUDSClient(UDS_PATH, multiplexed=True, compression=True),
+        UDPClient(HOST, UDP_PORT, compression=True),
+    ]
+    for client in clients:
+        response = await client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message=message), AppResponseDto)
+        assert response.message == message
+    await clients[1].close_connection()
+
+    statistics = {}
+    for stat_type in ("gathered", "current"): # A gather may happen while we look. Between them, nothing is missed.
+        stats = await TransientTCPClient(HOST, TCP_PORT).send_message("eco.statistics.get", StatsRequestDto(type=stat_type), StatsResponseDto)
+        for transport, values in stats.statistics.get("compression", {}).items():
+            statistics[transport] = statistics.get(transport, 0) + values["compressed_responses"]
+    assert statistics["TCP"] >= 1
+    assert statistics["UDS"] >= 1
+    assert statistics["UDP"] >= 1
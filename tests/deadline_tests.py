@@ -0,0 +1,142 @@
+import asyncio
+import json
+import pytest
+import time
+
+from ekosis.clients import TransientTCPClient
+from ekosis.data_transfer_objects import RequestDTO, ResponseDTO, SpanKey, StatsRequestDto, StatsResponseDto
+from ekosis.data_transfer_objects.queue_management import QManagementRequestDto, QManagementResponseDto
+from ekosis.exceptions import DeadlineExceededException
+from ekosis.requests.request_context import _set_current_deadline, _reset_current_deadline
+from ekosis.requests.status import Status
+from ekosis.sending.batching_sender_class import BatchingSenderClass
+
+from .dtos.dtos import AppResponseDto, AppDelayedEchoRequestDto
+
+# test_app_c answers app.c.delayed_echo after the delay asked for.
+# --------------------------------------------------------------------------------
+HOST     = '127.0.0.1'
+TCP_PORT = 9996
+
+# --------------------------------------------------------------------------------
+async def exchange_line(deadline: float | None, delay: float, route_key: str = "app.c.delayed_echo", port: int = TCP_PORT) -> ResponseDTO:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    request        = RequestDTO(
+        route_key = route_key,
+        span_key  = SpanKey.generate(),
+        data      = AppDelayedEchoRequestDto(message="deadline", delay=delay),
+        deadline  = deadline,
+    )
+    writer.write(f"{request.model_dump_json()}\n".encode())
+    response = ResponseDTO.model_validate_json(await asyncio.wait_for(reader.readline(), 2))
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+# Runs coroutine in a task of its own, with a deadline timeout seconds from now. As it
+# would be, when sent from an endpoint handling a request with that much time left.
+# --------------------------------------------------------------------------------
+async def with_deadline(timeout: float, coroutine):
+    async def run():
+        token = _set_current_deadline(asyncio.get_running_loop().time() + timeout)
+        try:
+            return await coroutine
+        finally:
+            _reset_current_deadline(token)
+    return await asyncio.create_task(run())
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_requests_past_their_deadline_are_not_processed():
+    response = await exchange_line(0, 0)
+    assert response.status == Status.DEADLINE_EXCEEDED.value
+
+    response = await exchange_line(None, 0)
+    assert response.status == Status.SUCCESS.value
+    response = await exchange_line(1, 0)
+    assert response.status == Status.SUCCESS.value
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_requests_still_processing_at_their_deadline_are_cancelled():
+    start    = time.monotonic()
+    response = await exchange_line(0.1, 1)
+    assert response.status == Status.DEADLINE_EXCEEDED.value
+    assert time.monotonic() - start < 0.5
+
+    statistics = {}
+    for stat_type in ("gathered", "current"): # A gather may happen while we look. Between them, nothing is missed.
+        stats = await TransientTCPClient(HOST, TCP_PORT).send_message("eco.statistics.get", StatsRequestDto(type=stat_type), StatsResponseDto)
+        for statistic, value in stats.statistics.get("deadlines", {}).get("TCP", {}).items():
+            statistics[statistic] = statistics.get(statistic, 0) + value
+    assert statistics["expired_requests"] >= 1
+    assert statistics["cancelled_requests"] >= 1
+
+# Handlers that must not stop halfway, are only held to the deadline before they start.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_uncancellable_requests_finish_past_their_deadline():
+    response = await exchange_line(0.1, 0.3, "app.c.uncancellable_delayed_echo")
+    assert response.status == Status.SUCCESS.value
+    response = await exchange_line(0, 0, "app.c.uncancellable_delayed_echo")
+    assert response.status == Status.DEADLINE_EXCEEDED.value
+
+# --------------------------------------------------------------------------------
+def test_clients_send_their_timeout_as_the_deadline():
+    client  = TransientTCPClient(HOST, TCP_PORT, timeout=3)
+    request = RequestDTO(route_key="app.c.delayed_echo", span_key=SpanKey.generate(), data=AppDelayedEchoRequestDto(message="x"))
+
+    async def framed_deadline() -> float:
+        return json.loads(client._frame_request(request, ()))["deadline"]
+
+    assert asyncio.run(framed_deadline()) == 3
+    assert asyncio.run(with_deadline(0.5, framed_deadline())) <= 0.5
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_inherited_deadlines():
+    client = TransientTCPClient(HOST, TCP_PORT)
+    with pytest.raises(DeadlineExceededException): # Not even sent.
+        await with_deadline(-1, client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message="late"), AppResponseDto))
+
+    with pytest.raises(DeadlineExceededException):
+        await with_deadline(0.1, client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message="slow", delay=1), AppResponseDto))
+
+    # Requests in a batch, have the deadline of the batch.
+    results = await with_deadline(0.2, client.send_batch(
+        "app.c.delayed_echo",
+        [AppDelayedEchoRequestDto(message="fast"), AppDelayedEchoRequestDto(message="slow", delay=1)],
+        AppResponseDto
+    ))
+    assert results[0].message == "fast"
+    assert isinstance(results[1], DeadlineExceededException)
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_batching_sender_with_deadlines():
+    batching_sender = BatchingSenderClass(TransientTCPClient(HOST, TCP_PORT), "app.c.delayed_echo", AppResponseDto)
+    with pytest.raises(DeadlineExceededException):
+        await with_deadline(-1, batching_sender.send(AppDelayedEchoRequestDto(message="late")))
+
+    # The batch has the latest deadline of its calls. So the slow one still makes it.
+    results = await asyncio.gather(
+        with_deadline(0.1, batching_sender.send(AppDelayedEchoRequestDto(message="fast"))),
+        with_deadline(2, batching_sender.send(AppDelayedEchoRequestDto(message="slow", delay=0.3))),
+    )
+    assert [result.message for result in results] == ["fast", "slow"]
+
+
+# test_app_a queues what app.a.queued_delayed_echo gets, for its buffered sender to app.c.delayed_echo.
+# The request is long gone by the time that is sent on. Its deadline is not handed down.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_buffered_senders_do_not_inherit_the_deadline():
+    response = await exchange_line(0.05, 0.1, "app.a.queued_delayed_echo", 8888)
+    assert response.status == Status.SUCCESS.value
+
+    await asyncio.sleep(0.5)
+    data  = await TransientTCPClient(HOST, 8888).send_message(
+        "eco.buffered_sender.data", QManagementRequestDto(queue_route_key="app.c.delayed_echo"), QManagementResponseDto
+    )
+    sizes = data.queue_data.database_sizes
+    assert (sizes.pending, sizes.error) == (0, 0)
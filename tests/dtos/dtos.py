@@ -23,3 +23,13 @@ class AppMiddlewareTestResponseDto(PydanticBaseModel):
 # --------------------------------------------------------------------------------
 class SetupTasksRanResponseDto(PydanticBaseModel):
     ran: bool
+
+# --------------------------------------------------------------------------------
+class AppDelayedEchoRequestDto(PydanticBaseModel):
+    message: str
+    delay  : float = 0
+
+# --------------------------------------------------------------------------------
+class WorkerResponseDto(PydanticBaseModel):
+    index     : int
+    process_id: int
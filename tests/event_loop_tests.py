@@ -0,0 +1,27 @@
+import asyncio
+
+from ekosis.util.event_loops import (
+    EVENT_LOOP_ASYNCIO,
+    EVENT_LOOP_UVLOOP,
+    available_event_loops,
+    get_event_loop_factory,
+    run_on_event_loop,
+)
+
+# --------------------------------------------------------------------------------
+async def running_loop_module() -> str:
+    return type(asyncio.get_running_loop()).__module__
+
+# --------------------------------------------------------------------------------
+def test_unknown_event_loops_fall_back_to_asyncio():
+    assert get_event_loop_factory(EVENT_LOOP_ASYNCIO) is None
+    assert get_event_loop_factory("no_such_loop") is None
+    assert run_on_event_loop(running_loop_module(), "no_such_loop").startswith("asyncio")
+
+# --------------------------------------------------------------------------------
+def test_uvloop_is_used_when_installed():
+    module = run_on_event_loop(running_loop_module(), " UVLoop ")
+    if EVENT_LOOP_UVLOOP in available_event_loops():
+        assert module.startswith("uvloop")
+    else:
+        assert module.startswith("asyncio")
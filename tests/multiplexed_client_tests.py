@@ -0,0 +1,145 @@
+import asyncio
+import timeit
+import pytest
+
+from ekosis.clients import PersistedTCPClient, PersistedUDSClient, UDPClient
+from ekosis.data_transfer_objects import SpanKey
+from ekosis.exceptions import CommunicationsMaxRetriesReached, CommunicationsNonRetryable
+from ekosis.framing import PayloadEncoding, MessageType, encode_binary_framing_ack, encode_frame_header
+
+from .dtos.dtos import AppDelayedEchoRequestDto, AppResponseDto
+
+# test_app_c is configured with max_in_flight > 1 on both TCP and UDS.
+# Clients are created per test, because each test runs in its own event loop.
+# --------------------------------------------------------------------------------
+async def send_delayed_echo(client, message: str, delay: float, span_key: SpanKey = None) -> AppResponseDto:
+    return await client.send_message(
+        "app.c.delayed_echo",
+        AppDelayedEchoRequestDto(message=message, delay=delay),
+        AppResponseDto,
+        span_key
+    )
+
+# --------------------------------------------------------------------------------
+async def do_concurrent_sends(client):
+    messages   = [f"message {i}" for i in range(50)]
+    start_time = timeit.default_timer()
+    responses  = await asyncio.gather(*[
+        send_delayed_echo(client, message, 0.2 if i % 2 else 0.1)
+        for i, message in enumerate(messages)
+    ])
+    duration = timeit.default_timer() - start_time
+    if not isinstance(client, UDPClient):
+        await client.close_connection()
+    return messages, [response.message for response in responses], duration
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_multiplexed_tcp_concurrent_sends():
+    client = PersistedTCPClient(server_host='127.0.0.1', server_port=9996, multiplexed=True)
+    sent, received, duration = await do_concurrent_sends(client)
+    assert received == sent
+    assert duration < 1.0 # Strictly one at a time, this would take 7.5 seconds.
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_multiplexed_uds_concurrent_sends():
+    client = PersistedUDSClient("/tmp/test_app_c_0.uds.sock", multiplexed=True)
+    sent, received, duration = await do_concurrent_sends(client)
+    assert received == sent
+    assert duration < 1.0
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_multiplexed_same_span_key_in_flight():
+    client    = PersistedTCPClient(server_host='127.0.0.1', server_port=9996, multiplexed=True)
+    span_key  = SpanKey.generate()
+    responses = await asyncio.gather(
+        send_delayed_echo(client, "first" , 0.1, span_key),
+        send_delayed_echo(client, "second", 0.0, span_key),
+    )
+    await client.close_connection()
+    assert [response.message for response in responses] == ["first", "second"]
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_multiplexed_heartbeat():
+    client = PersistedTCPClient(server_host='127.0.0.1', server_port=9996, heartbeat_period=0.1, multiplexed=True)
+    response = await send_delayed_echo(client, "before heartbeat", 0)
+    assert response.message == "before heartbeat"
+    await asyncio.sleep(0.5)
+    response = await send_delayed_echo(client, "after heartbeat", 0)
+    assert response.message == "after heartbeat"
+    await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_multiplexed_reconnects_after_connection_loss():
+    client = PersistedTCPClient(server_host='127.0.0.1', server_port=9996, multiplexed=True)
+    response = await send_delayed_echo(client, "first connection", 0)
+    assert response.message == "first connection"
+    await client.close_connection()
+    await asyncio.sleep(0.1)
+    response = await send_delayed_echo(client, "second connection", 0)
+    assert response.message == "second connection"
+    await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_multiplexed_bad_frame_fails_pending_requests():
+    async def answer_with_garbage(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readline()
+        writer.write(encode_binary_framing_ack((PayloadEncoding.JSON.value,)))
+        await reader.read(1)
+        writer.write(encode_frame_header(MessageType.RESPONSE.value, 0xFFFFFFFF)) # Longer than any frame may be.
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(answer_with_garbage, '127.0.0.1', 0)
+    port   = server.sockets[0].getsockname()[1]
+    client = PersistedTCPClient(server_host='127.0.0.1', server_port=port, multiplexed=True, binary_framing=True, max_retries=1)
+    start_time = timeit.default_timer()
+    try:
+        with pytest.raises(CommunicationsNonRetryable, match="FramingException"):
+            await send_delayed_echo(client, "lost", 0)
+    finally:
+        server.close()
+    assert timeit.default_timer() - start_time < 1.0 # Not the 5 second timeout.
+
+# A single UDP client, and a single socket, for all of them.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+@pytest.mark.parametrize("binary_framing", [False, True])
+async def test_udp_concurrent_sends(binary_framing: bool):
+    client = UDPClient(server_host='127.0.0.1', server_port=9997, binary_framing=binary_framing)
+    sent, received, duration = await do_concurrent_sends(client)
+    assert received == sent
+    assert duration < 1.0
+    assert client.protocol.pending == {}
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_udp_requests_time_out_independently():
+    client  = UDPClient(server_host='127.0.0.1', server_port=9997, timeout=0.3, max_retries=1)
+    results = await asyncio.gather(
+        send_delayed_echo(client, "too slow", 0.6),
+        send_delayed_echo(client, "fast"    , 0.0),
+        send_delayed_echo(client, "medium"  , 0.1),
+        return_exceptions=True
+    )
+    assert isinstance(results[0], CommunicationsMaxRetriesReached)
+    assert [response.message for response in results[1:]] == ["fast", "medium"]
+
+    await asyncio.sleep(0.4) # The late response to "too slow" is discarded.
+    assert (await send_delayed_echo(client, "after", 0)).message == "after"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_udp_same_span_key_in_flight():
+    client    = UDPClient(server_host='127.0.0.1', server_port=9997)
+    span_key  = SpanKey.generate()
+    responses = await asyncio.gather(
+        send_delayed_echo(client, "first" , 0.1, span_key),
+        send_delayed_echo(client, "second", 0.0, span_key),
+    )
+    assert [response.message for response in responses] == ["first", "second"]
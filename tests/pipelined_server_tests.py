@@ -0,0 +1,92 @@
+import asyncio
+import timeit
+import pytest
+
+from ekosis.clients import UDPClient
+from ekosis.data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+
+from .dtos.dtos import AppDelayedEchoRequestDto, AppResponseDto
+
+# test_app_c is configured with max_in_flight > 1 on both TCP and UDS.
+# UDP requests are always handled concurrently.
+# --------------------------------------------------------------------------------
+TCP_HOST = '127.0.0.1'
+TCP_PORT = 9996
+UDP_PORT = 9997
+UDS_PATH = "/tmp/test_app_c_0.uds.sock"
+
+# --------------------------------------------------------------------------------
+def make_request_line(message: str, delay: float) -> tuple[SpanKey, bytes]:
+    span_key = SpanKey.generate()
+    request  = RequestDTO(
+        route_key = "app.c.delayed_echo",
+        span_key  = span_key,
+        data      = AppDelayedEchoRequestDto(message=message, delay=delay)
+    )
+    return span_key, f"{request.model_dump_json()}\n".encode()
+
+# --------------------------------------------------------------------------------
+async def do_pipelined_requests(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    delays    = {"slow": 0.3, "medium": 0.2, "fast": 0.0}
+    span_keys = {}
+    for message, delay in delays.items():
+        span_key, line     = make_request_line(message, delay)
+        span_keys[span_key] = message
+        writer.write(line)
+    await writer.drain()
+
+    start_time = timeit.default_timer()
+    received   = []
+    for _ in range(len(delays)):
+        response = ResponseDTO.model_validate_json(await asyncio.wait_for(reader.readline(), 2))
+        assert response.data["message"] == span_keys[response.span_key]
+        received.append(response.data["message"])
+    duration = timeit.default_timer() - start_time
+
+    writer.close()
+    await writer.wait_closed()
+    return received, duration
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_tcp_pipelined_responses_complete_out_of_order():
+    reader, writer     = await asyncio.open_connection(TCP_HOST, TCP_PORT)
+    received, duration = await do_pipelined_requests(reader, writer)
+    assert received == ["fast", "medium", "slow"]
+    assert duration < 0.5 # Sequential processing would take at least 0.5 seconds.
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_uds_pipelined_responses_complete_out_of_order():
+    reader, writer     = await asyncio.open_unix_connection(UDS_PATH)
+    received, duration = await do_pipelined_requests(reader, writer)
+    assert received == ["fast", "medium", "slow"]
+    assert duration < 0.5
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pipelined_heartbeat():
+    reader, writer = await asyncio.open_connection(TCP_HOST, TCP_PORT)
+    writer.write(bytes([5, 10]))
+    await writer.drain()
+    data = await asyncio.wait_for(reader.readline(), 2)
+    assert data == bytes([6, 10])
+    writer.close()
+    await writer.wait_closed()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_udp_requests_are_handled_concurrently():
+    delays     = {"slow": 0.3, "medium": 0.2, "fast": 0.0}
+    start_time = timeit.default_timer()
+    responses  = await asyncio.gather(*[
+        UDPClient(TCP_HOST, UDP_PORT).send_message(
+            "app.c.delayed_echo",
+            AppDelayedEchoRequestDto(message=message, delay=delay),
+            AppResponseDto
+        )
+        for message, delay in delays.items()
+    ])
+    duration   = timeit.default_timer() - start_time
+    assert [response.message for response in responses] == list(delays.keys())
+    assert duration < 0.5 # Handling them one at a time would take at least 0.5 seconds.
@@ -0,0 +1,88 @@
+import asyncio
+import timeit
+import pytest
+
+from ekosis.clients import PooledTCPClient, PooledUDSClient
+from ekosis.exceptions import CommunicationsMaxRetriesReached
+
+from .dtos.dtos import AppDelayedEchoRequestDto, AppResponseDto
+
+# Uses test_app_c. Clients are created per test, because each test runs in its own event loop.
+# --------------------------------------------------------------------------------
+TCP_HOST = '127.0.0.1'
+TCP_PORT = 9996
+UDS_PATH = "/tmp/test_app_c_0.uds.sock"
+
+# --------------------------------------------------------------------------------
+async def send_delayed_echo(client, message: str, delay: float) -> str:
+    response = await client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message=message, delay=delay), AppResponseDto)
+    return response.message
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_type", ["tcp", "uds", "tcp binary"])
+async def test_pooled_concurrent_sends(client_type: str):
+    if client_type == "uds":
+        client = PooledUDSClient(UDS_PATH, max_connections=5)
+    else:
+        client = PooledTCPClient(TCP_HOST, TCP_PORT, max_connections=5, binary_framing=client_type == "tcp binary")
+    messages   = [f"message {index}" for index in range(20)]
+    start_time = timeit.default_timer()
+    responses  = await asyncio.gather(*[send_delayed_echo(client, message, 0.1) for message in messages])
+    duration   = timeit.default_timer() - start_time
+    assert responses == messages
+    assert duration < 1.0 # 4 rounds of 5. One at a time, this would take 2 seconds.
+    assert client.connection_count() == 5
+    assert client.idle_connection_count() == 5
+    await client.close_connection()
+    assert client.connection_count() == 0
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pooled_requests_wait_their_turn():
+    client    = PooledTCPClient(TCP_HOST, TCP_PORT, max_connections=1)
+    completed = []
+
+    async def send(message: str):
+        await send_delayed_echo(client, message, 0.01)
+        completed.append(message)
+
+    await asyncio.gather(*[send(f"message {index}") for index in range(10)])
+    assert completed == [f"message {index}" for index in range(10)]
+    assert client.connection_count() == 1
+    await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pooled_connection_closed_after_timeout():
+    client = PooledTCPClient(TCP_HOST, TCP_PORT, timeout=0.2, max_retries=1)
+    with pytest.raises(CommunicationsMaxRetriesReached):
+        await send_delayed_echo(client, "too slow", 0.4)
+    assert client.connection_count() == 0
+
+    await asyncio.sleep(0.3) # The late response went with the connection. It can't be mistaken for the next one.
+    assert await send_delayed_echo(client, "next", 0) == "next"
+    await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pooled_idle_connections_are_closed():
+    client = PooledTCPClient(TCP_HOST, TCP_PORT, min_connections=2, max_connections=5, idle_timeout=0.2)
+    await asyncio.gather(*[send_delayed_echo(client, f"message {index}", 0.1) for index in range(5)])
+    assert client.connection_count() == 5
+    await asyncio.sleep(0.6)
+    assert client.connection_count() == 2
+    await client.close_connection()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pooled_broken_connection_is_replaced():
+    client = PooledTCPClient(TCP_HOST, TCP_PORT, max_connections=1, health_check_period=0)
+    assert await send_delayed_echo(client, "first", 0) == "first"
+    assert await send_delayed_echo(client, "heartbeat checked", 0) == "heartbeat checked"
+
+    client._PooledStreamClientBase__idle[0].close() # As if the server went away.
+    await asyncio.sleep(0.1)
+    assert await send_delayed_echo(client, "replaced", 0) == "replaced"
+    assert client.connection_count() == 1
+    await client.close_connection()
@@ -0,0 +1,182 @@
+import asyncio
+import os
+import pytest
+import stat
+import tempfile
+import time
+
+from ekosis.clients import TransientTCPClient
+from ekosis.data_transfer_objects import SpanKey
+from ekosis.data_transfer_objects.buffered_endpoint_response import BufferedEndpointResponseDTO
+from ekosis.data_transfer_objects.queue_management import QManagementRequestDto, QManagementResponseDto
+from ekosis.queues import PaginatedQueue, DURABILITY_JOURNAL
+from ekosis.queues.pending_queue import PendingEntry
+
+from .dtos.dtos import AppRequestDto
+from .utility_functions import make_queue, push
+
+# --------------------------------------------------------------------------------
+def make_journaled_queue(file_path: str) -> PaginatedQueue[PendingEntry]:
+    return make_queue(file_path, durability=DURABILITY_JOURNAL, commit_max_delay=0.005)
+
+# Leaves the queue as it would be, had the process died. Nothing written on the way out.
+# --------------------------------------------------------------------------------
+def crash(queue: PaginatedQueue[PendingEntry]):
+    queue.front_page = queue.back_page = None
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pushes_survive_a_crash():
+    file_path = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    queue     = make_journaled_queue(file_path)
+    for i in range(25): # One page makes it to storage. The rest is only in memory, and the journal.
+        await push(queue, i)
+    assert [(await queue.pop()).data for _ in range(3)] == [0, 1, 2]
+    await asyncio.sleep(0.02) # For the pops to reach the journal.
+    crash(queue)
+
+    queue = make_journaled_queue(file_path)
+    assert queue.size() == 22
+    popped = [(await queue.pop()).data for _ in range(22)]
+    assert sorted(popped) == list(range(3, 25))
+    assert popped[:10] == list(range(10, 20)) # What was in storage, comes first.
+    assert await queue.pop() is None
+    queue.shut_down()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pushes_share_an_fsync(monkeypatch):
+    queue  = make_journaled_queue(os.path.join(tempfile.mkdtemp(), "queue.sqlite"))
+    fsyncs = 0
+    fsync  = os.fsync
+    def counted_fsync(fd):
+        nonlocal fsyncs
+        fsyncs += 1
+        fsync(fd)
+    monkeypatch.setattr(os, "fsync", counted_fsync)
+
+    await asyncio.gather(*(push(queue, i) for i in range(50)))
+    assert queue.size() == 50
+    assert fsyncs <= 2
+    queue.shut_down()
+
+# The journal is rewritten on the way out. Its directory is fsynced after the rename.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_rewriting_the_journal_fsyncs_its_directory(monkeypatch):
+    queue       = make_journaled_queue(os.path.join(tempfile.mkdtemp(), "queue.sqlite"))
+    directories = 0
+    fsync       = os.fsync
+    def counted_fsync(fd):
+        nonlocal directories
+        directories += stat.S_ISDIR(os.fstat(fd).st_mode)
+        fsync(fd)
+    monkeypatch.setattr(os, "fsync", counted_fsync)
+
+    await push(queue, 0)
+    queue.shut_down()
+    assert directories == 1
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_shut_down_empties_the_journal():
+    file_path = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    queue     = make_journaled_queue(file_path)
+    for i in range(15):
+        await push(queue, i)
+    queue.shut_down()
+    assert os.path.getsize(f"{file_path}.journal") == 0
+
+    queue = make_journaled_queue(file_path)
+    assert [(await queue.pop()).data for _ in range(15)] == list(range(15))
+    queue.shut_down()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_cancelled_and_duplicate_pushes_leave_nothing_in_the_journal():
+    file_path = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    queue     = make_journaled_queue(file_path)
+    cancelled = asyncio.create_task(push(queue, 0))
+    await asyncio.sleep(0) # Waiting on the journal now.
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    span_key = SpanKey.generate()
+    await queue.push(PendingEntry(span_key=span_key, data=1), span_key)
+    await queue.push(PendingEntry(span_key=span_key, data=2), span_key) # A duplicate. Not journaled, not queued.
+    queue.shut_down()
+    assert os.path.getsize(f"{file_path}.journal") == 0
+
+    queue = make_journaled_queue(file_path)
+    assert queue.size() == 1
+    assert (await queue.pop()).data == 1
+    queue.shut_down()
+
+# The page is gone from storage, and not in memory yet.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_pages_loaded_from_storage_survive_a_crash():
+    file_path = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    queue     = make_journaled_queue(file_path)
+    for i in range(25):
+        await push(queue, i)
+    assert [(await queue.pop()).data for _ in range(10)] == list(range(10))
+    await asyncio.sleep(0.02)
+
+    pop_front_page = queue.storage.pop_front_page
+    def dies_after_the_delete(how_many, before_delete=None):
+        pop_front_page(how_many, before_delete)
+        raise RuntimeError("Died after the delete.")
+    queue.storage.pop_front_page = dies_after_the_delete
+    with pytest.raises(RuntimeError):
+        await queue.pop()
+    crash(queue)
+
+    queue = make_journaled_queue(file_path)
+    assert sorted([(await queue.pop()).data for _ in range(15)]) == list(range(10, 25))
+    assert await queue.pop() is None
+    queue.shut_down()
+
+# The storage thread journals the page without the event loop. Which is busy shutting down, waiting on it.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_shut_down_while_a_page_is_loaded():
+    file_path = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    queue     = make_journaled_queue(file_path)
+    for i in range(25):
+        await push(queue, i)
+    assert [(await queue.pop()).data for _ in range(10)] == list(range(10))
+
+    pop_front_page = queue.storage.pop_front_page
+    def slow_pop_front_page(how_many, before_delete=None):
+        time.sleep(0.1)
+        return pop_front_page(how_many, before_delete)
+    queue.storage.pop_front_page = slow_pop_front_page
+
+    popping = asyncio.create_task(queue.pop())
+    await asyncio.sleep(0.05)
+    queue.shut_down()
+    assert await popping is None
+    assert os.path.getsize(f"{file_path}.journal") == 0
+
+    queue = make_journaled_queue(file_path)
+    assert [(await queue.pop()).data for _ in range(15)] == list(range(10, 25))
+    queue.shut_down()
+
+# test_app_b writes its buffers to /tmp. It does not process while paused, so the requests stay in its pending queue.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_journaled_buffered_endpoint_responds_once_on_disk():
+    client    = TransientTCPClient('127.0.0.1', 9998)
+    route_key = "app.b.journaled_buffered_endpoint"
+    await client.send_message("eco.buffered_handler.processing.pause", QManagementRequestDto(queue_route_key=route_key), QManagementResponseDto)
+    try:
+        responses = await asyncio.gather(*(
+            client.send_message(route_key, AppRequestDto(message=f"journaled {i}"), BufferedEndpointResponseDTO) for i in range(20)
+        ))
+        with open(f"/tmp/test_app_b-0-{route_key}-endpoint-pending.sqlite.journal", "rb") as f:
+            journal = f.read()
+        for response in responses:
+            assert response.span_key.bytes in journal
+    finally:
+        await client.send_message("eco.buffered_handler.processing.unpause", QManagementRequestDto(queue_route_key=route_key), QManagementResponseDto)
@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+import threading
+import time
+
+from .utility_functions import make_queue, push
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_event_loop_keeps_running_while_a_page_is_written():
+    queue          = make_queue()
+    append_page    = queue.storage.append_page
+    writer_threads = []
+
+    def slow_append_page(entries):
+        writer_threads.append(threading.current_thread())
+        time.sleep(0.3)
+        append_page(entries)
+    queue.storage.append_page = slow_append_page
+
+    for i in range(20): # A front page, and a full back page.
+        await push(queue, i)
+
+    ticks = 0
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+    ticker = asyncio.create_task(tick())
+    await push(queue, 20) # Writes the back page.
+    ticker.cancel()
+
+    assert ticks > 5
+    assert writer_threads and threading.main_thread() not in writer_threads
+    assert queue.size() == 21
+    queue.shut_down()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_concurrent_pushes_and_pops_stay_in_order():
+    queue = make_queue(page_size=7)
+    await asyncio.gather(*(push(queue, i) for i in range(200)))
+    assert queue.size() == 200
+
+    popped = await asyncio.gather(*(queue.pop() for _ in range(100)))
+    await asyncio.gather(*(push(queue, i) for i in range(200, 250)))
+    popped.extend([await queue.pop() for _ in range(150)])
+    assert [entry.data for entry in popped] == list(range(250))
+    assert await queue.pop() is None
+    queue.shut_down()
+
+# The entry is in storage when the lookup starts, and in the front page once a pop has loaded it.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_lookups_find_entries_a_pop_is_loading():
+    queue     = make_queue()
+    span_keys = [await push(queue, i) for i in range(30)]
+    assert [(await queue.pop()).data for _ in range(10)] == list(range(10))
+
+    pop_front_page = queue.storage.pop_front_page
+    def slow_pop_front_page(how_many, before_delete=None):
+        time.sleep(0.2)
+        return pop_front_page(how_many, before_delete)
+    queue.storage.pop_front_page = slow_pop_front_page
+
+    popping = asyncio.create_task(queue.pop())
+    await asyncio.sleep(0.05)
+    inspected, popped = await asyncio.gather(queue.inspect_span_key(span_keys[11]), queue.pop_span_key(span_keys[12]))
+    assert (await popping).data == 10
+    assert (inspected.data, popped.data) == (11, 12)
+    assert queue.size() == 18
+    queue.shut_down()
+
+# The storage thread carries on when a pop or push is cancelled. What it did, still ends up in the pages.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_cancelled_pop_and_push_leave_the_queue_whole():
+    queue = make_queue()
+    for i in range(30):
+        await push(queue, i)
+    assert [(await queue.pop()).data for _ in range(10)] == list(range(10))
+
+    pop_front_page = queue.storage.pop_front_page
+    def slow_pop_front_page(how_many, before_delete=None):
+        time.sleep(0.2)
+        return pop_front_page(how_many, before_delete)
+    queue.storage.pop_front_page = slow_pop_front_page
+
+    popping = asyncio.create_task(queue.pop())
+    await asyncio.sleep(0.05)
+    popping.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await popping
+    assert queue.size() == 20
+
+    append_page = queue.storage.append_page
+    def slow_append_page(entries):
+        time.sleep(0.2)
+        append_page(entries)
+    queue.storage.append_page = slow_append_page
+
+    pushing = asyncio.create_task(push(queue, 30)) # Writes the full back page, and is cancelled before it gets in itself.
+    await asyncio.sleep(0.05)
+    pushing.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pushing
+    assert queue.size() == 20
+
+    for i in range(31, 51): # Writes the next back page.
+        await push(queue, i)
+    popped = [(await queue.pop()).data for _ in range(40)]
+    assert popped == list(range(10, 30)) + list(range(31, 51))
+    assert await queue.pop() is None
+    queue.shut_down()
+
+# shut_down finds a pop loading a page. The page is written back, not lost.
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_shut_down_waits_for_a_page_being_loaded():
+    queue = make_queue()
+    for i in range(30):
+        await push(queue, i)
+    assert [(await queue.pop()).data for _ in range(10)] == list(range(10))
+
+    pop_front_page = queue.storage.pop_front_page
+    def slow_pop_front_page(how_many, before_delete=None):
+        time.sleep(0.2)
+        return pop_front_page(how_many, before_delete)
+    queue.storage.pop_front_page = slow_pop_front_page
+
+    popping = asyncio.create_task(queue.pop())
+    await asyncio.sleep(0.05)
+    queue.shut_down()
+    assert await popping is None
+
+    queue = make_queue(queue.file_path)
+    assert queue.size() == 20
+    assert [(await queue.pop()).data for _ in range(20)] == list(range(10, 30))
+    queue.shut_down()
@@ -26,6 +26,7 @@ $VENV/coverage erase
 $VENV/coverage run -p --source=ekosis -m tests.test_app_a.test_app_a -i 0 -lfo &
 $VENV/coverage run -p --source=ekosis -m tests.test_app_b.test_app_b -i 0 -c ./tests/test_app_b/config.json -lfo &
 $VENV/coverage run -p --source=ekosis -m tests.test_app_c.test_app_c -i 0 -c ./tests/test_app_c/config.json -lfo &
+$VENV/coverage run -p --source=ekosis -m tests.test_app_d.test_app_d -i 0 -c ./tests/test_app_d/config.json -lfo &
 sleep 1
 $VENV/coverage run -p --source=ekosis -m pytest -v \
   tests/basic_tests.py \
@@ -39,14 +40,35 @@ $VENV/coverage run -p --source=ekosis -m pytest -v \
   tests/utility_functions.py \
   tests/error_state_keeper.py \
   tests/lru_cache.py \
-  tests/setup_tasks_tests.py
+  tests/setup_tasks_tests.py \
+  tests/pipelined_server_tests.py \
+  tests/multiplexed_client_tests.py \
+  tests/binary_framing_tests.py \
+  tests/codec_tests.py \
+  tests/typed_request_tests.py \
+  tests/worker_mode_tests.py \
+  tests/event_loop_tests.py \
+  tests/admission_control_tests.py \
+  tests/udp_batching_tests.py \
+  tests/udp_fragmentation_tests.py \
+  tests/pooled_client_tests.py \
+  tests/batch_tests.py \
+  tests/batching_sender_tests.py \
+  tests/stream_protocol_tests.py \
+  tests/compression_tests.py \
+  tests/deadline_tests.py \
+  tests/segmented_log_tests.py \
+  tests/sqlite_storage_tests.py \
+  tests/queue_storage_thread_tests.py \
+  tests/push_journal_tests.py
 
 # $VENV/coverage run -a --source=ekosis -m pytest tests/check_stats_endpoint.py
 
 TEST_APP_A_0_PID="$(cat /tmp/test_app_a-0.lock)"
 TEST_APP_B_0_PID="$(cat /tmp/test_app_b-0.lock)"
 TEST_APP_C_0_PID="$(cat /tmp/test_app_c-0.lock)"
-kill $TEST_APP_A_0_PID $TEST_APP_B_0_PID $TEST_APP_C_0_PID
+TEST_APP_D_0_PID="$(cat /tmp/test_app_d-0.lock)"
+kill $TEST_APP_A_0_PID $TEST_APP_B_0_PID $TEST_APP_C_0_PID $TEST_APP_D_0_PID
 $VENV/coverage combine
 $VENV/coverage report -m
 
@@ -0,0 +1,102 @@
+import os
+import pytest
+import tempfile
+
+from ekosis.queues import PaginatedQueue, SegmentedLogStorage, QUEUE_STORAGE_SEGMENTED_LOG
+from ekosis.queues.pending_queue import PendingEntry
+from ekosis.data_transfer_objects import SpanKey
+
+from .utility_functions import make_entries
+
+# --------------------------------------------------------------------------------
+def segment_files(directory: str) -> list[str]:
+    return sorted(file_name for file_name in os.listdir(directory) if file_name.endswith(".segment"))
+
+# --------------------------------------------------------------------------------
+def pop_all(storage: SegmentedLogStorage) -> list[str]:
+    popped = []
+    while entries := storage.pop_front_page(7):
+        popped.extend(entry.object_string for entry in entries)
+    return popped
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_queue_keeps_its_order_across_restarts():
+    directory = tempfile.mkdtemp()
+    queue     = PaginatedQueue[PendingEntry](directory, PendingEntry, 10, QUEUE_STORAGE_SEGMENTED_LOG)
+    for i in range(300):
+        span_key = SpanKey.generate()
+        await queue.push(PendingEntry(span_key=span_key, data=i), span_key)
+    assert queue.size() == 300
+    assert [(await queue.pop()).data for _ in range(25)] == list(range(25))
+    queue.shut_down()
+
+    queue = PaginatedQueue[PendingEntry](directory, PendingEntry, 10, QUEUE_STORAGE_SEGMENTED_LOG)
+    assert queue.size() == 275
+    assert [(await queue.pop()).data for _ in range(275)] == list(range(25, 300))
+    assert await queue.pop() is None
+    queue.shut_down()
+
+# --------------------------------------------------------------------------------
+def test_segments_are_deleted_once_read():
+    directory = tempfile.mkdtemp()
+    storage   = SegmentedLogStorage(directory, segment_size=500)
+    entries   = make_entries(50)
+    for i in range(0, 50, 5):
+        storage.append_page(entries[i:i + 5])
+    assert storage.size() == 50
+    assert len(segment_files(directory)) > 1
+
+    assert pop_all(storage) == [entry.object_string for entry in entries]
+    assert storage.size() == 0
+    assert len(segment_files(directory)) == 1 # The one still written to.
+    storage.close()
+
+# --------------------------------------------------------------------------------
+def test_entries_taken_from_the_middle_stay_taken():
+    directory = tempfile.mkdtemp()
+    storage   = SegmentedLogStorage(directory)
+    entries   = make_entries(10)
+    storage.append_page(entries)
+    assert storage.inspect_entry(entries[4].span_key).object_string == "entry 4"
+    assert storage.pop_entry(entries[4].span_key).object_string == "entry 4"
+    assert storage.pop_entry(entries[4].span_key) is None
+    assert not storage.has_entry(entries[4].span_key)
+    storage.close()
+
+    storage = SegmentedLogStorage(directory)
+    assert storage.size() == 9
+    assert "entry 4" not in pop_all(storage)
+    storage.close()
+
+# --------------------------------------------------------------------------------
+def test_recovery_after_a_crash():
+    directory = tempfile.mkdtemp()
+    storage   = SegmentedLogStorage(directory)
+    entries   = make_entries(20)
+    storage.append_page(entries[:10])
+    storage.append_page(entries[10:])
+    assert len(storage.pop_front_page(5)) == 5
+    # No close. And the last write only got half way.
+    with open(os.path.join(directory, segment_files(directory)[-1]), "ab") as f:
+        f.write(b"\x01\x00\x00\x01\x00\x00\x00\x00\x00half a record")
+
+    storage = SegmentedLogStorage(directory)
+    assert storage.size() == 15
+    storage.append_page(make_entries(1, "after"))
+    assert pop_all(storage) == [entry.object_string for entry in entries[5:]] + ["after 0"]
+    storage.close()
+
+# --------------------------------------------------------------------------------
+def test_pages_written_to_the_front():
+    directory = tempfile.mkdtemp()
+    storage   = SegmentedLogStorage(directory)
+    entries   = make_entries(10)
+    storage.append_page(entries)
+    assert len(storage.pop_front_page(3)) == 3
+    storage.prepend_page(make_entries(2, "front"))
+    storage.close()
+
+    storage = SegmentedLogStorage(directory) # What was read before the front page, stays read.
+    assert pop_all(storage) == ["front 0", "front 1"] + [entry.object_string for entry in entries[3:]]
+    storage.close()
@@ -0,0 +1,89 @@
+import os
+import pytest
+import sqlite3
+import tempfile
+
+from ekosis.queues import SqliteQueueStorage, SegmentedLogStorage, PageEntry, SYNCHRONOUS_NORMAL
+
+from .utility_functions import make_entries
+
+# --------------------------------------------------------------------------------
+def object_strings(entries: list[PageEntry]) -> list[str]:
+    return [entry.object_string for entry in entries]
+
+# --------------------------------------------------------------------------------
+def test_database_is_in_wal_mode():
+    file_path = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    storage   = SqliteQueueStorage(file_path, SYNCHRONOUS_NORMAL)
+    assert storage.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert storage.connection.execute("PRAGMA synchronous").fetchone()[0] == 1 # NORMAL
+    storage.close()
+
+# --------------------------------------------------------------------------------
+def test_pages_come_back_in_queue_order():
+    storage = SqliteQueueStorage(os.path.join(tempfile.mkdtemp(), "queue.sqlite"))
+    entries = make_entries(30)
+    storage.append_page(entries[10:20])
+    storage.append_page(entries[20:])
+    storage.prepend_page(entries[:10])
+    assert storage.size() == 30
+
+    assert object_strings(storage.pop_back_page(5)) == object_strings(entries[25:])
+    assert object_strings(storage.pop_front_page(7)) == object_strings(entries[:7])
+    assert storage.pop_entry(entries[8].span_key).object_string == "entry 8"
+    assert storage.pop_entry(entries[8].span_key) is None
+    assert object_strings(storage.pop_front_page(100)) == object_strings(entries[7:8] + entries[9:25])
+    assert storage.pop_front_page(100) == []
+    storage.close()
+
+# The table, as SqlAlchemy used to create it.
+# --------------------------------------------------------------------------------
+def test_databases_from_before_still_work():
+    file_path  = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    entries    = make_entries(5)
+    connection = sqlite3.connect(file_path)
+    connection.execute("CREATE TABLE queued_objects (record_id BIGINT NOT NULL, span_key BINARY(24) NOT NULL, object_string VARCHAR, PRIMARY KEY (record_id), UNIQUE (span_key))")
+    connection.executemany("INSERT INTO queued_objects VALUES (?, ?, ?)", [(i + 1, entry.span_key.bytes, entry.object_string) for i, entry in enumerate(entries[:3])])
+    connection.commit()
+    connection.close()
+
+    storage = SqliteQueueStorage(file_path)
+    storage.append_page(entries[3:])
+    assert storage.inspect_entry(entries[1].span_key).object_string == "entry 1"
+    assert object_strings(storage.pop_front_page(10)) == object_strings(entries)
+    storage.close()
+
+# --------------------------------------------------------------------------------
+def test_unknown_synchronous_modes():
+    directory = tempfile.mkdtemp()
+    with pytest.raises(ValueError):
+        SqliteQueueStorage(os.path.join(directory, "queue.sqlite"), "SOMETIMES")
+    with pytest.raises(ValueError):
+        SegmentedLogStorage(os.path.join(directory, "queue.log"), synchronous="SOMETIMES")
+
+# --------------------------------------------------------------------------------
+def test_size_and_record_ids_are_only_queried_at_open():
+    file_path  = os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    storage    = SqliteQueueStorage(file_path)
+    statements = []
+    storage.connection.set_trace_callback(statements.append)
+    entries    = make_entries(40)
+    storage.append_page(entries[10:30])
+    storage.prepend_page(entries[:10])
+    assert storage.size() == 30
+    assert len(storage.pop_front_page(5)) == 5
+    assert len(storage.pop_back_page(5)) == 5
+    storage.pop_entry(entries[12].span_key)
+    storage.append_page(entries[30:])
+    assert storage.size() == 29
+    assert not [statement for statement in statements if "COUNT(" in statement or "MIN(" in statement]
+    storage.close()
+
+    storage = SqliteQueueStorage(file_path)
+    assert storage.size() == 29
+    expected = entries[5:12] + entries[13:25] + entries[30:]
+    assert object_strings(storage.pop_front_page(100)) == object_strings(expected)
+    assert storage.size() == 0
+    storage.clear()
+    assert storage.size() == 0
+    storage.close()
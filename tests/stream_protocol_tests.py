@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+
+from ekosis.clients import PersistedUDSClient
+from ekosis.data_transfer_objects import RequestDTO, ResponseDTO, SpanKey
+from ekosis.exceptions import FramingException
+from ekosis.framing import (
+    MessageType,
+    StreamMessageParser,
+    encode_frame,
+    decode_frame_header,
+)
+
+from .dtos.dtos import AppDelayedEchoRequestDto, AppResponseDto
+
+# The UDS servers of test_app_b, test_app_c and test_app_d, and the TCP server of
+# test_app_d, use the "protocol" stream engine. test_app_c's is pipelined, with
+# binary framing. The other tests cover them as well.
+# --------------------------------------------------------------------------------
+UDS_PATH = "/tmp/test_app_c_0.uds.sock"
+
+# --------------------------------------------------------------------------------
+def make_request_line(message: str, delay: float = 0) -> bytes:
+    request = RequestDTO(
+        route_key = "app.c.delayed_echo",
+        span_key  = SpanKey.generate(),
+        data      = AppDelayedEchoRequestDto(message=message, delay=delay)
+    )
+    return f"{request.model_dump_json()}\n".encode()
+
+# --------------------------------------------------------------------------------
+def test_parser_splits_lines_however_they_arrive():
+    parser = StreamMessageParser()
+    assert parser.feed(b'{"a"') == []
+    assert parser.buffered_size() == 4
+    assert parser.feed(b': 1}\n{"b": 2}\n{') == [(b'{"a": 1}\n', None), (b'{"b": 2}\n', None)]
+    assert parser.feed(b'}\n') == [(b'{}\n', None)]
+    assert parser.buffered_size() == 0
+
+# --------------------------------------------------------------------------------
+def test_parser_splits_frames_and_lines():
+    frame  = encode_frame(MessageType.REQUEST.value, b'line\nfeed')
+    header = decode_frame_header(frame)
+    parser = StreamMessageParser(binary_framing=True)
+    stream = frame + b'line\n' + frame
+    messages = []
+    for i in range(len(stream)): # One byte at a time.
+        messages.extend(parser.feed(stream[i:i + 1]))
+    assert messages == [(b'line\nfeed', header), (b'line\n', None), (b'line\nfeed', header)]
+
+    # Without binary framing, STX is just another byte of a line.
+    frame = encode_frame(MessageType.REQUEST.value, b'{}')
+    assert StreamMessageParser().feed(frame + b'\n') == [(frame + b'\n', None)]
+
+# --------------------------------------------------------------------------------
+def test_parser_rejects_broken_frames():
+    frame = encode_frame(MessageType.REQUEST.value, b'{}')
+    with pytest.raises(FramingException):
+        StreamMessageParser(binary_framing=True).feed(frame[:4] + bytes([255, 255, 255, 255]) + frame[8:])
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_requests_split_across_writes():
+    reader, writer = await asyncio.open_unix_connection(UDS_PATH)
+    data = make_request_line("first") + make_request_line("second")
+    for i in range(0, len(data), 7):
+        writer.write(data[i:i + 7])
+        await writer.drain()
+
+    messages = []
+    for _ in range(2):
+        response = ResponseDTO.model_validate_json(await asyncio.wait_for(reader.readline(), 2))
+        messages.append(response.data["message"])
+    assert sorted(messages) == ["first", "second"]
+    writer.close()
+    await writer.wait_closed()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_responses_still_sent_after_client_stops_writing():
+    reader, writer = await asyncio.open_unix_connection(UDS_PATH)
+    writer.write(make_request_line("slow", 0.2) + make_request_line("fast"))
+    await writer.drain()
+    writer.write_eof()
+
+    messages = []
+    while line := await asyncio.wait_for(reader.readline(), 2):
+        messages.append(ResponseDTO.model_validate_json(line).data["message"])
+    assert messages == ["fast", "slow"]
+    writer.close()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_many_requests_on_one_connection():
+    client   = PersistedUDSClient(UDS_PATH, multiplexed=True, binary_framing=True)
+    requests = [AppDelayedEchoRequestDto(message=f"{i}", delay=0.001) for i in range(200)]
+    try:
+        responses = await asyncio.gather(*[
+            client.send_message("app.c.delayed_echo", request, AppResponseDto) for request in requests
+        ])
+    finally:
+        await client.close_connection()
+    assert [response.message for response in responses] == [f"{i}" for i in range(200)]
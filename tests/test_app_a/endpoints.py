@@ -8,11 +8,12 @@ from ekosis.util.fire_and_forget_tasks import run_soon
 from ekosis.exceptions import ApplicationProcessingException
 from ekosis.data_transfer_objects import SpanKey
 
-from ..dtos.dtos import AppRequestDto, AppResponseDto, AppMiddlewareTestRequestDto, AppMiddlewareTestResponseDto
+from ..dtos.dtos import AppRequestDto, AppResponseDto, AppDelayedEchoRequestDto, AppMiddlewareTestRequestDto, AppMiddlewareTestResponseDto
 from .senders import (
     app_a_sender_app_b_endpoint,
     app_a_sender_app_b_buffered_endpoint,
     app_a_buffered_sender_app_b_buffered_endpoint,
+    app_a_buffered_sender_app_c_delayed_echo,
     app_a_buffered_sender_no_server
 )
 
@@ -43,6 +44,12 @@ async def app_a_queued_sender(span_key: SpanKey, dto: AppRequestDto) -> Pydantic
     await app_a_buffered_sender_app_b_buffered_endpoint(dto.message)
     return AppResponseDto(message=dto.message)
 
+# --------------------------------------------------------------------------------
+@endpoint("app.a.queued_delayed_echo", AppDelayedEchoRequestDto)
+async def app_a_queued_delayed_echo(span_key: SpanKey, dto: AppDelayedEchoRequestDto) -> PydanticBaseModel:
+    await app_a_buffered_sender_app_c_delayed_echo(dto.message, dto.delay)
+    return AppResponseDto(message=dto.message)
+
 # --------------------------------------------------------------------------------
 @run_soon
 async def enqueue_no_such_server(span_key: SpanKey, message: str):
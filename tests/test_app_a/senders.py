@@ -2,8 +2,8 @@ from ekosis.sending.sender import sender
 from ekosis.sending.buffered_sender import buffered_sender
 from ekosis.data_transfer_objects import BufferedEndpointResponseDTO
 
-from .clients import transient_tcp_client, no_such_tcp_server
-from ..dtos.dtos import AppRequestDto, AppResponseDto
+from .clients import transient_tcp_client, no_such_tcp_server, app_c_tcp_client
+from ..dtos.dtos import AppRequestDto, AppResponseDto, AppDelayedEchoRequestDto
 
 # --------------------------------------------------------------------------------
 def make_request_dto(message: str) -> AppRequestDto:
@@ -24,6 +24,11 @@ async def app_a_sender_app_b_buffered_endpoint(message: str):
 async def app_a_buffered_sender_app_b_buffered_endpoint(message: str):
     return make_request_dto(message)
 
+# --------------------------------------------------------------------------------
+@buffered_sender(app_c_tcp_client, "app.c.delayed_echo", AppDelayedEchoRequestDto, AppResponseDto)
+async def app_a_buffered_sender_app_c_delayed_echo(message: str, delay: float):
+    return AppDelayedEchoRequestDto(message=message, delay=delay)
+
 # --------------------------------------------------------------------------------
 @buffered_sender(no_such_tcp_server, "no_server_exists", AppRequestDto, BufferedEndpointResponseDTO)
 async def app_a_buffered_sender_no_server(message: str, **kwargs):
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from pydantic import BaseModel as PydanticBaseModel
@@ -5,8 +6,9 @@ from pydantic import BaseModel as PydanticBaseModel
 from ekosis.requests.endpoint import endpoint
 from ekosis.requests.buffered_endpoint import buffered_endpoint
 from ekosis.data_transfer_objects import SpanKey
+from ekosis.queues import DURABILITY_JOURNAL
 
-from ..dtos.dtos import AppRequestDto, AppResponseDto
+from ..dtos.dtos import AppRequestDto, AppResponseDto, AppDelayedEchoRequestDto
 
 log = logging.getLogger()
 
@@ -15,6 +17,24 @@ log = logging.getLogger()
 async def app_b_endpoint(span_key: SpanKey, dto: AppRequestDto) -> PydanticBaseModel:
     return AppResponseDto(message=dto.message)
 
+# --------------------------------------------------------------------------------
+@endpoint("app.b.delayed_echo", AppDelayedEchoRequestDto)
+async def app_b_delayed_echo(span_key: SpanKey, dto: AppDelayedEchoRequestDto) -> PydanticBaseModel:
+    await asyncio.sleep(dto.delay)
+    return AppResponseDto(message=dto.message)
+
+# --------------------------------------------------------------------------------
+@endpoint("app.b.limited_echo", AppDelayedEchoRequestDto, max_concurrency=1)
+async def app_b_limited_echo(span_key: SpanKey, dto: AppDelayedEchoRequestDto) -> PydanticBaseModel:
+    await asyncio.sleep(dto.delay)
+    return AppResponseDto(message=dto.message)
+
+# --------------------------------------------------------------------------------
+@endpoint("app.b.priority_echo", AppDelayedEchoRequestDto, priority=True)
+async def app_b_priority_echo(span_key: SpanKey, dto: AppDelayedEchoRequestDto) -> PydanticBaseModel:
+    await asyncio.sleep(dto.delay)
+    return AppResponseDto(message=dto.message)
+
 # --------------------------------------------------------------------------------
 @buffered_endpoint("app.b.buffered_endpoint", AppRequestDto)
 async def app_b_buffered_endpoint(span_key: SpanKey, dto: AppRequestDto) -> bool:
@@ -24,3 +44,8 @@ async def app_b_buffered_endpoint(span_key: SpanKey, dto: AppRequestDto) -> bool
 @buffered_endpoint("app.b.buffered_endpoint_fail", AppRequestDto)
 async def app_b_buffered_endpoint_fail(span_key: SpanKey, dto: AppRequestDto) -> bool:
     return False
+
+# --------------------------------------------------------------------------------
+@buffered_endpoint("app.b.journaled_buffered_endpoint", AppRequestDto, durability=DURABILITY_JOURNAL)
+async def app_b_journaled_buffered_endpoint(span_key: SpanKey, dto: AppRequestDto) -> bool:
+    return True
@@ -1,7 +1,9 @@
+import asyncio
+
 from ekosis.data_transfer_objects import EmptyDto
 from ekosis.requests.endpoint import endpoint
 from ekosis.data_transfer_objects import SpanKey
-from ..dtos.dtos import SetupTasksRanResponseDto
+from ..dtos.dtos import SetupTasksRanResponseDto, AppDelayedEchoRequestDto, AppResponseDto
 
 # --------------------------------------------------------------------------------
 # class SetupTasksRanResponseDto(PydanticBaseModel):
@@ -14,3 +16,15 @@ setup_task_ran: bool = False
 @endpoint("app.c.setup_task_ran")
 async def app_c_setup_task_ran(span_key: SpanKey, dto: EmptyDto) -> SetupTasksRanResponseDto:
     return SetupTasksRanResponseDto(ran=setup_task_ran)
+
+# --------------------------------------------------------------------------------
+@endpoint("app.c.delayed_echo", AppDelayedEchoRequestDto)
+async def app_c_delayed_echo(span_key: SpanKey, dto: AppDelayedEchoRequestDto) -> AppResponseDto:
+    if dto.delay > 0:
+        await asyncio.sleep(dto.delay)
+    return AppResponseDto(message=dto.message)
+
+# --------------------------------------------------------------------------------
+@endpoint("app.c.uncancellable_delayed_echo", AppDelayedEchoRequestDto, cancellable=False)
+async def app_c_uncancellable_delayed_echo(span_key: SpanKey, dto: AppDelayedEchoRequestDto) -> AppResponseDto:
+    return await app_c_delayed_echo(span_key, dto)
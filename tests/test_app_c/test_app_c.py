@@ -2,7 +2,7 @@ import asyncio
 
 from ekosis.application_base import ApplicationBase
 
-from .endpoints import app_c_setup_task_ran # noqa
+from .endpoints import app_c_setup_task_ran, app_c_delayed_echo, app_c_uncancellable_delayed_echo # noqa
 import tests.test_app_c.endpoints as app_c_endpoints
 
 # --------------------------------------------------------------------------------
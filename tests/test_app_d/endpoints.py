@@ -0,0 +1,41 @@
+import os
+
+from pydantic import BaseModel as PydanticBaseModel
+
+from ekosis.requests.endpoint import endpoint
+from ekosis.requests.buffered_endpoint import buffered_endpoint
+from ekosis.sending.buffered_sender import buffered_sender
+from ekosis.clients import TransientTCPClient
+from ekosis.data_transfer_objects import EmptyDto, SpanKey
+from ekosis.state_keepers.worker_context import WorkerContext
+
+from ..dtos.dtos import AppRequestDto, AppResponseDto, WorkerResponseDto
+
+# test_app_d runs in worker mode. It sends buffered requests to itself.
+transient_tcp_client = TransientTCPClient(server_host='127.0.0.1', server_port=9994)
+
+# --------------------------------------------------------------------------------
+@endpoint("app.d.worker")
+async def app_d_worker(span_key: SpanKey, dto: EmptyDto) -> PydanticBaseModel:
+    return WorkerResponseDto(index=WorkerContext().get_index(), process_id=os.getpid())
+
+# --------------------------------------------------------------------------------
+@endpoint("app.d.endpoint", AppRequestDto)
+async def app_d_endpoint(span_key: SpanKey, dto: AppRequestDto) -> PydanticBaseModel:
+    return AppResponseDto(message=dto.message)
+
+# --------------------------------------------------------------------------------
+@buffered_endpoint("app.d.buffered_endpoint", AppRequestDto)
+async def app_d_buffered_endpoint(span_key: SpanKey, dto: AppRequestDto) -> bool:
+    return True
+
+# --------------------------------------------------------------------------------
+@buffered_sender(transient_tcp_client, "app.d.endpoint", AppRequestDto, AppResponseDto)
+async def app_d_buffered_sender_app_d_endpoint(message: str) -> AppRequestDto:
+    return AppRequestDto(message=message)
+
+# --------------------------------------------------------------------------------
+@endpoint("app.d.queued_sender", AppRequestDto)
+async def app_d_queued_sender(span_key: SpanKey, dto: AppRequestDto) -> PydanticBaseModel:
+    await app_d_buffered_sender_app_d_endpoint(dto.message)
+    return AppResponseDto(message=dto.message)
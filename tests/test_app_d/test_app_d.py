@@ -0,0 +1,17 @@
+from ekosis.application_base import ApplicationBase
+
+from .endpoints import app_d_worker, app_d_endpoint, app_d_buffered_endpoint, app_d_queued_sender # noqa
+
+# --------------------------------------------------------------------------------
+class TestAppDServer(ApplicationBase):
+    def __init__(self):
+        super().__init__()
+
+# --------------------------------------------------------------------------------
+def main():
+    with TestAppDServer() as app:
+        app.start()
+
+# --------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+
+from ekosis.data_transfer_objects import ResponseDTO, SpanKey
+from ekosis.requests.status import Status
+
+# test_app_c has no middleware, so requests to it are decoded straight into the
+# DTO of the endpoint they are for. Whatever does not fit, must get the same
+# response it would have gotten without that.
+# --------------------------------------------------------------------------------
+async def send_raw(request: bytes) -> ResponseDTO:
+    reader, writer = await asyncio.open_connection('127.0.0.1', 9996)
+    writer.write(request + b'\n')
+    response = ResponseDTO.model_validate_json(await asyncio.wait_for(reader.readline(), 2))
+    writer.close()
+    await writer.wait_closed()
+    return response
+
+# --------------------------------------------------------------------------------
+def make_request(route_key: str, data: str, span_key: SpanKey) -> bytes:
+    return (
+        f'{{"route_key": "{route_key}", '
+        f'"span_key": {{"trace_id": "{span_key.trace_id}", "span_id": "{span_key.span_id}"}}, '
+        f'"data": {data}}}'
+    ).encode()
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_typed_request_success():
+    span_key = SpanKey.generate()
+    response = await send_raw(make_request("app.c.delayed_echo", '{"message": "typed", "delay": "0"}', span_key))
+    assert response.status          == Status.SUCCESS.value
+    assert response.span_key        == span_key
+    assert response.data["message"] == "typed"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_typed_request_invalid_data():
+    span_key = SpanKey.generate()
+    response = await send_raw(make_request("app.c.delayed_echo", '{"message": "typed", "delay": "soon"}', span_key))
+    assert response.status   == Status.PYDANTIC_VALIDATION_ERROR.value
+    assert response.span_key == span_key
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_typed_request_unknown_route():
+    span_key = SpanKey.generate()
+    response = await send_raw(make_request("app.c.does_not_exist", '{}', span_key))
+    assert response.status   == Status.ROUTE_KEY_UNKNOWN.value
+    assert response.span_key == span_key
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_typed_request_broken_json():
+    response = await send_raw(b'{"route_key": "app.c.delayed_echo", ')
+    assert response.status == Status.PROTOCOL_PARSING_ERROR.value
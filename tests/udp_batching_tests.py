@@ -0,0 +1,55 @@
+import socket
+import asyncio
+import pytest
+
+from ekosis.clients import TransientTCPClient, UDPClient
+from ekosis.data_transfer_objects import StatsRequestDto, StatsResponseDto
+
+from .dtos.dtos import AppResponseDto, AppDelayedEchoRequestDto
+
+# test_app_c has batching turned on for UDP.
+# --------------------------------------------------------------------------------
+HOST     = '127.0.0.1'
+TCP_PORT = 9996
+UDP_PORT = 9997
+
+HEARTBEAT = bytes([6, 10])
+
+# --------------------------------------------------------------------------------
+async def get_batching_statistics() -> dict:
+    statistics = {}
+    for stat_type in ("gathered", "current"): # A gather may happen while we look. Between them, nothing is missed.
+        client   = TransientTCPClient(HOST, TCP_PORT)
+        response = await client.send_message("eco.statistics.get", StatsRequestDto(type=stat_type), StatsResponseDto)
+        for key, value in response.statistics.get("batching", {}).get("UDP", {}).items():
+            statistics[key] = statistics.get(key, 0) + value
+    return statistics
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_burst_of_datagrams_is_answered_in_batches():
+    count = 200
+    sock  = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(2)
+    try:
+        for _ in range(count):
+            sock.sendto(HEARTBEAT, (HOST, UDP_PORT))
+        for _ in range(count):
+            data, _ = sock.recvfrom(16)
+            assert data == HEARTBEAT
+    finally:
+        sock.close()
+
+    statistics = await get_batching_statistics()
+    assert statistics["received_datagrams"] >= count
+    assert statistics["sent_datagrams"]     >= count
+    assert statistics["received_batches"]   <  statistics["received_datagrams"]
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_batched_requests_are_answered():
+    responses = await asyncio.gather(*[
+        UDPClient(HOST, UDP_PORT).send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message=f"{index}"), AppResponseDto)
+        for index in range(20)
+    ])
+    assert [response.message for response in responses] == [f"{index}" for index in range(20)]
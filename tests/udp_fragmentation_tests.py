@@ -0,0 +1,82 @@
+import time
+import pytest
+
+from ekosis.clients import TransientTCPClient, UDPClient
+from ekosis.data_transfer_objects import StatsRequestDto, StatsResponseDto
+from ekosis.framing import (
+    MessageType,
+    FRAGMENT_OVERHEAD,
+    FragmentReassembler,
+    decode_datagram_frame,
+    split_into_fragments,
+)
+
+from .dtos.dtos import AppResponseDto, AppDelayedEchoRequestDto
+
+# test_app_c accepts fragments on UDP, and fragments responses larger than 1200 bytes.
+# --------------------------------------------------------------------------------
+HOST     = '127.0.0.1'
+TCP_PORT = 9996
+UDP_PORT = 9997
+
+# --------------------------------------------------------------------------------
+def fragment_payloads(message: bytes, message_id: int, fragment_size: int) -> list[bytes]:
+    payloads = []
+    for fragment in split_into_fragments(message, message_id, fragment_size):
+        assert len(fragment) <= fragment_size
+        header, payload = decode_datagram_frame(fragment)
+        assert header.message_type == MessageType.FRAGMENT.value
+        payloads.append(payload)
+    return payloads
+
+# --------------------------------------------------------------------------------
+def test_fragments_are_reassembled_in_any_order():
+    message     = bytes(range(256)) * 40
+    payloads    = fragment_payloads(message, 7, 500)
+    reassembler = FragmentReassembler()
+    assert len(payloads) == -(-len(message) // (500 - FRAGMENT_OVERHEAD))
+
+    for payload in reversed(payloads[1:]):
+        assert reassembler.add("sender", payload) is None
+    assert reassembler.add("sender", payloads[-1]) is None # Duplicates are ignored.
+    assert reassembler.add("sender", payloads[0])  == message
+    assert reassembler.pending_count() == 0
+
+# --------------------------------------------------------------------------------
+def test_incomplete_messages_are_dropped():
+    dropped     = []
+    reassembler = FragmentReassembler(timeout=0.1, max_bytes=2000, on_drop=dropped.append)
+
+    reassembler.add("first", fragment_payloads(b'x' * 1000, 1, 500)[0])
+    time.sleep(0.2)
+    reassembler.add("second", fragment_payloads(b'y' * 1000, 1, 500)[0])
+    assert dropped == [1] # Timed out.
+
+    for payload in fragment_payloads(b'z' * 2500, 2, 500)[:4]:
+        reassembler.add("third", payload)
+    assert dropped == [1, 1] # Pushed out by the third, to stay under max_bytes.
+    assert reassembler.pending_count() == 1
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_large_messages_over_udp():
+    message  = "large " * 10000
+    client   = UDPClient(HOST, UDP_PORT, fragment_size=1200)
+    response = await client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message=message), AppResponseDto)
+    assert response.message == message
+
+    statistics = {}
+    for stat_type in ("gathered", "current"): # A gather may happen while we look. Between them, nothing is missed.
+        tcp_client = TransientTCPClient(HOST, TCP_PORT)
+        stats      = await tcp_client.send_message("eco.statistics.get", StatsRequestDto(type=stat_type), StatsResponseDto)
+        for key, value in stats.statistics.get("fragmentation", {}).get("UDP", {}).items():
+            statistics[key] = statistics.get(key, 0) + value
+    assert statistics["reassembled_messages"] >= 1
+    assert statistics["fragmented_responses"] >= 1
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_clients_without_fragments_are_not_sent_any():
+    client   = UDPClient(HOST, UDP_PORT, binary_framing=True)
+    response = await client.send_message("app.c.delayed_echo", AppDelayedEchoRequestDto(message="x" * 5000), AppResponseDto)
+    assert response.message == "x" * 5000
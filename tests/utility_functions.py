@@ -1,4 +1,6 @@
+import os
 import pytest
+import tempfile
 import uuid
 
 from ekosis.util.utility_functions import (
@@ -12,6 +14,25 @@ from ekosis.util.utility_functions import (
     get_machine_hostname,
     is_valid_url
 )
+from ekosis.queues import PaginatedQueue, PageEntry
+from ekosis.queues.pending_queue import PendingEntry
+from ekosis.data_transfer_objects import SpanKey
+
+# Shared by the queue and storage tests.
+# --------------------------------------------------------------------------------
+def make_entries(how_many: int, prefix: str = "entry") -> list[PageEntry]:
+    return [PageEntry(span_key=SpanKey.generate(), object_string=f"{prefix} {i}") for i in range(how_many)]
+
+# In a directory of its own, unless file_path says where.
+# --------------------------------------------------------------------------------
+def make_queue(file_path: str = None, page_size: int = 10, **kwargs) -> PaginatedQueue[PendingEntry]:
+    file_path = file_path or os.path.join(tempfile.mkdtemp(), "queue.sqlite")
+    return PaginatedQueue[PendingEntry](file_path, PendingEntry, page_size, **kwargs)
+
+# --------------------------------------------------------------------------------
+async def push(queue: PaginatedQueue[PendingEntry], data: int) -> SpanKey:
+    span_key = SpanKey.generate()
+    return await queue.push(PendingEntry(span_key=span_key, data=data), span_key)
 
 # --------------------------------------------------------------------------------
 @pytest.mark.asyncio
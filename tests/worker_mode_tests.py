@@ -0,0 +1,89 @@
+import os
+import signal
+import asyncio
+import pytest
+
+from typing import Dict
+from ekosis.clients import TransientTCPClient, TransientUDSClient, UDPClient
+from ekosis.data_transfer_objects import EmptyDto, StatsRequestDto, StatsResponseDto
+from ekosis.data_transfer_objects.queue_management import QManagementRequestDto, QManagementResponseDto
+from ekosis.workers import WorkerStatisticsAggregator
+
+from .dtos.dtos import AppRequestDto, AppResponseDto, WorkerResponseDto
+
+# test_app_d runs with 2 workers. Every transient connection comes from a new port,
+# so the kernel spreads them over both workers.
+# --------------------------------------------------------------------------------
+async def get_workers(attempts: int = 20) -> Dict[int, int]:
+    workers: Dict[int, int] = {}
+    for _ in range(attempts):
+        client   = TransientTCPClient('127.0.0.1', 9994)
+        response = await client.send_message("app.d.worker", EmptyDto(), WorkerResponseDto)
+        workers[response.index] = response.process_id
+    return workers
+
+# --------------------------------------------------------------------------------
+def test_statistics_aggregation():
+    aggregator = WorkerStatisticsAggregator(2)
+    assert not aggregator.add(1, {"uptime": 5, "endpoint_data": {"a": {"call_count": 2, "p95": 0.5}}})
+    assert aggregator.add(0, {"uptime": 4, "endpoint_data": {"a": {"call_count": 3, "p95": 0.1}}})
+    merged = aggregator.get_history()[0]
+    assert merged["uptime"]                      == 5
+    assert merged["endpoint_data"]["a"]          == {"call_count": 5, "p95": 0.5}
+    assert merged["application"]["workers"]      == 2
+
+    # Worker 1 reporting twice, means worker 0 is missing. Nothing gets counted twice.
+    assert not aggregator.add(1, {"uptime": 7})
+    assert aggregator.add(1, {"uptime": 9})
+    assert aggregator.get_history()[0]["application"]["workers"] == 1
+    assert len(aggregator.get_history()) == 2
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_requests_are_spread_over_workers():
+    assert set((await get_workers()).keys()) == {0, 1}
+    for client in [TransientUDSClient("/tmp/test_app_d_0.uds.sock"), UDPClient('127.0.0.1', 9995)]:
+        response = await client.send_message("app.d.endpoint", AppRequestDto(message="any worker"), AppResponseDto)
+        assert response.message == "any worker"
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_buffered_requests_go_to_worker_0():
+    for _ in range(10):
+        client = TransientTCPClient('127.0.0.1', 9994)
+        await client.send_message("app.d.buffered_endpoint", AppRequestDto(message="buffered"))
+        client   = TransientTCPClient('127.0.0.1', 9994)
+        response = await client.send_message("app.d.queued_sender", AppRequestDto(message="queued"), AppResponseDto)
+        assert response.message == "queued"
+
+    for route_key, queue_route_key in [
+        ("eco.buffered_handler.data", "app.d.buffered_endpoint"),
+        ("eco.buffered_sender.data" , "app.d.endpoint"),
+    ]:
+        client   = TransientTCPClient('127.0.0.1', 9994)
+        response = await client.send_message(route_key, QManagementRequestDto(queue_route_key=queue_route_key), QManagementResponseDto)
+        assert response.queue_data is not None
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_gathered_statistics_are_merged():
+    await get_workers()
+    await asyncio.sleep(5) # Two gather periods, so every worker has reported at least once.
+    client     = TransientTCPClient('127.0.0.1', 9994)
+    response   = await client.send_message("eco.statistics.get", StatsRequestDto(type="gathered"), StatsResponseDto)
+    assert response.statistics["application"]["workers"] == 2
+
+    client     = TransientTCPClient('127.0.0.1', 9994)
+    response   = await client.send_message("eco.statistics.get", StatsRequestDto(type="current"), StatsResponseDto)
+    assert response.statistics["application"]["worker"] in (0, 1)
+
+# --------------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_dead_workers_are_restarted():
+    workers = await get_workers()
+    os.kill(workers[1], signal.SIGKILL)
+    await asyncio.sleep(2)
+    restarted = await get_workers()
+    assert set(restarted.keys()) == {0, 1}
+    assert restarted[1] != workers[1]
+    assert restarted[0] == workers[0]